@@ -0,0 +1,320 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+import unicodedata
+import threading
+import hashlib
+import shutil
+import json
+import time
+import os
+import re
+
+from nova_common.llm_registry import read_model_config, read_routing
+from nova_common.stats_index import load_stats_index
+
+
+DEFAULT_MAX_MB = 256
+DEFAULT_SIMILARITY = 0.95
+CHUNK_SIZE = 1 << 20
+COLLECTION = "answers"
+# Unreferenced blobs younger than this may belong to an answer another process is about to index
+BLOB_GRACE_SECONDS = 3600
+
+# Words that do not change what is being asked ("can you please show me the ..." == "show ...")
+FILLER = {
+    "a", "an", "the", "please", "pls", "can", "could", "would", "you", "me", "show", "tell", "give", "i", "want",
+    "to", "know", "what", "is", "are", "was", "were", "of", "for", "in", "on", "do", "does", "kindly", "let", "us",
+}
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case, accents, punctuation, spacing and filler words removed: trivial rephrasings share one key."""
+    text = unicodedata.normalize("NFKD", prompt).encode("ascii", "ignore").decode("ascii").lower()
+    words = re.findall(r"[a-z0-9_]+", text)
+    kept = [w for w in words if w not in FILLER]
+    return " ".join(kept or words)
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def dataset_version(dataset: Path) -> str:
+    """sha256 of the dataset, taken from its statistics index when that is current (no re-hash)."""
+    index = load_stats_index(dataset)
+    return index["sha256"] if index else _sha256(dataset)
+
+
+def model_selection(nova_root: Path) -> str:
+    """model_config.txt selection + model_routing.yaml: a different model means a different answer."""
+    source, selection = read_model_config(nova_root)
+    return json.dumps({"source": source, "selection": selection, "routing": read_routing(nova_root)}, sort_keys=True, default=str)
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Exclusive lock on `path` shared by every process using the store (flock on POSIX, msvcrt on Windows)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 s; keep waiting
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _put_blob(src: Path, blob: Path) -> None:
+    """Copy `src` to `blob` atomically (other processes never see a half-written blob); refresh its mtime if present."""
+    if blob.exists():
+        # Keeps an unreferenced blob that is about to be indexed again out of the eviction grace window
+        os.utime(blob)
+        return
+    tmp = blob.with_name(f"{blob.name}.{os.getpid()}.tmp")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, blob)
+
+
+class AnswerStore:
+    """
+    Finished answers of the answering flow, keyed by (dataset sha256, normalized prompt, model selection).
+    - blobs/<sha256>  : final_answer.md, its figures / tables (shared between entries)
+    - index.json      : {key: {scope, prompt, normalized, files, size, last_used}}, plus hit/miss counters
+    - chroma/         : optional embedding index of the normalized prompts for near-duplicate matches
+      (only within the same dataset + model scope, at cosine similarity >= `similarity`)
+    - index.lock      : file lock held around every read-modify-write of index.json and eviction
+      (answering jobs run in several worker processes)
+    Entries are evicted least-recently-used first once the blobs exceed `max_bytes`.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024, similarity: Optional[float] = None):
+        self.root = Path(root)
+        self.blobs_dir = self.root / "blobs"
+        self.index_path = self.root / "index.json"
+        self.lock_path = self.root / "index.lock"
+        self.max_bytes = max_bytes
+        self.similarity = similarity
+        self._collection = None
+        self._lock = threading.Lock()
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---------- index helpers ----------
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault("entries", {})
+        index.setdefault("hits", 0)
+        index.setdefault("near_hits", 0)
+        index.setdefault("misses", 0)
+        return index
+
+    def _save_index(self, index: Dict) -> None:
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def scope(dataset_sha: str, models: str) -> str:
+        return hashlib.sha256(f"{dataset_sha}\0{models}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def key(scope: str, normalized: str) -> str:
+        return hashlib.sha256(f"{scope}\0{normalized}".encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def _locked(self):
+        with self._lock, file_lock(self.lock_path):
+            yield
+
+    # ---------- near-duplicate index ----------
+    def _prompts(self):
+        """The chromadb collection of stored prompts; None when near matching is off or chromadb fails."""
+        if self.similarity is None:
+            return None
+        if self._collection is None:
+            try:
+                import chromadb
+                client = chromadb.PersistentClient(path=str(self.root / "chroma"))
+                self._collection = client.get_or_create_collection(COLLECTION, metadata={"hnsw:space": "cosine"})
+            except Exception as e:
+                print(f"[AnswerStore] Near-duplicate matching disabled: {type(e).__name__}: {e}")
+                self.similarity = None
+                return None
+        return self._collection
+
+    def _nearest(self, scope: str, normalized: str) -> Optional[Tuple[str, float]]:
+        collection = self._prompts()
+        if collection is None:
+            return None
+        try:
+            found = collection.query(query_texts=[normalized], n_results=1, where={"scope": scope})
+        except Exception as e:
+            print(f"[AnswerStore] Near-duplicate lookup failed: {e}")
+            return None
+        if not found["ids"] or not found["ids"][0]:
+            return None
+        similarity = 1.0 - float(found["distances"][0][0])
+        return (found["ids"][0][0], similarity) if similarity >= self.similarity else None
+
+    # ---------- public API ----------
+    def lookup(self, scope: str, prompt: str, target: Path) -> Optional[Dict[str, Any]]:
+        """
+        Restore the stored answer to `prompt` into `target` (the answering_reports folder).
+        Exact normalized match first, then the nearest stored prompt of the same scope.
+        Returns {"match": "exact" | "near", "prompt": stored prompt, "similarity": ...} on a hit, None on a miss.
+        """
+        normalized = normalize_prompt(prompt)
+        key = self.key(scope, normalized)
+        index = self._load_index()
+        match, similarity = "exact", 1.0
+        if key not in index["entries"]:
+            near = self._nearest(scope, normalized)
+            if near is not None:
+                key, similarity = near
+                match = "near"
+
+        with self._locked():
+            index = self._load_index()
+            entry = index["entries"].get(key)
+            try:
+                if entry is None:
+                    raise FileNotFoundError(key)
+                target = Path(target)
+                target.mkdir(parents=True, exist_ok=True)
+                for f in entry["files"]:
+                    shutil.copyfile(self.blobs_dir / f["blob"], target / f["name"])
+            except FileNotFoundError:
+                # Missing entry, or a blob removed by hand: a miss, and the broken entry is dropped
+                index["entries"].pop(key, None)
+                index["misses"] += 1
+                self._save_index(index)
+                return None
+            entry["last_used"] = time.time()
+            index["hits" if match == "exact" else "near_hits"] += 1
+            self._save_index(index)
+        return {"match": match, "prompt": entry["prompt"], "similarity": round(similarity, 4)}
+
+    def store(self, scope: str, prompt: str, source: Path, since: float) -> List[str]:
+        """Snapshot every file of `source` written at/after `since` (final_answer.md + its figures / tables)."""
+        source = Path(source)
+        if not (source / "final_answer.md").exists():
+            return []
+        files = []
+        for p in sorted(source.iterdir()):
+            if not p.is_file() or p.stat().st_mtime < since:
+                continue
+            digest = _sha256(p)
+            _put_blob(p, self.blobs_dir / digest)
+            files.append({"name": p.name, "blob": digest, "size": p.stat().st_size})
+        if not any(f["name"] == "final_answer.md" for f in files):
+            return []
+
+        normalized = normalize_prompt(prompt)
+        key = self.key(scope, normalized)
+        with self._locked():
+            index = self._load_index()
+            index["entries"][key] = {
+                "scope": scope,
+                "prompt": prompt,
+                "normalized": normalized,
+                "files": files,
+                "size": sum(f["size"] for f in files),
+                "last_used": time.time(),
+            }
+            evicted = self._evict(index)
+            self._save_index(index)
+
+        collection = self._prompts()
+        if collection is not None:
+            try:
+                collection.upsert(ids=[key], documents=[normalized], metadatas=[{"scope": scope}])
+                if evicted:
+                    collection.delete(ids=evicted)
+            except Exception as e:
+                print(f"[AnswerStore] Could not index the prompt: {e}")
+        return [f["name"] for f in files]
+
+    def stats(self) -> Dict[str, int]:
+        index = self._load_index()
+        return {
+            "hits": index["hits"],
+            "near_hits": index["near_hits"],
+            "misses": index["misses"],
+            "entries": len(index["entries"]),
+            "bytes": self._blob_bytes(index),
+        }
+
+    # ---------- eviction ----------
+    def _blob_bytes(self, index: Dict) -> int:
+        blobs = {}
+        for entry in index["entries"].values():
+            for f in entry["files"]:
+                blobs[f["blob"]] = f["size"]
+        return sum(blobs.values())
+
+    def _evict(self, index: Dict) -> List[str]:
+        entries = index["entries"]
+        evicted = []
+        while entries and self._blob_bytes(index) > self.max_bytes:
+            oldest = min(entries, key=lambda k: entries[k]["last_used"])
+            entries.pop(oldest)
+            evicted.append(oldest)
+
+        # Drop blobs no entry references anymore, once they are older than the grace period
+        # (a younger one may have just been copied by a store() that has not taken the lock yet)
+        live = {f["blob"] for e in entries.values() for f in e["files"]}
+        cutoff = time.time() - BLOB_GRACE_SECONDS
+        for blob in self.blobs_dir.iterdir():
+            try:
+                if blob.name not in live and blob.stat().st_mtime < cutoff:
+                    blob.unlink(missing_ok=True)
+            except OSError:
+                continue
+        return evicted
+
+
+@lru_cache(maxsize=4)
+def get_answer_store(nova_root: Path) -> Optional[AnswerStore]:
+    """
+    Shared answer store under NOVA/.cache/answers.
+    - NOVA_ANSWER_CACHE=0 disables it (returns None).
+    - NOVA_ANSWER_CACHE_MAX_MB bounds its size (default 256).
+    - NOVA_ANSWER_SIMILARITY (e.g. 0.95) turns on near-duplicate prompt matching through chromadb; off by default.
+    """
+    if os.getenv("NOVA_ANSWER_CACHE", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    try:
+        max_mb = float(os.getenv("NOVA_ANSWER_CACHE_MAX_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        max_mb = DEFAULT_MAX_MB
+    similarity = None
+    if os.getenv("NOVA_ANSWER_SIMILARITY", "").strip():
+        try:
+            similarity = min(1.0, max(0.0, float(os.getenv("NOVA_ANSWER_SIMILARITY"))))
+        except ValueError:
+            similarity = DEFAULT_SIMILARITY
+    return AnswerStore(Path(nova_root) / ".cache" / "answers", int(max_mb * 1024 * 1024), similarity)
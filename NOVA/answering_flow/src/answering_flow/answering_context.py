@@ -0,0 +1,167 @@
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import os
+import re
+
+
+# Crew input name -> report file (under the workspace's reports/ folder)
+REPORTS = {
+    "dataset_overview": "dataset_overview.md",
+    "data_profiling_report": "data_profiling_report.md",
+    "summary_cleaning_report": "summary_cleaning_report.md",
+}
+DEFAULT_MAX_REPORT_TOKENS = 8000
+MAX_CONTEXTS = 8
+
+_LOCK = threading.Lock()
+_CONTEXTS: "OrderedDict[str, AnsweringContext]" = OrderedDict()
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """tiktoken count when available, otherwise the usual ~4 characters per token estimate."""
+    enc = _encoder()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _max_report_tokens() -> int:
+    try:
+        return max(500, int(os.getenv("NOVA_ANSWER_REPORT_MAX_TOKENS", DEFAULT_MAX_REPORT_TOKENS)))
+    except ValueError:
+        return DEFAULT_MAX_REPORT_TOKENS
+
+
+def trim_report(text: str, max_tokens: int) -> Tuple[str, int]:
+    """
+    Keep whole "## " sections of `text` while they fit in `max_tokens`; the first one that does not fit is cut
+    to the remaining budget and the later ones are dropped, with a note. Returns (text, tokens).
+    """
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text, tokens
+    parts = re.split(r"(?=^##\s)", text, flags=re.M)
+    kept, used = [], 0
+    for part in parts:
+        n = count_tokens(part)
+        if used + n > max_tokens:
+            room = (max_tokens - used) * 4
+            if room > 200:
+                cut = part[:room]
+                # End on a line break when one is close, so tables / bullets are not cut mid-row
+                if cut.rfind("\n") > room // 2:
+                    cut = cut[:cut.rfind("\n")]
+                kept.append(cut + "\n...[section truncated]\n")
+            break
+        kept.append(part)
+        used += n
+    dropped = len(parts) - len(kept)
+    trimmed = "".join(kept).rstrip()
+    if dropped:
+        trimmed += f"\n\n[{dropped} later sections omitted to stay within {max_tokens} tokens]"
+    return trimmed, count_tokens(trimmed)
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+@dataclass
+class AnsweringContext:
+    """
+    Everything the Prompt Answering crew reads before it starts, for one (workspace, CSV):
+    CSV columns + sample rows and the three cleaning reports, trimmed to NOVA_ANSWER_REPORT_MAX_TOKENS each.
+    `stamps` holds (size, mtime_ns) of every source file; the context is reused while they are unchanged.
+    Plain data, so the Streamlit session can hand it to a job worker in the flow's initial state.
+    """
+
+    key: str
+    stamps: Dict[str, Optional[List[int]]] = field(default_factory=dict)
+    columns: List[str] = field(default_factory=list)
+    sample_rows: List[Dict[str, Any]] = field(default_factory=list)
+    reports: Dict[str, str] = field(default_factory=dict)
+    tokens: Dict[str, int] = field(default_factory=dict)
+
+    def is_current(self) -> bool:
+        for path, stamp in self.stamps.items():
+            now = _stamp(Path(path))
+            if (list(now) if now else None) != (list(stamp) if stamp else None):
+                return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["AnsweringContext"]:
+        try:
+            return cls(**data)
+        except TypeError:
+            return None
+
+
+def build_answering_context(reports_dir: Path, csv_path: str) -> AnsweringContext:
+    from .schema_probe import probe_csv
+
+    reports_dir = Path(reports_dir)
+    context = AnsweringContext(key=f"{reports_dir}|{csv_path}")
+    context.stamps[str(csv_path)] = _stamp(Path(csv_path))
+    try:
+        context.columns, context.sample_rows = probe_csv(csv_path)
+    except Exception as e:
+        print(f"Error loading CSV: {e}")
+
+    max_tokens = _max_report_tokens()
+    for name, filename in REPORTS.items():
+        path = reports_dir / filename
+        context.stamps[str(path)] = _stamp(path)
+        text = ""
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        context.reports[name], context.tokens[name] = trim_report(text, max_tokens)
+    context.stamps = {p: (list(s) if s else None) for p, s in context.stamps.items()}
+    return context
+
+
+def get_answering_context(
+    reports_dir: Path, csv_path: str, cached: Optional[Dict[str, Any]] = None,
+) -> AnsweringContext:
+    """
+    The current context of (reports_dir, csv_path), built from disk only when no up-to-date copy exists:
+    1. `cached` (handed over by the Streamlit session with the job), 2. this process's LRU, 3. build it.
+    """
+    key = f"{Path(reports_dir)}|{csv_path}"
+    context = AnsweringContext.from_dict(cached) if cached else None
+    source = "session"
+    if context is None or context.key != key or not context.is_current():
+        with _LOCK:
+            context = _CONTEXTS.get(key)
+        source = "process"
+        if context is None or not context.is_current():
+            context = build_answering_context(Path(reports_dir), csv_path)
+            source = "disk"
+    with _LOCK:
+        _CONTEXTS[key] = context
+        _CONTEXTS.move_to_end(key)
+        while len(_CONTEXTS) > MAX_CONTEXTS:
+            _CONTEXTS.popitem(last=False)
+    print(f"[AnsweringContext] from {source}: {sum(context.tokens.values())} report tokens {context.tokens}")
+    return context
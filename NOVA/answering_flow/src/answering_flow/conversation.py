@@ -0,0 +1,228 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+import threading
+import shutil
+import json
+import time
+import os
+import re
+
+import pandas as pd
+
+from .fast_path import match_columns
+
+
+DEFAULT_MAX_TURNS = 5
+DEFAULT_MAX_CONVERSATIONS = 32
+MAX_FRAMES_PER_TURN = 8
+MAX_FRAME_MB = 64
+PLAN_CHARS = 4000
+ANSWER_CHARS = 1500
+FRAME_PREFIX = "prev_"
+
+# Explicit references to the previous turn: "same for SUVs", "what about 2023?", "now split that by brand"
+BACK_REFERENCE = re.compile(
+    r"\b(same|previous|above|earlier|instead|again|what about|how about|and by|as well|drill down|"
+    r"(split|break|filter|sort|group|plot|chart|narrow) (it|that|this|those|these|them)|"
+    r"(that|those|these|the last|the previous) (result|results|answer|table|chart|plot|figure|list|numbers|ones|rows))\b",
+    re.I,
+)
+PRONOUN = re.compile(r"\b(that|those|these|them|it)\b", re.I)
+
+
+def is_follow_up(question: str, turns: List[Dict[str, Any]], columns: List[str]) -> bool:
+    """
+    A question that builds on the previous turn, i.e. refers back to it:
+    - an explicit back-reference ("same for SUVs", "split that by brand", "what about 2023?"), or
+    - a pronoun ("those", "it", ...) with no column of the dataset named, so it can only mean the previous result, or
+    - a pronoun next to a column the previous turn already worked on (its question, plan or kept frames).
+    Standalone questions ("Average range by segment", "Is this dataset complete?") are not follow-ups.
+    """
+    if not turns:
+        return False
+    if BACK_REFERENCE.search(question):
+        return True
+    if not PRONOUN.search(question):
+        return False
+    named = match_columns(question, columns)
+    if not named:
+        return True
+    last = turns[-1]
+    previous = " ".join([last["question"], last.get("plan", "")] + [c for f in last["frames"].values() for c in f["columns"]])
+    return bool(set(named) & set(match_columns(previous, columns)))
+
+
+def _read_text(path: Path, limit: int, since: float = 0.0) -> str:
+    """The file's text (cut at `limit` chars); "" if it is missing or older than `since` (left by an earlier turn)."""
+    try:
+        if path.stat().st_mtime < since:
+            return ""
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return ""
+    return text if len(text) <= limit else text[:limit] + "\n...[truncated]"
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_]+", "_", name).strip("_") or "frame"
+
+
+class ConversationStore:
+    """
+    Per-conversation memory of the answering flow, so follow-up questions are planned as deltas.
+    - Each turn keeps the question, the reviewed plan, the start of the answer and the DataFrames the
+      final agent derived (plus the table CSVs it wrote), saved as Feather files.
+    - Only the last `max_turns` turns of a conversation and `max_conversations` conversations are kept
+      (least recently used first out); turns are held in memory and mirrored to
+      NOVA/.cache/conversations/<id>/ because every question runs in a fresh job worker.
+    """
+
+    def __init__(self, root: Path, max_turns: int = DEFAULT_MAX_TURNS, max_conversations: int = DEFAULT_MAX_CONVERSATIONS):
+        self.root = Path(root)
+        self.max_turns = max(1, max_turns)
+        self.max_conversations = max(1, max_conversations)
+        self._turns: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, conversation_id: str) -> Path:
+        return self.root / _safe_name(conversation_id)
+
+    def _remember(self, conversation_id: str, turns: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._turns[conversation_id] = turns
+            self._turns.move_to_end(conversation_id)
+            while len(self._turns) > self.max_conversations:
+                self._turns.popitem(last=False)
+
+    # ---------- public API ----------
+    def turns(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """Previous turns, oldest first ([] for a new conversation)."""
+        with self._lock:
+            if conversation_id in self._turns:
+                self._turns.move_to_end(conversation_id)
+                return self._turns[conversation_id]
+        try:
+            with open(self._dir(conversation_id) / "turns.json", "r", encoding="utf-8") as f:
+                turns = json.load(f)
+        except (OSError, ValueError):
+            turns = []
+        # Frames of a turn whose files went missing are dropped, the rest of the turn stays usable
+        for turn in turns:
+            turn["frames"] = {k: v for k, v in turn.get("frames", {}).items() if Path(v["path"]).exists()}
+        self._remember(conversation_id, turns)
+        return turns
+
+    def record(
+        self, conversation_id: str, question: str, answering_dir: Path, frames: Dict[str, pd.DataFrame], since: float,
+    ) -> Dict[str, Any]:
+        """
+        Add a finished turn: `frames` are the final agent's derived DataFrames; the table CSVs written to
+        `answering_dir` since `since` are kept as frames too (the computed aggregates).
+        """
+        answering_dir = Path(answering_dir)
+        turns = list(self.turns(conversation_id))
+        number = (turns[-1]["turn"] + 1) if turns else 1
+        folder = self._dir(conversation_id) / "frames"
+        folder.mkdir(parents=True, exist_ok=True)
+
+        frames = dict(frames)
+        for table in sorted(answering_dir.glob("*.csv")):
+            if table.stat().st_mtime >= since:
+                try:
+                    frames.setdefault(_safe_name(table.stem), pd.read_csv(table))
+                except Exception as e:
+                    print(f"[Conversation] Skipped table {table.name}: {e}")
+
+        saved: Dict[str, Dict[str, Any]] = {}
+        for name, df in frames.items():
+            if len(saved) >= MAX_FRAMES_PER_TURN:
+                break
+            if df.memory_usage(deep=True).sum() > MAX_FRAME_MB * 1024 * 1024:
+                print(f"[Conversation] {name} is larger than {MAX_FRAME_MB} MB; not kept")
+                continue
+            path = folder / f"{number}_{_safe_name(name)}.arrow"
+            # Feather wants a default index and string column names (groupby results keep their keys as columns)
+            out = df if isinstance(df.index, pd.RangeIndex) else df.reset_index()
+            out = out.reset_index(drop=True).rename(columns=str)
+            try:
+                out.to_feather(path)
+            except Exception as e:
+                print(f"[Conversation] Could not save {name}: {e}")
+                continue
+            saved[FRAME_PREFIX + _safe_name(name)] = {
+                "path": str(path), "rows": int(len(out)), "columns": [str(c) for c in out.columns][:30],
+            }
+
+        turn = {
+            "turn": number,
+            "question": question,
+            "plan": _read_text(answering_dir / "final_reviewed_plan.md", PLAN_CHARS, since),
+            "answer": _read_text(answering_dir / "final_answer.md", ANSWER_CHARS, since),
+            "frames": saved,
+            "at": time.time(),
+        }
+        turns.append(turn)
+        for old in turns[:-self.max_turns]:
+            for frame in old["frames"].values():
+                Path(frame["path"]).unlink(missing_ok=True)
+        turns = turns[-self.max_turns:]
+        self._remember(conversation_id, turns)
+
+        tmp = self._dir(conversation_id) / f"turns.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(turns, f, indent=2)
+        os.replace(tmp, self._dir(conversation_id) / "turns.json")
+        self._evict()
+        return turn
+
+    def _evict(self) -> None:
+        folders = sorted((p for p in self.root.iterdir() if p.is_dir()), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in folders[self.max_conversations:]:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def follow_up_context(turns: List[Dict[str, Any]]) -> Tuple[str, Dict[str, str]]:
+    """
+    What a follow-up is planned against:
+    - text for the crew: earlier questions, the last reviewed plan and answer, the reusable variables
+    - {variable: Feather path} to preload into the code session (the latest turn wins on name clashes)
+    """
+    datasets: Dict[str, str] = {}
+    for turn in turns:
+        datasets.update({name: frame["path"] for name, frame in turn["frames"].items()})
+
+    last = turns[-1]
+    lines = ["Earlier questions in this conversation (oldest first):"]
+    lines += [f"{t['turn']}. {t['question']}" for t in turns]
+    lines += ["", f"Reviewed plan of the last question ({last['question']}):", last["plan"] or "(none: answered without a plan)"]
+    lines += ["", "Start of the last answer:", last["answer"] or "(none)"]
+    if datasets:
+        lines += ["", "DataFrames already computed, preloaded in the Code Interpreter under these names:"]
+        for turn in turns:
+            for name, frame in turn["frames"].items():
+                if datasets.get(name) == frame["path"]:
+                    lines.append(f"- `{name}` (turn {turn['turn']}): {frame['rows']} rows, columns {frame['columns']}")
+    return "\n".join(lines), datasets
+
+
+@lru_cache(maxsize=4)
+def get_conversation_store(nova_root: Path) -> Optional[ConversationStore]:
+    """
+    Shared store under NOVA/.cache/conversations.
+    - NOVA_CONVERSATIONS=0 disables it (every question is answered on its own).
+    - NOVA_CONVERSATION_TURNS (default 5) and NOVA_MAX_CONVERSATIONS (default 32) bound it.
+    """
+    if os.getenv("NOVA_CONVERSATIONS", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    try:
+        max_turns = int(os.getenv("NOVA_CONVERSATION_TURNS", DEFAULT_MAX_TURNS))
+    except ValueError:
+        max_turns = DEFAULT_MAX_TURNS
+    try:
+        max_conversations = int(os.getenv("NOVA_MAX_CONVERSATIONS", DEFAULT_MAX_CONVERSATIONS))
+    except ValueError:
+        max_conversations = DEFAULT_MAX_CONVERSATIONS
+    return ConversationStore(Path(nova_root) / ".cache" / "conversations", max_turns, max_conversations)
@@ -1,10 +1,9 @@
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List, Optional, Tuple
-from crewai_tools import (
-    CodeInterpreterTool
-)
+from typing import List, Optional
+from nova_common.llm_registry import agent_tasks, get_llm
+from ...tools import DatasetStatsTool, SessionCodeInterpreterTool
 from pathlib import Path
 from dotenv import load_dotenv
 import os
@@ -79,61 +78,17 @@ class PromptAnsweringCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    def __init__(self, session_id: Optional[str] = None):
+        # Code session of the flow run (tools/session_code_tool.py): the agents' tools bind to it by id
+        self.session_id = session_id
 
 
 
 
-    @property
-    def answering_llm(self) -> LLM:
-        """Build an LLM for deterministic processing (e.g., profiling) using the latest model_config.txt."""
-        cfg_path = (NOVA_ROOT / "model_config.txt").resolve()
-        # 1) Read config (2 lines: source, selection)
-        try:
-            lines = [ln.strip() for ln in cfg_path.read_text(encoding="utf-8").splitlines() if ln.strip()]
-            source    = (lines[0] if len(lines) >= 1 else "API").strip()
-            selection = (lines[1] if len(lines) >= 2 else "gemini/gemini-2.5-flash").strip()
-        except Exception:
-            source, selection = "API", "gemini/gemini-2.5-flash"
 
-        print(f"\n\n\n\n\n\n[LLM] processing_llm config: source='{source}', selection='{selection}'\n\n\n\n\n\n")
-        
-        src = source.lower()
-        src = src if src in {"local", "api"} else "api"
-
-        # 2) Resolve to a CrewAI LLM
-        temperature = 0.4
-        if src == "local":
-            # Force Ollama for local selections (e.g., 'llama3.2' -> 'ollama/llama3.2')
-            tag = selection.split("/", 1)[-1]
-            model_id = f"ollama/{tag}"
-            print(f"[LLM] processing_llm -> {model_id}")
-            return LLM(model=model_id, temperature=temperature)
-
-        # API branch: expect 'provider/model'
-        if "/" not in selection:
-            provider, model_name = "gemini", selection
-        else:
-            provider, model_name = selection.split("/", 1)
-
-        provider = provider.lower().strip()
-        model_id = f"{provider}/{model_name.strip()}"
-
-        # Map provider to env var key if known
-        env_keys = {
-            "openai": "OPENAI_API_KEY",
-            "gemini": "GEMINI_API_KEY",
-        }
-        #kwargs = {"temperature": temperature, "additional_drop_params": ["stop"]}
-        kwargs = {"temperature": temperature}
-        api_env = env_keys.get(provider, f"{provider.upper()}_API_KEY")
-        api_key = os.getenv(api_env)
-        if api_key:
-            kwargs["api_key"] = api_key
-        elif provider in env_keys:
-            raise RuntimeError(f"{api_env} is not set but '{provider}' was selected in model_config.txt.")
-
-        print(f"[LLM] processing_llm -> {model_id}")
-        return LLM(model=model_id, **kwargs)
+    def routed_llm(self, agent_name: str, role: str, stream: bool = False) -> LLM:
+        """Shared LLM of one agent: its model_routing.yaml route (tasks > agent > role), else model_config.txt (see llm_registry)."""
+        return get_llm(NOVA_ROOT, role, agent_name, agent_tasks(self.tasks_config, agent_name), stream=stream, run_id=self.session_id or "")
 
 
 
@@ -150,10 +105,11 @@ class PromptAnsweringCrew:
         return Agent(
             config=self.agents_config["answering_plan_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.answering_llm,
+            llm=self.routed_llm("answering_plan_agent", "answering"),
             memory=True,
             allow_delegation=False,
-            #tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[DatasetStatsTool(session_id=self.session_id)],  # precomputed stats of the cleaned dataset, no row scans
+            #tools=[SessionCodeInterpreterTool()]  # type: ignore[index]
         )
     
     @agent
@@ -161,10 +117,10 @@ class PromptAnsweringCrew:
         return Agent(
             config=self.agents_config["plan_review_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.answering_llm,
+            llm=self.routed_llm("plan_review_agent", "answering"),
             memory=True,
             allow_delegation=False,
-            #tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            #tools=[SessionCodeInterpreterTool()]  # type: ignore[index]
         )
     
     @agent
@@ -172,10 +128,11 @@ class PromptAnsweringCrew:
         return Agent(
             config=self.agents_config["final_answering_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.answering_llm,
+            # Streamed into the Streamlit chat token by token (job_runner)
+            llm=self.routed_llm("final_answering_agent", "answering", stream=True),
             memory=True,
             allow_delegation=False,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[DatasetStatsTool(session_id=self.session_id), SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
     
 
@@ -192,14 +149,14 @@ class PromptAnsweringCrew:
     def answering_plan_task(self) -> Task:
         return Task(
             config=self.tasks_config["answering_plan_task"],  # type: ignore[index]
-            output_file=str(NOVA_ROOT / "answering_reports" / "answering_plan.md")
+            output_file="{answering_reports_dir}/answering_plan.md"
         )
     
     @task
     def plan_review_task(self) -> Task:
         return Task(
             config=self.tasks_config["plan_review_task"],  # type: ignore[index]
-            output_file=str(NOVA_ROOT / "answering_reports" / "final_reviewed_plan.md")
+            output_file="{answering_reports_dir}/final_reviewed_plan.md"
         )
 
     @task
@@ -0,0 +1,424 @@
+import pandas as pd
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+import re
+import os
+
+from nova_common.stats_index import load_stats_index
+
+
+FIGURE_NAME = "fig_fast_path.png"
+TABLE_NAME = "table_fast_path.csv"
+MAX_WORDS = 30
+DEFAULT_TOP_K = 10
+MAX_CORR_COLUMNS = 15
+TYPE_SAMPLE_ROWS = 2000
+
+# Anything that asks for reasoning, not just a computation, goes to the crew
+OPEN_ENDED = re.compile(
+    r"\b(why|explain|recommend|suggest|predict|forecast|insights?|interesting|should|causes?|impact|trends?|"
+    r"compare|comparison|versus|vs|summari[sz]e|story|report)\b", re.I,
+)
+MISSING = re.compile(r"\b(missing|nulls?|nan|na values|empty values|blanks?|completeness)\b", re.I)
+CORRELATION = re.compile(r"\b(correlat\w*|relationship between|related to)\b", re.I)
+TOP = re.compile(r"\b(top|highest|largest|biggest|most|bottom|lowest|smallest|least|fewest)\b", re.I)
+COUNT_K = re.compile(r"\b(\d{1,3})\b")
+GROUP = re.compile(r"\b(by|per|for each|each|across)\b", re.I)
+DISTRIBUTION = re.compile(r"\b(distribution|distributed|histogram|spread|breakdown|frequenc\w*)\b", re.I)
+AGGREGATES = [
+    (re.compile(r"\b(average|mean|avg)\b", re.I), "mean"),
+    (re.compile(r"\bmedian\b", re.I), "median"),
+    (re.compile(r"\b(total|sum)\b", re.I), "sum"),
+    (re.compile(r"\b(max|maximum)\b", re.I), "max"),
+    (re.compile(r"\b(min|minimum)\b", re.I), "min"),
+    (re.compile(r"\b(count|number of|how many)\b", re.I), "count"),
+]
+# Row filters the fast path cannot apply ("seats > 5", "price <= 40000", "brand = BYD")
+COMPARISON = re.compile(r"[<>=≠≤≥]|!=")
+# Whole-dataset phrases that are not filters ("... in the dataset", "for each brand")
+BENIGN = re.compile(r" (in|of|across|for) (the |this |my )?(dataset|data|table|file|csv) | for (each|every) ")
+# Every word a plain question may use besides column names; anything else (a value like "Tesla",
+# a filter word like "for", "where", "with", "among", "only", "in", "than") sends it to the crew
+QUESTION_WORDS = {
+    "what", "whats", "which", "how", "is", "are", "the", "a", "an", "of", "to", "and", "there", "do", "does",
+    "have", "has", "show", "me", "give", "list", "display", "plot", "chart", "tell", "find", "get", "compute",
+    "calculate", "i", "want", "see", "know", "please", "can", "could", "you", "values", "value", "rows", "row",
+    "records", "entries", "dataset", "data", "table", "column", "columns", "all", "each", "every", "overall",
+    "distinct", "unique", "different", "by", "per", "across", "group", "grouped", "between",
+    # intent keywords (MISSING, CORRELATION, TOP, DISTRIBUTION, AGGREGATES)
+    "missing", "null", "nulls", "nan", "na", "empty", "blank", "blanks", "completeness",
+    "correlation", "correlations", "correlated", "correlate", "relationship", "related",
+    "top", "highest", "largest", "biggest", "most", "bottom", "lowest", "smallest", "least", "fewest",
+    "common", "frequent", "distribution", "distributed", "histogram", "spread", "breakdown", "frequency",
+    "frequencies", "average", "mean", "avg", "median", "total", "sum", "max", "maximum", "min", "minimum",
+    "count", "counts", "number", "many",
+}
+# Trailing unit tokens: "range_km" also answers to "range", "efficiency_wh_per_km" to "efficiency"
+UNITS = {"km", "kmh", "kwh", "wh", "nm", "kg", "mm", "cm", "m", "l", "s", "h", "kw", "dc", "pct", "usd", "eur", "per"}
+
+
+@dataclass
+class FastPlan:
+    intent: str                      # missingness | correlation | groupby | topk | extreme | distribution
+    columns: List[str] = field(default_factory=list)
+    k: int = DEFAULT_TOP_K
+    agg: str = "mean"
+    ascending: bool = False
+
+
+def fast_path_enabled() -> bool:
+    """NOVA_FAST_PATH=0 sends every question to the Prompt Answering crew."""
+    return os.getenv("NOVA_FAST_PATH", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", str(text).lower()).strip()
+
+
+def _column_spans(q: str, columns: List[str]) -> List[Tuple[int, int, str]]:
+    """(start, end, column) of every column named in the normalized, space-padded question `q`."""
+    spans: List[Tuple[int, int, str]] = []
+    for col in columns:
+        name = _norm(col)
+        if not name:
+            continue
+        parts = name.split()
+        variants = {name}
+        while len(parts) > 1 and (parts[-1] in UNITS or parts[-1].isdigit()):
+            parts = parts[:-1]
+            variants.add(" ".join(parts))
+        for v in sorted(variants, key=len, reverse=True):
+            for form in (f" {v} ", f" {v}s "):
+                pos = q.find(form)
+                if pos >= 0:
+                    spans.append((pos, pos + len(form), col))
+                    break
+            else:
+                continue
+            break
+    return [s for s in spans if not any(o is not s and o[0] <= s[0] and s[1] <= o[1] and (o[1] - o[0]) > (s[1] - s[0]) for o in spans)]
+
+
+def match_columns(question: str, columns: List[str]) -> List[str]:
+    """
+    Columns named in the question, in the order they appear.
+    - Case / punctuation insensitive ('range (km)' finds range_km), unit / number suffixes optional, plural 's' allowed.
+    - A match inside a longer one ('range' inside 'range km') is dropped.
+    """
+    return [col for _, _, col in sorted(_column_spans(f" {_norm(question)} ", columns))]
+
+
+def _without_columns(question: str, columns: List[str]) -> str:
+    """The normalized, space-padded question with every column name blanked out, so the intent rules
+    never fire on a column's own words ('top' in top_speed_kmh, 'count' in review_count)."""
+    q = f" {_norm(question)} "
+    for start, end, _ in sorted(_column_spans(q, columns), reverse=True):
+        q = q[:start] + " " + q[end:]
+    return q
+
+
+def has_condition(question: str, columns: List[str]) -> bool:
+    """
+    True when the question restricts the rows ("for Tesla only", "where seats > 5", "among BYD cars"):
+    a comparison operator, a number other than the top-k count, or a word that is neither a column
+    nor part of a plain question (filter words like for / where / with / only / in / than are not).
+    The fast path answers over every row, so such questions go to the crew.
+    """
+    if COMPARISON.search(question):
+        return True
+    q = BENIGN.sub(" ", _without_columns(question, columns))
+    words = q.split()
+    numbers = [w for w in words if w.isdigit()]
+    if len(numbers) > (1 if TOP.search(q) else 0):
+        return True
+    return any(w not in QUESTION_WORDS for w in words if not w.isdigit())
+
+
+def numeric_columns(sample: pd.DataFrame) -> List[str]:
+    """Columns where at least 90% of the non-empty sample values parse as numbers."""
+    found = []
+    for col in sample.columns:
+        values = sample[col].dropna()
+        if len(values) and pd.to_numeric(values, errors="coerce").notna().mean() >= 0.9:
+            found.append(str(col))
+    return found
+
+
+def classify(question: str, columns: List[str], numeric: List[str]) -> Optional[FastPlan]:
+    """
+    Map a question to one of the deterministic answers, or None for open-ended prompts
+    (reasoning words, long questions, row filters, or nothing matched).
+    The intent rules only see the words around the column names (_without_columns).
+    """
+    if len(question.split()) > MAX_WORDS or has_condition(question, columns):
+        return None
+    rest = _without_columns(question, columns)
+    if OPEN_ENDED.search(rest):
+        return None
+    named = match_columns(question, columns)
+    nums = [c for c in named if c in numeric]
+    cats = [c for c in named if c not in numeric]
+
+    if MISSING.search(rest):
+        return FastPlan("missingness", named)
+    if CORRELATION.search(rest):
+        return FastPlan("correlation", nums)
+
+    agg = next((name for pattern, name in AGGREGATES if pattern.search(rest)), None)
+    top = TOP.search(rest)
+    group = GROUP.search(rest)
+    k = next((int(n) for n in COUNT_K.findall(rest) if 1 <= int(n) <= 100), DEFAULT_TOP_K)
+    ascending = bool(top and top.group(1).lower() in {"bottom", "lowest", "smallest", "least", "fewest"})
+
+    if agg not in (None, "count") and not nums:
+        # An aggregate of a column we could not identify: leave it to the crew
+        return None
+    # "average range by drivetrain", "which 3 brands have the lowest average efficiency", "number of rows per segment"
+    if cats and ((nums and (agg or group)) or (agg == "count" and group)):
+        return FastPlan("groupby", [cats[0], *nums[:1]], k=k if top else 0, agg=agg or ("mean" if nums else "count"), ascending=ascending)
+    if agg in ("min", "max"):
+        # "what is the min top speed": one value (and the rows that reach it), not a top-k list
+        labels = cats[:1] or [c for c in columns if c not in numeric][:2]
+        return FastPlan("extreme", [nums[0], *labels], k=1, agg=agg, ascending=agg == "min")
+    if top and named:
+        if not nums:
+            return FastPlan("topk", cats[:1], k=k, ascending=ascending)
+        # Rows ranked by a number: label them with the named text column, else the first two text columns
+        labels = cats[:1] or [c for c in columns if c not in numeric][:2]
+        return FastPlan("topk", [nums[0], *labels], k=k, ascending=ascending)
+    if DISTRIBUTION.search(rest) and named:
+        return FastPlan("distribution", named[:1])
+    return None
+
+
+def _load(dataset: Path, columns: Optional[List[str]], numeric: List[str]) -> pd.DataFrame:
+    df = pd.read_csv(dataset, usecols=columns or None, low_memory=False, compression="infer")
+    for col in df.columns:
+        if col in numeric:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return f"{value:,}" if isinstance(value, int) else str(value)
+
+
+def _figure(out_dir: Path, draw) -> str:
+    """Render `draw(ax)` to the answer's figure; returns the markdown image tag ("" if matplotlib fails)."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=(8, 4.5))
+        draw(ax)
+        fig.tight_layout()
+        fig.savefig(out_dir / FIGURE_NAME, dpi=120)
+        plt.close(fig)
+        return f"![figure]({FIGURE_NAME})"
+    except Exception as e:
+        print(f"[FastPath] Figure skipped: {e}")
+        return ""
+
+
+def _answer_missingness(nulls: pd.Series, n_rows: int, plan: FastPlan, out_dir: Path) -> List[str]:
+    table = pd.DataFrame({"missing": nulls, "missing_pct": (nulls / max(1, n_rows) * 100).round(2)}).sort_values("missing", ascending=False)
+    table.to_csv(out_dir / TABLE_NAME, index_label="column")
+    shown = table[table["missing"] > 0] if plan.columns == [] else table
+    img = _figure(out_dir, lambda ax: (shown["missing_pct"].head(30).plot.barh(ax=ax), ax.invert_yaxis(), ax.set_xlabel("% missing")))
+    total = int(nulls.sum())
+    lines = [
+        f"**{total:,} missing values** across {int((nulls > 0).sum())} of {len(nulls)} columns ({n_rows:,} rows).",
+        "",
+        shown.to_markdown() if len(shown) else "_No missing values._",
+    ]
+    return lines + (["", img] if img and len(shown) else [])
+
+
+def _answer_correlation(df: pd.DataFrame, plan: FastPlan, out_dir: Path) -> List[str]:
+    if len(plan.columns) == 2:
+        a, b = plan.columns
+        pair = df[[a, b]].dropna()
+        pair.describe().to_csv(out_dir / TABLE_NAME)
+        r = pair[a].corr(pair[b])
+        ranks = pair.rank()
+        spearman = ranks[a].corr(ranks[b])
+        img = _figure(out_dir, lambda ax: (ax.scatter(pair[a], pair[b], s=8, alpha=0.5), ax.set_xlabel(a), ax.set_ylabel(b)))
+        return [
+            f"Pearson correlation between **{a}** and **{b}**: **r = {r:.3f}** (Spearman ρ = {spearman:.3f}, {len(pair):,} rows with both values).",
+            "", img,
+        ]
+    return _answer_corr_matrix(df.corr(numeric_only=True), out_dir)
+
+
+def _answer_corr_matrix(corr: pd.DataFrame, out_dir: Path) -> List[str]:
+    corr.round(3).to_csv(out_dir / TABLE_NAME)
+
+    def draw(ax):
+        im = ax.imshow(corr.values, cmap="coolwarm", vmin=-1, vmax=1)
+        ax.set_xticks(range(len(corr.columns)), corr.columns, rotation=90, fontsize=7)
+        ax.set_yticks(range(len(corr.columns)), corr.columns, fontsize=7)
+        ax.figure.colorbar(im, ax=ax)
+
+    img = _figure(out_dir, draw)
+    pairs = corr.where(~pd.DataFrame(
+        [[i <= j for j in range(len(corr))] for i in range(len(corr))], index=corr.index, columns=corr.columns,
+    )).stack().sort_values(key=abs, ascending=False).head(DEFAULT_TOP_K)
+    strongest = pd.DataFrame({"r": pairs.round(3)})
+    strongest.index = [f"{a} ~ {b}" for a, b in pairs.index]
+    return ["Strongest pairwise (Pearson) correlations between numeric columns:", "", strongest.to_markdown(), "", img]
+
+
+def _answer_groupby(df: pd.DataFrame, plan: FastPlan, out_dir: Path) -> List[str]:
+    key = plan.columns[0]
+    target = plan.columns[1] if len(plan.columns) > 1 else None
+    grouped = df.groupby(key, dropna=True)
+    if target is None:
+        result = grouped.size().rename("count")
+    else:
+        result = grouped[target].agg(plan.agg).rename(f"{plan.agg} of {target}")
+    result = result.sort_values(ascending=plan.ascending)
+    if plan.k:
+        result = result.head(plan.k)
+    result.to_frame().to_csv(out_dir / TABLE_NAME)
+    shown = result.head(30)
+    img = _figure(out_dir, lambda ax: (shown.plot.barh(ax=ax), ax.invert_yaxis(), ax.set_xlabel(result.name)))
+    return [f"**{result.name}** by **{key}** ({grouped.ngroups:,} groups):", "", result.to_frame().to_markdown(), "", img]
+
+
+def _answer_topk(df: pd.DataFrame, plan: FastPlan, numeric: List[str], out_dir: Path) -> List[str]:
+    col = plan.columns[0]
+    if col not in numeric:
+        counts = df[col].value_counts(ascending=plan.ascending).head(plan.k).rename("count")
+        counts.to_frame().to_csv(out_dir / TABLE_NAME)
+        img = _figure(out_dir, lambda ax: (counts.plot.barh(ax=ax), ax.invert_yaxis(), ax.set_xlabel("count")))
+        word = "least" if plan.ascending else "most"
+        return [f"The {plan.k} {word} frequent values of **{col}**:", "", counts.to_frame().to_markdown(), "", img]
+
+    rows = df.dropna(subset=[col]).sort_values(col, ascending=plan.ascending).head(plan.k)
+    labels = [c for c in plan.columns[1:] if c in rows]
+    table = rows[[*labels, col]]
+    table.to_csv(out_dir / TABLE_NAME, index=False)
+    label = rows[labels].astype(str).agg(" ".join, axis=1) if labels else rows.index.astype(str)
+    series = pd.Series(rows[col].values, index=label)
+    img = _figure(out_dir, lambda ax: (series.plot.barh(ax=ax), ax.invert_yaxis(), ax.set_xlabel(col)))
+    word = "lowest" if plan.ascending else "highest"
+    return [f"The {plan.k} rows with the {word} **{col}**:", "", table.to_markdown(index=False), "", img]
+
+
+def _answer_extreme(df: pd.DataFrame, plan: FastPlan, out_dir: Path) -> List[str]:
+    col = plan.columns[0]
+    values = df[col].dropna()
+    value = values.min() if plan.ascending else values.max()
+    rows = df[df[col] == value]
+    labels = [c for c in plan.columns[1:] if c in rows]
+    rows[[*labels, col]].to_csv(out_dir / TABLE_NAME, index=False)
+    word = "minimum" if plan.ascending else "maximum"
+    return [
+        f"The {word} **{col}** is **{_fmt(value.item() if hasattr(value, 'item') else value)}** ({len(rows):,} of {len(values):,} non-empty rows):",
+        "", rows[[*labels, col]].head(DEFAULT_TOP_K).to_markdown(index=False),
+    ]
+
+
+def _answer_distribution(df: pd.DataFrame, plan: FastPlan, numeric: List[str], out_dir: Path) -> List[str]:
+    col = plan.columns[0]
+    values = df[col].dropna()
+    if col not in numeric:
+        counts = values.value_counts()
+        table = pd.DataFrame({"count": counts, "share_pct": (counts / max(1, len(values)) * 100).round(2)})
+        table.to_csv(out_dir / TABLE_NAME, index_label=col)
+        shown = counts.head(30)
+        img = _figure(out_dir, lambda ax: (shown.plot.barh(ax=ax), ax.invert_yaxis(), ax.set_xlabel("count")))
+        return [
+            f"**{col}** has {len(counts):,} distinct values over {len(values):,} non-empty rows "
+            f"({int(df[col].isna().sum()):,} missing); the most common is **{counts.index[0]}** ({counts.iloc[0]:,} rows).",
+            "", table.head(30).to_markdown(), "", img,
+        ]
+
+    stats = values.describe(percentiles=[0.05, 0.25, 0.5, 0.75, 0.95])
+    stats["skew"] = values.skew()
+    stats["missing"] = df[col].isna().sum()
+    stats.to_frame(col).to_csv(out_dir / TABLE_NAME)
+    img = _figure(out_dir, lambda ax: (ax.hist(values, bins=min(50, max(10, values.nunique()))), ax.set_xlabel(col), ax.set_ylabel("rows")))
+    return [
+        f"**{col}** ranges from {_fmt(stats['min'])} to {_fmt(stats['max'])}, with a median of {_fmt(stats['50%'])} "
+        f"and a mean of {_fmt(stats['mean'])} (std {_fmt(stats['std'])}, skew {stats['skew']:.2f}); "
+        f"the middle 50% lies between {_fmt(stats['25%'])} and {_fmt(stats['75%'])}.",
+        "", stats.to_frame(col).map(_fmt).to_markdown(), "", img,
+    ]
+
+
+def try_fast_path(question: str, dataset: Path, out_dir: Path) -> Optional[str]:
+    """
+    Answer a simple analytical question without the crew: classify it, run the vectorized pandas query
+    and write final_answer.md (+ one figure and one table CSV) to `out_dir`.
+    Returns the intent that answered it, or None when the question needs the Prompt Answering crew.
+    """
+    if not fast_path_enabled() or not question.strip():
+        return None
+    dataset = Path(dataset)
+    try:
+        sample = pd.read_csv(dataset, nrows=TYPE_SAMPLE_ROWS, low_memory=False, compression="infer")
+    except Exception as e:
+        print(f"[FastPath] Could not read {dataset}: {e}")
+        return None
+    columns = [str(c) for c in sample.columns]
+    numeric = numeric_columns(sample)
+    plan = classify(question, columns, numeric)
+    if plan is None:
+        return None
+    if plan.intent == "correlation" and len(plan.columns) != 2:
+        plan.columns = []
+
+    print(f"[FastPath] {plan.intent} on {plan.columns or 'all columns'}")
+    # Dataset-wide null counts / correlation matrix come from the cleaning flow's statistics index when it is current
+    index = load_stats_index(dataset) if plan.intent == "missingness" or (plan.intent == "correlation" and not plan.columns) else None
+    try:
+        if plan.intent == "correlation" and not plan.columns:
+            usecols = numeric[:MAX_CORR_COLUMNS]
+            if index is not None and sum(c in index["correlations"] for c in usecols) < 2:
+                index = None
+        else:
+            usecols = plan.columns
+        df = _load(dataset, usecols, numeric) if index is None else None
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / FIGURE_NAME).unlink(missing_ok=True)
+        if plan.intent == "missingness" and index is not None:
+            nulls = pd.Series({name: c["nulls"] for name, c in index["columns"].items()}, dtype="int64")
+            body = _answer_missingness(nulls, index["rows"], plan, out_dir)
+        elif plan.intent == "missingness":
+            body = _answer_missingness(df.isna().sum(), len(df), plan, out_dir)
+        elif plan.intent == "correlation" and index is not None:
+            cols = [c for c in usecols if c in index["correlations"]]
+            corr = pd.DataFrame(index["correlations"]).loc[cols, cols].astype(float)
+            body = _answer_corr_matrix(corr, out_dir)
+        elif plan.intent == "correlation":
+            body = _answer_correlation(df, plan, out_dir)
+        elif plan.intent == "groupby":
+            body = _answer_groupby(df, plan, out_dir)
+        elif plan.intent == "topk":
+            body = _answer_topk(df, plan, numeric, out_dir)
+        elif plan.intent == "extreme":
+            body = _answer_extreme(df, plan, out_dir)
+        else:
+            body = _answer_distribution(df, plan, numeric, out_dir)
+    except Exception as e:
+        # Anything unexpected (odd dtypes, empty groups, ...): let the crew handle the question
+        print(f"[FastPath] Falling back to the crew: {type(e).__name__}: {e}")
+        return None
+
+    lines = [
+        f"# {question.strip()}",
+        "",
+        *body,
+        "",
+        "---",
+        f"_Answered directly from `{dataset.name}` ({plan.intent}); the full table is in `{TABLE_NAME}`._",
+    ]
+    with open(out_dir / "final_answer.md", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines).rstrip() + "\n")
+    return plan.intent
@@ -1,12 +1,21 @@
 #!/usr/bin/env python
 from pydantic import BaseModel, Field
-import pandas as pd
 from crewai.flow import Flow, listen, start
 from typing import List, Dict, Any
 
 
 from .crews.a_prompt_answering_crew.prompt_answering_crew import PromptAnsweringCrew
+from .answering_context import get_answering_context
+from .tools import start_code_session, end_code_session, get_code_session
+from nova_common.workspace import latest_workspace, touch_workspace, workspace_dirs
+from nova_common.tracing import setup_tracing
+from nova_common.llm_cache import log_cache_stats
+from nova_common.llm_registry import routing_metadata, start_routing_run
+from .fast_path import try_fast_path
+from .answer_store import dataset_version, get_answer_store, model_selection
+from .conversation import follow_up_context, get_conversation_store, is_follow_up
 import os
+import time
 from pathlib import Path
 from functools import lru_cache
 
@@ -52,6 +61,9 @@ def find_nova_root(start: Path | None = None, folder_name: str = "NOVA") -> Path
     raise RuntimeError(f"Could not locate '{folder_name}' above {start}")
 
 
+# Spans for every flow step / crew / task / LLM call / tool run when NOVA_TRACING is set
+setup_tracing(find_nova_root())
+
 
 
 
@@ -60,82 +72,142 @@ class DataAnsweringState(BaseModel):
     csv_path: str = ""
     columns: List[str] = Field(default_factory=list)
     sample_rows: List[Dict[str, Any]] = Field(default_factory=list)
+    # Earlier turns of the conversation (question + reusable variables), loaded from the conversation store
     conversation_history: List[Dict[str, Any]] = Field(default_factory=list)
+    # Chat the question belongs to (one per upload / "Clear Chat" in the UI); "" answers it on its own
+    conversation_id: str = ""
+    # AnsweringContext.to_dict() prepared by the caller (the Streamlit session); rebuilt here if stale or missing
+    answering_context: Dict[str, Any] = Field(default_factory=dict)
     nova_path: str = ""
+    workspace_path: str = ""
     reports_path: str = ""
     cleaned_datasets_path: str = ""
     answering_reports_path: str = ""
+    # agent -> model it ran on (model_routing.yaml / model_config.txt), plus any runtime fallbacks
+    model_routing: Dict[str, Any] = Field(default_factory=dict)
+    # intent answered without the crew (see fast_path.py), "" when the crew ran
+    fast_path: str = ""
+    # True: ignore stored answers and run the crew again (the UI's "Recompute" toggle)
+    recompute: bool = False
+    # "exact" / "near" when the answer was restored from the answer store (see answer_store.py)
+    answer_cache: str = ""
 
 
 class DataAnsweringFlow(Flow[DataAnsweringState]):
 
+    def _remember_turn(self, started: float, frames: Dict[str, Any]) -> None:
+        """Add this question to its conversation: plan, answer, derived frames and tables written since `started`."""
+        conversations = get_conversation_store(Path(self.state.nova_path))
+        if conversations is None or not self.state.conversation_id:
+            return
+        try:
+            turn = conversations.record(
+                self.state.conversation_id, self.state.user_prompt, Path(self.state.answering_reports_path), frames, started,
+            )
+            print(f"[Conversation] Turn {turn['turn']} kept with {len(turn['frames'])} frames")
+        except Exception as e:
+            print(f"[Conversation] Could not record the turn: {type(e).__name__}: {e}")
+
     @start()
     def run_answering_crew(self):
 
         current_file = Path(__file__).resolve()
         NOVA_ROOT = find_nova_root(current_file, "NOVA")
         self.state.nova_path = str(NOVA_ROOT)
-        REPORTS_DIR = NOVA_ROOT / "reports"
-        CLEANED_DIR = NOVA_ROOT / "cleaned_datasets"
+        start_routing_run(self.flow_id)
+        # Answer inside the cleaning run's workspace (its reports + cleaned dataset);
+        # without one, use the most recently cleaned workspace
+        if not self.state.workspace_path:
+            self.state.workspace_path = str(latest_workspace(NOVA_ROOT) or NOVA_ROOT)
+        touch_workspace(Path(self.state.workspace_path))
+        dirs = workspace_dirs(Path(self.state.workspace_path))
+        REPORTS_DIR = dirs["reports"]
+        CLEANED_DIR = dirs["cleaned"]
         self.state.reports_path = str(REPORTS_DIR)
         self.state.cleaned_datasets_path = str(CLEANED_DIR)
-        ANSWERING_DIR = NOVA_ROOT / "answering_reports"
-        os.makedirs(ANSWERING_DIR, exist_ok=True)
-        self.state.answering_reports_path = str(ANSWERING_DIR)
+        self.state.answering_reports_path = str(dirs["answering"])
 
         # --- Your deterministic data extraction step here ---
-        try:
-            df = pd.read_csv(self.state.csv_path)
-            self.state.columns = df.columns.tolist()
-            self.state.sample_rows = df.head().to_dict(orient="records")
-        except Exception as e:
-            self.state.columns = []
-            self.state.sample_rows = []
-            print(f"Error loading CSV: {e}")
-
-
-
-        # When reading/writing:
-        reports_dir = REPORTS_DIR
-
-        dataset_overview_path = reports_dir / "dataset_overview.md"
-        data_profiling_report_path = reports_dir / "data_profiling_report.md"
-        summary_cleaning_path = reports_dir / "summary_cleaning_report.md"  # make sure your consolidator writes this
-
-        dataset_overview = ""
-        if dataset_overview_path.exists():
-            with open(dataset_overview_path, "r", encoding="utf-8") as f:
-                dataset_overview = f.read()
-
-        data_profiling_report = ""
-        if data_profiling_report_path.exists():
-            with open(data_profiling_report_path, "r", encoding="utf-8") as f:
-                data_profiling_report = f.read()
-        
-        summary_cleaning_report = ""
-        if summary_cleaning_path.exists():
-            with open(summary_cleaning_path, "r", encoding="utf-8") as f:
-                summary_cleaning_report = f.read()
-
+        # Columns, sample rows and the (trimmed) reports: handed over by the Streamlit session, or kept per process,
+        # and only re-read when one of the files changed.
+        context = get_answering_context(REPORTS_DIR, self.state.csv_path, self.state.answering_context)
+        self.state.answering_context = {}
+        self.state.columns, self.state.sample_rows = context.columns, context.sample_rows
+
+        started = time.time()
+        cleaned_csv = CLEANED_DIR / "cleaned_data_three.csv"
+        dataset = cleaned_csv if cleaned_csv.exists() else Path(self.state.csv_path)
+
+        # A follow-up ("now split that by brand") is planned as a delta against the previous turns:
+        # their reviewed plan, answer and derived frames. It is never served from the answer store or the fast path.
+        conversations = get_conversation_store(NOVA_ROOT)
+        turns = conversations.turns(self.state.conversation_id) if conversations and self.state.conversation_id else []
+        follow_up = is_follow_up(self.state.user_prompt, turns, self.state.columns)
+        self.state.conversation_history = [{"question": t["question"], "variables": list(t["frames"])} for t in turns]
+        conversation_context, previous_frames = "None: this is a new question, not a follow-up.", {}
+        if follow_up:
+            conversation_context, previous_frames = follow_up_context(turns)
+            print(f"[Conversation] Follow-up on turn {turns[-1]['turn']}; {len(previous_frames)} frames preloaded")
+
+        # The same question (up to rephrasing) on the same dataset version and models: restore the stored answer
+        answers = None if follow_up else get_answer_store(NOVA_ROOT)
+        answer_scope = ""
+        if answers is not None and dataset.exists():
+            answer_scope = answers.scope(dataset_version(dataset), model_selection(NOVA_ROOT))
+            hit = None if self.state.recompute else answers.lookup(answer_scope, self.state.user_prompt, dirs["answering"])
+            if hit:
+                self.state.answer_cache = hit["match"]
+                print(f"[AnswerStore] {hit['match']} match for '{self.state.user_prompt}' (stored as '{hit['prompt']}'); crew skipped")
+                self._remember_turn(started, {})
+                return
+
+        # Simple aggregates / top-k / correlation / missingness / distribution questions are answered
+        # straight from the cleaned dataset (or the upload), without any LLM call
+        intent = None if follow_up else try_fast_path(self.state.user_prompt, dataset, Path(self.state.answering_reports_path))
+        if intent:
+            self.state.fast_path = intent
+            print(f"[FastPath] Answered '{self.state.user_prompt}' as {intent}; crew skipped")
+            self._remember_turn(started, {})
+            return
+
+        # One warm interpreter for this question: `df` is the original upload, `df_clean` the cleaned dataset,
+        # `prev_*` the frames of earlier turns on a follow-up (each is only parsed if the agent's code uses it).
+        start_code_session(
+            self.flow_id,
+            {"df": self.state.csv_path, "df_clean": str(cleaned_csv) if cleaned_csv.exists() else "", **previous_frames},
+        )
 
         # Now, run the cleaning crew with all needed inputs!
-        final_answer = (
-            PromptAnsweringCrew()
-            .crew()
-            .kickoff(
-                inputs={
-                    "user_prompt": self.state.user_prompt,
-                    "columns": self.state.columns,
-                    "sample_rows": self.state.sample_rows,
-                    "csv_file_path": self.state.csv_path,  
-                    "data_profiling_report": data_profiling_report,
-                    "dataset_overview": dataset_overview,
-                    "summary_cleaning_report": summary_cleaning_report,
-                    "cleaned_dir": self.state.cleaned_datasets_path,
-                    "answering_reports_dir": self.state.answering_reports_path,
-                }
+        frames: Dict[str, Any] = {}
+        try:
+            final_answer = (
+                PromptAnsweringCrew(session_id=self.flow_id)
+                .crew()
+                .kickoff(
+                    inputs={
+                        "user_prompt": self.state.user_prompt,
+                        "columns": self.state.columns,
+                        "sample_rows": self.state.sample_rows,
+                        "csv_file_path": self.state.csv_path,  
+                        **context.reports,
+                        "cleaned_dir": self.state.cleaned_datasets_path,
+                        "answering_reports_dir": self.state.answering_reports_path,
+                        "conversation_context": conversation_context,
+                    }
+                )
             )
-        )
+            session = get_code_session(self.flow_id)
+            frames = session.derived_frames() if session is not None else {}
+        finally:
+            end_code_session(self.flow_id)
+            log_cache_stats(NOVA_ROOT)
+            self.state.model_routing = routing_metadata(self.flow_id)
+
+        if answers is not None and answer_scope:
+            stored = answers.store(answer_scope, self.state.user_prompt, dirs["answering"], since=started)
+            if stored:
+                print(f"[AnswerStore] Stored {len(stored)} files for '{self.state.user_prompt}'")
+        self._remember_turn(started, frames)
 
 
 
@@ -0,0 +1,7 @@
+from nova_common.session_code_tool import (
+    SessionCodeInterpreterTool,
+    start_code_session,
+    end_code_session,
+    get_code_session,
+)
+from .custom_tool import DatasetStatsTool
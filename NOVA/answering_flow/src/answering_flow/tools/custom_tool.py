@@ -1,22 +1,116 @@
-from typing import Type
+from typing import Any, Dict, List, Optional, Type
+from pathlib import Path
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from nova_common.stats_index import load_stats_index, strongest_correlations
+from nova_common.session_code_tool import get_code_session
 
-class MyCustomToolInput(BaseModel):
-    """Input schema for MyCustomTool."""
 
-    argument: str = Field(..., description="Description of the argument.")
+def _fmt(value: Any) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return str(value)
 
 
-class MyCustomTool(BaseTool):
-    name: str = "Name of my tool"
+class DatasetStatsInput(BaseModel):
+    """Input schema for DatasetStatsTool."""
+
+    column: str = Field(
+        default="",
+        description="Exact column name to describe in detail. Leave empty for an overview of every column.",
+    )
+    dataset_path: str = Field(
+        default="",
+        description="CSV whose statistics to read. Leave empty for the cleaned dataset of this run.",
+    )
+
+
+class DatasetStatsTool(BaseTool):
+    """
+    Reads the statistics index the cleaning flow builds next to `cleaned_data_three.csv` (see stats_index.py):
+    answers come from the precomputed JSON, never from a scan of the rows.
+    - Without a column: shape, one line per column and the strongest correlations.
+    - With a column: nulls, distinct values, quantiles, histogram / most frequent values, correlated columns.
+    Missing or stale index (the dataset changed since cleaning): says so, and the agent falls back to code.
+    `session_id` names the flow's code session, whose `df_clean` (else `df`) is the default dataset.
+    """
+
+    name: str = "Dataset Stats"
     description: str = (
-        "Clear description for what this tool is useful for, your agent will need this information to use it."
+        "Instant precomputed statistics of the cleaned dataset: row count, per-column nulls, distinct counts, "
+        "quantiles, histograms, most frequent values and correlations between numeric columns. "
+        "Use it before writing code for basic statistics."
     )
-    args_schema: Type[BaseModel] = MyCustomToolInput
+    args_schema: Type[BaseModel] = DatasetStatsInput
+    session_id: Optional[str] = None
+
+    def _dataset(self, dataset_path: str) -> Optional[Path]:
+        if dataset_path:
+            return Path(dataset_path)
+        session = get_code_session(self.session_id) if self.session_id else None
+        if session is None:
+            return None
+        path = session.datasets.get("df_clean") or session.datasets.get("df")
+        return Path(path) if path else None
+
+    def _run(self, column: str = "", dataset_path: str = "") -> str:
+        dataset = self._dataset(dataset_path.strip())
+        index = load_stats_index(dataset) if dataset is not None else None
+        if index is None:
+            return (
+                f"No up-to-date statistics index for {dataset or 'this run'}; "
+                "compute the statistics with the Code Interpreter instead."
+            )
+        column = column.strip()
+        if not column:
+            return self._overview(index)
+        if column not in index["columns"]:
+            return f"Unknown column '{column}'. Columns: {', '.join(index['columns'])}"
+        return self._describe(index, column)
+
+    @staticmethod
+    def _overview(index: Dict[str, Any]) -> str:
+        lines = [f"{index['dataset']}: {index['rows']} rows x {index['n_columns']} columns"]
+        for name, c in index["columns"].items():
+            line = f"- {name} ({c['dtype']}): nulls {c['nulls']}, unique {c['unique']}"
+            q = c.get("quantiles") or {}
+            if q:
+                line += f", min {_fmt(q.get('0.0'))}, median {_fmt(q.get('0.5'))}, max {_fmt(q.get('1.0'))}"
+            elif c.get("top_values"):
+                line += f", top '{c['top_values'][0][0]}' ({c['top_values'][0][1]})"
+            lines.append(line)
+        pairs = strongest_correlations(index)
+        if pairs:
+            lines.append("Strongest correlations (Pearson r):")
+            lines += [f"- {a} ~ {b}: {r:.3f}" for a, b, r in pairs]
+        return "\n".join(lines)
 
-    def _run(self, argument: str) -> str:
-        # Implementation goes here
-        return "this is an example of a tool output, ignore it and move along."
+    @staticmethod
+    def _describe(index: Dict[str, Any], column: str) -> str:
+        c = index["columns"][column]
+        rows = index["rows"]
+        lines = [
+            f"{column} ({c['dtype']}, {c['kind']}): {rows} rows, nulls {c['nulls']} "
+            f"({100.0 * c['nulls'] / rows if rows else 0:.2f}%), unique {c['unique']}"
+        ]
+        if c.get("quantiles"):
+            lines.append(f"mean {_fmt(c.get('mean'))}, std {_fmt(c.get('std'))}")
+            lines.append("quantiles: " + ", ".join(f"p{float(q) * 100:g} {_fmt(v)}" for q, v in c["quantiles"].items()))
+        hist = c.get("histogram")
+        if hist:
+            edges: List[Optional[float]] = hist["edges"]
+            lines.append("histogram (bin start: rows): " + ", ".join(
+                f"{_fmt(edges[i])}: {n}" for i, n in enumerate(hist["counts"])
+            ))
+        if c.get("top_values"):
+            shown = ", ".join(f"'{v}': {n}" for v, n in c["top_values"])
+            other = f" (+{c['other_count']} rows with other values)" if c.get("other_count") else ""
+            lines.append(f"most frequent values: {shown}{other}")
+        pairs = strongest_correlations(index, column, top=5)
+        if pairs:
+            lines.append("most correlated: " + ", ".join(f"{b} {r:.3f}" for _, b, r in pairs))
+        return "\n".join(lines)
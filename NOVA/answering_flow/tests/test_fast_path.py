@@ -0,0 +1,54 @@
+from pathlib import Path
+import sys
+
+import pandas as pd
+import pytest
+
+# The flow package and nova_common (NOVA/), as the app puts them on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from answering_flow.fast_path import classify, try_fast_path  # noqa: E402
+
+
+# Column names that contain the fast path's own intent words (top, count, total, max, median, missing)
+COLUMNS = ["brand", "model", "top_speed_kmh", "review_count", "total_price", "max_power_kw", "median_range_km", "missing_parts"]
+NUMERIC = ["top_speed_kmh", "review_count", "total_price", "max_power_kw", "median_range_km", "missing_parts"]
+
+
+@pytest.mark.parametrize("question, intent, columns, ascending", [
+    ("What is the min top speed?", "extreme", ["top_speed_kmh", "brand", "model"], True),
+    ("What is the max top speed?", "extreme", ["top_speed_kmh", "brand", "model"], False),
+    ("minimum total price", "extreme", ["total_price", "brand", "model"], True),
+    ("top 5 top speed", "topk", ["top_speed_kmh", "brand", "model"], False),
+    ("lowest 3 max power", "topk", ["max_power_kw", "brand", "model"], True),
+    ("average review count by brand", "groupby", ["brand", "review_count"], False),
+    ("distribution of median range", "distribution", ["median_range_km"], False),
+])
+def test_intent_words_inside_column_names(question, intent, columns, ascending):
+    plan = classify(question, COLUMNS, NUMERIC)
+    assert plan is not None
+    assert (plan.intent, plan.columns, plan.ascending) == (intent, columns, ascending)
+
+
+@pytest.mark.parametrize("question", [
+    "top speed",             # a column alone is no question
+    "total price of Tesla",  # a value filter
+    "max top speed for Tesla",
+])
+def test_column_words_do_not_make_an_intent(question):
+    assert classify(question, COLUMNS, NUMERIC) is None
+
+
+def test_min_is_answered_with_one_value(tmp_path):
+    dataset = tmp_path / "cars.csv"
+    pd.DataFrame({
+        "brand": ["A", "B", "C", "D"],
+        "model": ["a1", "b1", "c1", "d1"],
+        "top_speed_kmh": [180, 125, 250, 125],
+    }).to_csv(dataset, index=False)
+
+    assert try_fast_path("What is the min top speed?", dataset, tmp_path / "out") == "extreme"
+    answer = (tmp_path / "out" / "final_answer.md").read_text(encoding="utf-8")
+    assert "The minimum **top_speed_kmh** is **125**" in answer
+    assert "highest" not in answer
@@ -0,0 +1,260 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import multiprocessing
+import queue as queue_mod
+import subprocess
+import threading
+import argparse
+import platform
+import shutil
+import json
+import time
+import sys
+import os
+
+from .stub_llm import ResponseBook, StubLLMServer, SCRIPTS_PATH
+from .synthetic_data import generate_csv, parse_size
+
+
+NOVA_ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCH_DIR / "results"
+WORK_DIR = NOVA_ROOT / ".cache" / "benchmarks"
+
+STAGES = ("dataset_overview_crew", "run_exploring_crew", "run_cleaning_crew", "run_answering_crew")
+DEFAULT_SIZES = "1MB,100MB"
+DEFAULT_QUESTION = "What is the distribution of the range (km) of the cars in the dataset?"
+REGRESSION_PCT = 10.0
+SAMPLE_SECONDS = 0.05
+
+
+class StageRecorder:
+    """
+    Per-stage wall time and RSS high-water mark of the flow steps, from crewai's method start/finish events.
+    - A sampler thread polls RSS every SAMPLE_SECONDS and credits the peak to every stage running at that moment.
+    """
+
+    def __init__(self):
+        import psutil
+        from crewai.utilities.events import crewai_event_bus
+        from crewai.utilities.events.flow_events import MethodExecutionStartedEvent, MethodExecutionFinishedEvent
+
+        self._proc = psutil.Process()
+        self._started: Dict[str, float] = {}
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        @crewai_event_bus.on(MethodExecutionStartedEvent)
+        def _on_started(source, event):
+            with self._lock:
+                self._started[event.method_name] = time.perf_counter()
+                self.stages[event.method_name] = {"seconds": 0.0, "peak_rss_mb": self._rss_mb()}
+
+        @crewai_event_bus.on(MethodExecutionFinishedEvent)
+        def _on_finished(source, event):
+            with self._lock:
+                started = self._started.pop(event.method_name, None)
+                if started is not None:
+                    self.stages[event.method_name]["seconds"] = round(time.perf_counter() - started, 3)
+
+        threading.Thread(target=self._sample, name="bench-rss", daemon=True).start()
+
+    def _rss_mb(self) -> float:
+        return round(self._proc.memory_info().rss / (1 << 20), 1)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(SAMPLE_SECONDS):
+            rss = self._rss_mb()
+            with self._lock:
+                for name in self._started:
+                    self.stages[name]["peak_rss_mb"] = max(self.stages[name]["peak_rss_mb"], rss)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def _isolated_root() -> Path:
+    """
+    A throwaway NOVA/ folder (workspaces, caches, model_config.txt pointing at the stub),
+    so benchmarks never touch the real app's files or model selection.
+    """
+    root = WORK_DIR / "NOVA"
+    shutil.rmtree(root, ignore_errors=True)
+    root.mkdir(parents=True)
+    (root / "model_config.txt").write_text("Local\nstub", encoding="utf-8")
+    return root
+
+
+def _run_flows(csv_path: str, nova_root: str, stub_url: str, question: str, queue) -> None:
+    """Child process: run both flows on one dataset and report per-stage numbers."""
+    os.environ.update({
+        "NOVA_ROOT": nova_root,
+        "OLLAMA_API_BASE": stub_url,
+        # Measure the pipeline itself, not cache hits from a previous size/run
+        "NOVA_ARTIFACT_CACHE": "0",
+        "NOVA_INCREMENTAL": "0",
+        "NOVA_LLM_CACHE": "0",
+        # The default question is simple enough for the fast path; run_answering_crew must time the crew
+        "NOVA_FAST_PATH": "0",
+    })
+    sys.path.append(str(NOVA_ROOT))
+    try:
+        recorder = StageRecorder()
+        from csv_cleaning_flow.src.csv_cleaning_flow.main import DataCleaningFlow
+        from answering_flow.src.answering_flow.main import DataAnsweringFlow
+
+        started = time.perf_counter()
+        cleaning = DataCleaningFlow()
+        cleaning.kickoff(inputs={"csv_path": csv_path})
+        answering = DataAnsweringFlow()
+        answering.kickoff(inputs={
+            "user_prompt": question, "csv_path": csv_path, "workspace_path": cleaning.state.workspace_path,
+        })
+        total = round(time.perf_counter() - started, 3)
+        recorder.stop()
+
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        queue.put({
+            "stages": {name: recorder.stages.get(name, {}) for name in STAGES},
+            "total_seconds": total,
+            "peak_rss_mb": round(maxrss / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1),
+        })
+    except BaseException as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def _git_version() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=NOVA_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmarks(
+    sizes: List[str],
+    question: str = DEFAULT_QUESTION,
+    latency_ms: float = 0.0,
+    tokens_per_s: float = 0.0,
+    recordings: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Run the cleaning + answering flows against the stub LLM for each dataset size; one spawned process per size."""
+    server = StubLLMServer(
+        book=ResponseBook(SCRIPTS_PATH, recordings), latency_s=latency_ms / 1000.0, tokens_per_s=tokens_per_s
+    ).start()
+    ctx = multiprocessing.get_context("spawn")
+    runs = []
+    try:
+        for size in sizes:
+            csv_path = generate_csv(parse_size(size), WORK_DIR / "data" / f"ev_specs_{size.lower()}.csv")
+            nova_root = _isolated_root()
+            before = dict(server.stats)
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run_flows, args=(str(csv_path), str(nova_root), server.url, question, queue))
+            print(f"[Bench] {size}: {csv_path.name} ({csv_path.stat().st_size / (1 << 20):.1f} MB)")
+            proc.start()
+            while True:
+                try:
+                    result = queue.get(timeout=1)
+                    break
+                except queue_mod.Empty:
+                    if not proc.is_alive():
+                        result = {"error": f"Benchmark process exited with code {proc.exitcode}"}
+                        break
+            proc.join()
+            result.update({
+                "size": size,
+                "bytes": csv_path.stat().st_size,
+                "llm_requests": server.stats["requests"] - before["requests"],
+                "llm_prompt_tokens": server.stats["prompt_tokens"] - before["prompt_tokens"],
+            })
+            runs.append(result)
+            print(f"[Bench] {size}: {json.dumps(result)}")
+    finally:
+        server.stop()
+
+    return {
+        "version": _git_version(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "stub": {"latency_ms": latency_ms, "tokens_per_s": tokens_per_s},
+        "runs": runs,
+    }
+
+
+def save_results(results: Dict[str, Any]) -> Path:
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{results['created'].replace(':', '')}_{results['version']}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold_pct: float = REGRESSION_PCT) -> List[str]:
+    """Lines describing every stage time / memory that grew more than `threshold_pct` since `baseline`."""
+    regressions = []
+    base_runs = {r["size"]: r for r in baseline.get("runs", []) if "error" not in r}
+    for run in current.get("runs", []):
+        base = base_runs.get(run["size"])
+        if base is None or "error" in run:
+            continue
+        metrics = [("total_seconds", base.get("total_seconds"), run.get("total_seconds")),
+                   ("peak_rss_mb", base.get("peak_rss_mb"), run.get("peak_rss_mb"))]
+        for stage in STAGES:
+            old, new = base["stages"].get(stage, {}), run["stages"].get(stage, {})
+            metrics += [(f"{stage}.seconds", old.get("seconds"), new.get("seconds")),
+                        (f"{stage}.peak_rss_mb", old.get("peak_rss_mb"), new.get("peak_rss_mb"))]
+        for name, old, new in metrics:
+            if old and new and (new - old) / old * 100 > threshold_pct:
+                regressions.append(
+                    f"{run['size']} {name}: {old} -> {new} (+{(new - old) / old * 100:.1f}%, "
+                    f"{baseline['version']} -> {current['version']})"
+                )
+    return regressions
+
+
+def latest_result(exclude: Optional[Path] = None) -> Optional[Path]:
+    found = sorted(p for p in RESULTS_DIR.glob("*.json") if p != exclude)
+    return found[-1] if found else None
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks of DataCleaningFlow + DataAnsweringFlow with a stub LLM")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated dataset sizes (default {DEFAULT_SIZES})")
+    parser.add_argument("--question", default=DEFAULT_QUESTION)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated per-request LLM latency")
+    parser.add_argument("--tokens-per-s", type=float, default=0.0, help="Simulated LLM generation speed (0 = instant)")
+    parser.add_argument("--recordings", type=Path, default=None, help="Recorded responses (JSONL) to replay")
+    parser.add_argument("--baseline", type=Path, default=None, help="Result file to compare with (default: latest)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_PCT, help="Regression threshold in percent")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASELINE", "CURRENT"), help="Only compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        baseline, current = (json.loads(p.read_text(encoding="utf-8")) for p in args.compare)
+    else:
+        baseline_path = args.baseline or latest_result()
+        current = run_benchmarks(
+            [s.strip() for s in args.sizes.split(",") if s.strip()],
+            args.question, args.latency_ms, args.tokens_per_s, args.recordings,
+        )
+        print(f"[Bench] Results saved to {save_results(current)}")
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path else None
+
+    if baseline is None:
+        print("[Bench] No baseline result to compare with")
+        return
+    regressions = compare_results(baseline, current, args.threshold)
+    for line in regressions:
+        print(f"[Bench] REGRESSION {line}")
+    if not regressions:
+        print(f"[Bench] No regressions above {args.threshold}% vs {baseline['version']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import multiprocessing
+import subprocess
+import statistics
+import argparse
+import platform
+import shutil
+import json
+import time
+import sys
+import os
+
+from .run_benchmarks import NOVA_ROOT, RESULTS_DIR, WORK_DIR, REGRESSION_PCT, _git_version
+
+
+APP_PATH = NOVA_ROOT / "streamlit" / "CSVBot.py"
+STARTUP_RESULTS_DIR = RESULTS_DIR / "startup"
+DEFAULT_RERUNS = 20
+DEFAULT_WORKER_STARTS = 3
+APP_TIMEOUT_S = 120
+
+# Child process: time from interpreter start to the end of CSVBot's first script run, then N reruns.
+# Printed as one JSON line (everything else the app prints goes before it).
+_APP_PROBE = r"""
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=float(sys.argv[3]))
+at.run()
+first = time.perf_counter()
+reruns = []
+for _ in range(int(sys.argv[2])):
+    t = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - t)
+print(json.dumps({
+    "streamlit_import_s": imported - started,
+    "first_run_s": first - imported,
+    "reruns_s": reruns,
+    "exception": [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def _isolated_root() -> Path:
+    """A throwaway NOVA/ folder (NOVA_ROOT points the app at it), so the app never touches the real files."""
+    root = WORK_DIR / "startup" / "NOVA"
+    shutil.rmtree(root, ignore_errors=True)
+    root.mkdir(parents=True)
+    (root / "model_config.txt").write_text("Local\nstub", encoding="utf-8")
+    return root
+
+
+def measure_app(reruns: int = DEFAULT_RERUNS) -> Dict[str, Any]:
+    """
+    CSVBot.py in Streamlit's headless AppTest, in a fresh interpreter:
+    - first_paint_s: process start to the end of the first script run (imports + first render)
+    - rerun_ms: what every widget interaction costs (the script is re-executed from the top)
+    """
+    env = {**os.environ, "NOVA_ROOT": str(_isolated_root()), "NOVA_MAX_JOBS": "1", "PYTHONPATH": os.pathsep.join(sys.path + [str(NOVA_ROOT)])}
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _APP_PROBE, str(APP_PATH), str(reruns), str(APP_TIMEOUT_S)],
+        cwd=NOVA_ROOT, env=env, capture_output=True, text=True, timeout=APP_TIMEOUT_S * 2,
+    )
+    wall = time.perf_counter() - started
+    lines = [ln for ln in proc.stdout.splitlines() if ln.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        return {"error": (proc.stderr or proc.stdout).strip()[-2000:]}
+    probe = json.loads(lines[-1])
+    runs = sorted(probe["reruns_s"]) or [0.0]
+    result = {
+        "first_paint_s": round(wall - sum(probe["reruns_s"]), 3),
+        "streamlit_import_s": round(probe["streamlit_import_s"], 3),
+        "first_run_s": round(probe["first_run_s"], 3),
+        "rerun_ms": {
+            "mean": round(statistics.mean(runs) * 1000, 1),
+            "p95": round(runs[min(len(runs) - 1, int(len(runs) * 0.95))] * 1000, 1),
+            "max": round(runs[-1] * 1000, 1),
+        },
+    }
+    if probe["exception"]:
+        result["app_exceptions"] = probe["exception"]
+    return result
+
+
+def _import_flows(nova_root: str, queue) -> None:
+    """Worker body: import what a job imports, report when it is ready."""
+    sys.path.append(nova_root)
+    from answering_flow.src.answering_flow import main as _answering  # noqa: F401
+    from csv_cleaning_flow.src.csv_cleaning_flow import main as _cleaning  # noqa: F401
+    queue.put(time.perf_counter())
+
+
+def measure_worker_start(method: str, starts: int = DEFAULT_WORKER_STARTS) -> Dict[str, Any]:
+    """Seconds from Process.start() to a worker with both flows imported, per job start method."""
+    sys.path.append(str(NOVA_ROOT))
+    ctx = multiprocessing.get_context(method)
+    if method == "forkserver":
+        sys.path.append(str(APP_PATH.parent))
+        from job_runner import PRELOAD_MODULES
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+    times: List[float] = []
+    for _ in range(starts):
+        queue = ctx.Queue()
+        started = time.perf_counter()
+        proc = ctx.Process(target=_import_flows, args=(str(NOVA_ROOT), queue))
+        proc.start()
+        try:
+            ready = queue.get(timeout=APP_TIMEOUT_S)
+        except Exception:
+            proc.kill()
+            return {"error": f"worker did not start (exit code {proc.exitcode})"}
+        proc.join()
+        if method == "forkserver":
+            # perf_counter is CLOCK_MONOTONIC on Linux / macOS: comparable across processes
+            times.append(ready - started)
+        else:
+            times.append(time.perf_counter() - started)
+    return {"first_s": round(times[0], 3), "warm_s": round(statistics.mean(times[1:] or times), 3)}
+
+
+def run_startup_benchmark(reruns: int = DEFAULT_RERUNS, worker_starts: int = DEFAULT_WORKER_STARTS) -> Dict[str, Any]:
+    methods = ["spawn"] + (["forkserver"] if "forkserver" in multiprocessing.get_all_start_methods() else [])
+    app = measure_app(reruns)
+    print(f"[Startup] app: {json.dumps(app)}")
+    workers = {}
+    for method in methods:
+        workers[method] = measure_worker_start(method, worker_starts)
+        print(f"[Startup] {method} worker: {json.dumps(workers[method])}")
+    return {
+        "version": _git_version(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "app": app,
+        "workers": workers,
+    }
+
+
+def save_results(results: Dict[str, Any]) -> Path:
+    STARTUP_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = STARTUP_RESULTS_DIR / f"{results['created'].replace(':', '')}_{results['version']}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def _metrics(results: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    app = results.get("app", {})
+    metrics = {
+        "first_paint_s": app.get("first_paint_s"),
+        "rerun_ms.mean": app.get("rerun_ms", {}).get("mean"),
+        "rerun_ms.p95": app.get("rerun_ms", {}).get("p95"),
+    }
+    for method, numbers in results.get("workers", {}).items():
+        metrics[f"{method}.warm_s"] = numbers.get("warm_s")
+    return metrics
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold_pct: float = REGRESSION_PCT) -> List[str]:
+    """Lines describing every startup metric that grew more than `threshold_pct` since `baseline`."""
+    old, new = _metrics(baseline), _metrics(current)
+    return [
+        f"{name}: {old[name]} -> {new[name]} (+{(new[name] - old[name]) / old[name] * 100:.1f}%, "
+        f"{baseline['version']} -> {current['version']})"
+        for name in new
+        if old.get(name) and new[name] and (new[name] - old[name]) / old[name] * 100 > threshold_pct
+    ]
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Cold start and per-rerun cost of the Streamlit app and the job workers")
+    parser.add_argument("--reruns", type=int, default=DEFAULT_RERUNS, help=f"Script reruns to time (default {DEFAULT_RERUNS})")
+    parser.add_argument("--worker-starts", type=int, default=DEFAULT_WORKER_STARTS, help="Worker starts per start method")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_PCT, help="Regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    found = sorted(STARTUP_RESULTS_DIR.glob("*.json"))
+    current = run_startup_benchmark(args.reruns, args.worker_starts)
+    print(f"[Startup] Results saved to {save_results(current)}")
+    if not found:
+        print("[Startup] No baseline result to compare with")
+        return
+    baseline = json.loads(found[-1].read_text(encoding="utf-8"))
+    regressions = compare_results(baseline, current, args.threshold)
+    for line in regressions:
+        print(f"[Startup] REGRESSION {line}")
+    if not regressions:
+        print(f"[Startup] No regressions above {args.threshold}% vs {baseline['version']}")
+
+
+if __name__ == "__main__":
+    main()
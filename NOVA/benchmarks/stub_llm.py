@@ -0,0 +1,234 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import urllib.request
+import threading
+import argparse
+import hashlib
+import json
+import re
+import time
+
+
+SCRIPTS_PATH = Path(__file__).resolve().parent / "scripts" / "default_responses.json"
+
+
+def prompt_key(messages: List[Dict[str, Any]]) -> str:
+    """Recording key: sha256 of the conversation (roles + contents)."""
+    h = hashlib.sha256()
+    for m in messages:
+        h.update(f"{m.get('role', '')}\0{m.get('content', '')}\0".encode("utf-8"))
+    return h.hexdigest()
+
+
+class ResponseBook:
+    """
+    Where the stub's answers come from, in order:
+    - recordings: {prompt key: response} captured from a real model (`--record` mode), replayed verbatim
+    - scripts: [{"match": regex, "response": text}], first regex found in the prompt wins
+    - default: the scripts file's "default" text
+    """
+
+    def __init__(self, scripts_path: Path = SCRIPTS_PATH, recordings_path: Optional[Path] = None):
+        with open(scripts_path, "r", encoding="utf-8") as f:
+            scripts = json.load(f)
+        self.scripts = [(re.compile(s["match"]), s["response"]) for s in scripts.get("responses", [])]
+        self.default = scripts.get("default", "Thought: I now can give a great answer\nFinal Answer: OK")
+        self.recordings_path = Path(recordings_path) if recordings_path else None
+        self.recordings: Dict[str, str] = {}
+        if self.recordings_path and self.recordings_path.exists():
+            with open(self.recordings_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.recordings[entry["key"]] = entry["response"]
+        self._lock = threading.Lock()
+
+    def answer(self, messages: List[Dict[str, Any]]) -> str:
+        recorded = self.recordings.get(prompt_key(messages))
+        if recorded is not None:
+            return recorded
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        for pattern, response in self.scripts:
+            if pattern.search(prompt):
+                return response
+        return self.default
+
+    def record(self, messages: List[Dict[str, Any]], response: str) -> None:
+        key = prompt_key(messages)
+        with self._lock:
+            self.recordings[key] = response
+            if self.recordings_path:
+                self.recordings_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.recordings_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"key": key, "response": response}) + "\n")
+
+
+class StubLLMServer:
+    """
+    Local stand-in for Ollama (/api/chat, /api/generate) and OpenAI-compatible (/v1/chat/completions) endpoints.
+    - `latency_s` + `tokens_per_s` simulate model time, so crew overhead can be measured against a known LLM cost.
+    - `upstream`: forward every request to a real Ollama server and record its answers (replayed on later runs).
+    - GET /stats returns request / token counters.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        book: Optional[ResponseBook] = None,
+        latency_s: float = 0.0,
+        tokens_per_s: float = 0.0,
+        upstream: str = "",
+    ):
+        self.book = book or ResponseBook()
+        self.latency_s = latency_s
+        self.tokens_per_s = tokens_per_s
+        self.upstream = upstream.rstrip("/")
+        self.stats = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # ---------- request handling ----------
+    def _complete(self, messages: List[Dict[str, Any]], body: Dict[str, Any], path: str) -> str:
+        if self.upstream:
+            req = urllib.request.Request(
+                self.upstream + path,
+                data=json.dumps({**body, "stream": False}).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(req) as resp:
+                data = json.load(resp)
+            text = data.get("message", {}).get("content") or data.get("response", "")
+            self.book.record(messages, text)
+        else:
+            text = self.book.answer(messages)
+
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+        completion_tokens = len(text) // 4
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+        delay = self.latency_s + (completion_tokens / self.tokens_per_s if self.tokens_per_s > 0 else 0.0)
+        if delay > 0 and not self.upstream:
+            time.sleep(delay)
+        return text
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # keep benchmark output readable
+                pass
+
+            def _send(self, payload: Any, stream: bool = False) -> None:
+                lines = payload if stream else [payload]
+                data = b"".join(json.dumps(p).encode("utf-8") + b"\n" for p in lines)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson" if stream else "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.startswith("/api/tags"):
+                    self._send({"models": [{"name": "stub", "model": "stub"}]})
+                elif self.path.startswith("/stats"):
+                    self._send(dict(server.stats))
+                else:
+                    self._send({"status": "ok"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0) or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                model = body.get("model", "stub")
+                created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+                if self.path.startswith("/api/show"):
+                    self._send({"modelfile": "", "template": "", "details": {"family": "stub"}, "model_info": {}})
+                    return
+
+                if self.path.startswith("/api/generate"):
+                    messages = [{"role": "user", "content": body.get("prompt", "")}]
+                    text = server._complete(messages, body, "/api/generate")
+                    done = {
+                        "model": model, "created_at": created, "response": text, "done": True,
+                        "prompt_eval_count": len(body.get("prompt", "")) // 4, "eval_count": len(text) // 4,
+                    }
+                    if body.get("stream"):
+                        self._send([{**done, "done": False}, {**done, "response": ""}], stream=True)
+                    else:
+                        self._send(done)
+                    return
+
+                messages = body.get("messages", [])
+                if self.path.startswith("/api/chat"):
+                    text = server._complete(messages, body, "/api/chat")
+                    done = {
+                        "model": model, "created_at": created, "message": {"role": "assistant", "content": text},
+                        "done": True, "prompt_eval_count": 0, "eval_count": len(text) // 4,
+                    }
+                    if body.get("stream"):
+                        self._send([{**done, "done": False}, {**done, "message": {"role": "assistant", "content": ""}}], stream=True)
+                    else:
+                        self._send(done)
+                    return
+
+                # OpenAI-compatible /v1/chat/completions
+                text = server._complete(messages, body, "/api/chat")
+                self._send({
+                    "id": f"chatcmpl-stub-{int(time.time() * 1000)}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": {
+                        "prompt_tokens": sum(len(str(m.get("content", ""))) for m in messages) // 4,
+                        "completion_tokens": len(text) // 4,
+                        "total_tokens": 0,
+                    },
+                })
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub LLM server (Ollama / OpenAI-compatible) for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--scripts", type=Path, default=SCRIPTS_PATH)
+    parser.add_argument("--recordings", type=Path, default=None, help="JSONL of recorded responses to replay / append to")
+    parser.add_argument("--upstream", default="", help="Real Ollama URL to forward to and record from")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--tokens-per-s", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubLLMServer(
+        args.host, args.port, ResponseBook(args.scripts, args.recordings),
+        args.latency_ms / 1000.0, args.tokens_per_s, args.upstream,
+    )
+    print(f"[StubLLM] Serving on {server.url} (set OLLAMA_API_BASE={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional
+import argparse
+import re
+
+
+SEED_CSV = Path(__file__).resolve().parents[1] / "electric_vehicles_spec_2025.csv"
+CHUNK_ROWS = 50_000
+SIZE_UNITS = {"KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """'1MB', '250MB', '2GB' -> bytes."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]B)\s*", text.upper())
+    if not m:
+        raise ValueError(f"Unrecognised size '{text}' (use e.g. 1MB, 500MB, 2GB)")
+    return int(float(m.group(1)) * SIZE_UNITS[m.group(2)])
+
+
+def _dirty_chunk(seed: pd.DataFrame, rows: int, rng: np.random.Generator, start_id: int) -> pd.DataFrame:
+    """
+    `rows` rows resampled from the seed dataset with the kinds of issues the crews look for:
+    jittered numbers, unit suffixes, padded/miscased labels, placeholder strings, blanks and exact duplicates.
+    """
+    chunk = seed.iloc[rng.integers(0, len(seed), rows)].reset_index(drop=True)
+    # Unique models, so duplicates only come from the injected ones below
+    chunk["model"] = chunk["model"].astype(str) + " #" + (start_id + np.arange(rows)).astype(str)
+
+    for col in ("top_speed_kmh", "range_km", "efficiency_wh_per_km", "torque_nm"):
+        if col in chunk:
+            values = pd.to_numeric(chunk[col], errors="coerce")
+            chunk[col] = np.round(values * rng.normal(1.0, 0.05, rows))
+
+    def pick(p: float) -> np.ndarray:
+        return rng.random(rows) < p
+
+    if "battery_capacity_kWh" in chunk:
+        col = chunk["battery_capacity_kWh"].astype(object)
+        mask = pick(0.05)
+        col[mask] = col[mask].astype(str) + " kWh"
+        chunk["battery_capacity_kWh"] = col
+    if "range_km" in chunk:
+        col = chunk["range_km"].astype(object)
+        mask = pick(0.03)
+        col[mask] = col[mask].astype(str) + " km"
+        col[pick(0.02)] = np.nan
+        chunk["range_km"] = col
+    if "top_speed_kmh" in chunk:
+        chunk.loc[pick(0.005), "top_speed_kmh"] = -1
+    for col in ("brand", "model"):
+        mask = pick(0.04)
+        chunk.loc[mask, col] = "  " + chunk.loc[mask, col].astype(str) + " "
+    if "drivetrain" in chunk:
+        mask = pick(0.05)
+        chunk.loc[mask, "drivetrain"] = chunk.loc[mask, "drivetrain"].astype(str).str.lower()
+    if "battery_type" in chunk:
+        chunk.loc[pick(0.02), "battery_type"] = rng.choice(["N/A", "?"])
+
+    dupes = chunk.sample(frac=0.01, random_state=int(rng.integers(0, 2**31)))
+    return pd.concat([chunk, dupes], ignore_index=True)
+
+
+def generate_csv(target_bytes: int, out_path: Path, seed_csv: Path = SEED_CSV, seed: int = 7) -> Path:
+    """
+    Write a synthetic EV-spec CSV of roughly `target_bytes` (streamed in chunks, so multi-GB files are fine).
+    Deterministic for a given (target_bytes, seed); an existing file of that size is reused.
+    """
+    out_path = Path(out_path)
+    if out_path.exists() and out_path.stat().st_size >= target_bytes:
+        return out_path
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    base = pd.read_csv(seed_csv, low_memory=False)
+    rng = np.random.default_rng(seed)
+    bytes_per_row = max(1, seed_csv.stat().st_size // max(1, len(base)))
+    written, next_id = 0, 0
+    tmp = out_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        header = True
+        while written < target_bytes:
+            rows = int(min(CHUNK_ROWS, max(1, (target_bytes - written) // bytes_per_row + 1)))
+            text = _dirty_chunk(base, rows, rng, next_id).to_csv(index=False, header=header)
+            f.write(text)
+            written += len(text.encode("utf-8"))
+            next_id += rows
+            header = False
+    tmp.replace(out_path)
+    return out_path
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Generate synthetic EV-spec CSVs for benchmarks")
+    parser.add_argument("size", help="Target size, e.g. 1MB, 500MB, 2GB")
+    parser.add_argument("out", type=Path)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    path = generate_csv(parse_size(args.size), args.out, seed=args.seed)
+    print(f"[Bench] {path} ({path.stat().st_size / (1 << 20):.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from functools import lru_cache
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+
+DEFAULT_MAX_MB = 1024
+CHUNK_SIZE = 1 << 20
+# Unreferenced blobs younger than this may belong to an entry another process is about to index
+BLOB_GRACE_SECONDS = 3600
+
+
+def sha256_file(path: Path) -> str:
+    """Stream a file through sha256 (safe for multi-GB CSVs)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Exclusive lock on `path` shared by every process using the store (flock on POSIX, msvcrt on Windows)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 s; keep waiting
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _put_blob(src: Path, blob: Path) -> None:
+    """Copy `src` to `blob` atomically (other processes never see a half-written blob); refresh its mtime if present."""
+    if blob.exists():
+        # Keeps an unreferenced blob that is about to be indexed again out of the eviction grace window
+        os.utime(blob)
+        return
+    tmp = blob.with_name(f"{blob.name}.{os.getpid()}.tmp")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, blob)
+
+
+def stage_key(stage: str, parts: Iterable[str], config_files: Iterable[Path]) -> str:
+    """
+    Build a cache key for one flow stage.
+    - `parts`: already-hashed / plain identifiers (CSV hash, model selection, upstream stage key, ...)
+    - `config_files`: files whose contents change the stage output (agents.yaml, tasks.yaml, crew module)
+    """
+    h = hashlib.sha256(stage.encode("utf-8"))
+    for part in parts:
+        h.update(b"\0" + str(part).encode("utf-8"))
+    for cfg in config_files:
+        h.update(b"\0" + cfg.name.encode("utf-8") + b"\0")
+        if cfg.exists():
+            h.update(cfg.read_bytes())
+    return h.hexdigest()
+
+
+class ArtifactCache:
+    """
+    Content-addressed store for stage artifacts (reports/*, cleaned_datasets/*).
+    - blobs/<sha256>  : file contents, shared between entries
+    - index.json      : {key: {stage, files, size, last_used}}, plus hit/miss counters
+    - index.lock      : file lock held around every read-modify-write of index.json and eviction, since
+      cleaning flows run in several job worker processes at once
+    Entries are evicted least-recently-used first once the blobs exceed `max_bytes`.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.root = Path(root)
+        self.blobs_dir = self.root / "blobs"
+        self.index_path = self.root / "index.json"
+        self.lock_path = self.root / "index.lock"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---------- index helpers ----------
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault("entries", {})
+        index.setdefault("hits", 0)
+        index.setdefault("misses", 0)
+        return index
+
+    def _save_index(self, index: Dict) -> None:
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    @contextmanager
+    def _locked(self):
+        with self._lock, file_lock(self.lock_path):
+            yield
+
+    # ---------- public API ----------
+    def restore(self, key: str, targets: Dict[str, Path]) -> bool:
+        """
+        Copy the artifacts stored under `key` into `targets` ({"reports": dir, "cleaned": dir}).
+        Returns True on a hit; counts a miss (and drops broken entries) otherwise.
+        """
+        with self._locked():
+            index = self._load_index()
+            entry = index["entries"].get(key)
+            try:
+                if entry is None:
+                    raise FileNotFoundError(key)
+                for f in entry["files"]:
+                    dest_dir = Path(targets[f["dir"]])
+                    dest_dir.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(self.blobs_dir / f["blob"], dest_dir / f["name"])
+            except FileNotFoundError:
+                # Missing entry, or a blob removed by hand: a miss, and the broken entry is dropped
+                index["entries"].pop(key, None)
+                index["misses"] += 1
+                self._save_index(index)
+                return False
+
+            entry["last_used"] = time.time()
+            index["hits"] += 1
+            self._save_index(index)
+            return True
+
+    def store(self, key: str, stage: str, sources: Dict[str, Path], since: float) -> List[str]:
+        """
+        Snapshot every file in `sources` modified at/after `since` (i.e. written by this stage).
+        Returns the stored file names.
+        """
+        files = []
+        for label, src_dir in sources.items():
+            src_dir = Path(src_dir)
+            if not src_dir.is_dir():
+                continue
+            for p in sorted(src_dir.iterdir()):
+                if not p.is_file() or p.stat().st_mtime < since:
+                    continue
+                digest = sha256_file(p)
+                _put_blob(p, self.blobs_dir / digest)
+                files.append({"dir": label, "name": p.name, "blob": digest, "size": p.stat().st_size})
+
+        if not files:
+            return []
+
+        with self._locked():
+            index = self._load_index()
+            index["entries"][key] = {
+                "stage": stage,
+                "files": files,
+                "size": sum(f["size"] for f in files),
+                "last_used": time.time(),
+            }
+            self._evict(index)
+            self._save_index(index)
+        return [f["name"] for f in files]
+
+    def stats(self) -> Dict[str, int]:
+        index = self._load_index()
+        return {
+            "hits": index["hits"],
+            "misses": index["misses"],
+            "entries": len(index["entries"]),
+            "bytes": self._blob_bytes(index),
+        }
+
+    # ---------- eviction ----------
+    def _blob_bytes(self, index: Dict) -> int:
+        blobs = {}
+        for entry in index["entries"].values():
+            for f in entry["files"]:
+                blobs[f["blob"]] = f["size"]
+        return sum(blobs.values())
+
+    def _evict(self, index: Dict) -> None:
+        entries = index["entries"]
+        while entries and self._blob_bytes(index) > self.max_bytes:
+            oldest = min(entries, key=lambda k: entries[k]["last_used"])
+            entries.pop(oldest)
+
+        # Drop blobs no entry references anymore, once they are older than the grace period
+        # (a younger one may have just been copied by a store() that has not taken the lock yet)
+        live = {f["blob"] for e in entries.values() for f in e["files"]}
+        cutoff = time.time() - BLOB_GRACE_SECONDS
+        for blob in self.blobs_dir.iterdir():
+            try:
+                if blob.name not in live and blob.stat().st_mtime < cutoff:
+                    blob.unlink(missing_ok=True)
+            except OSError:
+                continue
+
+
+@lru_cache(maxsize=4)
+def get_artifact_cache(nova_root: Path) -> Optional[ArtifactCache]:
+    """
+    Shared cache under NOVA/.cache/artifacts.
+    - NOVA_ARTIFACT_CACHE=0 disables it (returns None).
+    - NOVA_ARTIFACT_CACHE_MAX_MB bounds its size (default 1024).
+    """
+    if os.getenv("NOVA_ARTIFACT_CACHE", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    try:
+        max_mb = float(os.getenv("NOVA_ARTIFACT_CACHE_MAX_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        max_mb = DEFAULT_MAX_MB
+    return ArtifactCache(Path(nova_root) / ".cache" / "artifacts", int(max_mb * 1024 * 1024))
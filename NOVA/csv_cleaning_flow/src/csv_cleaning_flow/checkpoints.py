@@ -0,0 +1,104 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from functools import lru_cache
+import json
+import os
+import shutil
+import time
+
+
+MAX_CHECKPOINTS = 8
+
+
+class CheckpointStore:
+    """
+    Per-run checkpoints of DataCleaningFlow, so a failed run resumes at its first incomplete stage.
+    - <run_id>/checkpoint.json        : DataCleaningState dump + completed stages, rewritten after every step
+    - <run_id>/<stage>/<dir>/<name>   : the files each completed stage wrote (reports/*, cleaned_datasets/*)
+    A run's checkpoint is dropped once the flow finishes; only the MAX_CHECKPOINTS most recent are kept.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.root / run_id / "checkpoint.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Resumable runs, most recent first."""
+        found = [self.load(p.parent.name) for p in self.root.glob("*/checkpoint.json")]
+        return sorted((c for c in found if c), key=lambda c: c.get("updated", 0), reverse=True)
+
+    def save_stage(
+        self, run_id: str, stage: str, state: Dict[str, Any], sources: Dict[str, Path], since: float
+    ) -> List[str]:
+        """
+        Snapshot every file in `sources` modified at/after `since` (i.e. written by `stage`),
+        then record the stage as completed together with the state it left behind.
+        """
+        run_dir = self.root / run_id
+        stage_dir = run_dir / stage
+        shutil.rmtree(stage_dir, ignore_errors=True)
+        files = []
+        for label, src_dir in sources.items():
+            src_dir = Path(src_dir)
+            if not src_dir.is_dir():
+                continue
+            for p in sorted(src_dir.iterdir()):
+                if not p.is_file() or p.stat().st_mtime < since:
+                    continue
+                dest = stage_dir / label / p.name
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(p, dest)
+                files.append(f"{label}/{p.name}")
+
+        checkpoint = self.load(run_id) or {"run_id": run_id, "created": time.time(), "completed_stages": []}
+        if stage not in checkpoint["completed_stages"]:
+            checkpoint["completed_stages"].append(stage)
+        checkpoint.update({"state": state, "updated": time.time()})
+        checkpoint.setdefault("files", {})[stage] = files
+
+        run_dir.mkdir(parents=True, exist_ok=True)
+        tmp = run_dir / "checkpoint.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, indent=2, default=str)
+        os.replace(tmp, run_dir / "checkpoint.json")
+
+        for old in self.runs()[MAX_CHECKPOINTS:]:
+            self.discard(old["run_id"])
+        return files
+
+    def restore_stage(self, run_id: str, stage: str, targets: Dict[str, Path]) -> bool:
+        """Copy a completed stage's files back into `targets` ({"reports": dir, "cleaned": dir})."""
+        checkpoint = self.load(run_id)
+        if checkpoint is None or stage not in checkpoint["completed_stages"]:
+            return False
+        stage_dir = self.root / run_id / stage
+        for rel in checkpoint.get("files", {}).get(stage, []):
+            label, name = rel.split("/", 1)
+            src = stage_dir / label / name
+            if not src.exists():
+                return False
+            dest_dir = Path(targets[label])
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(src, dest_dir / name)
+        return True
+
+    def discard(self, run_id: str) -> None:
+        shutil.rmtree(self.root / run_id, ignore_errors=True)
+
+
+@lru_cache(maxsize=4)
+def get_checkpoint_store(nova_root: Path) -> Optional[CheckpointStore]:
+    """
+    Store under NOVA/.cache/checkpoints.
+    - NOVA_CHECKPOINTS=0 disables it (returns None).
+    """
+    if os.getenv("NOVA_CHECKPOINTS", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    return CheckpointStore(Path(nova_root) / ".cache" / "checkpoints")
@@ -0,0 +1,387 @@
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import re
+
+
+STAGES = ("numerical", "categorical", "integrity")
+EXAMPLES_PER_CHANGE = 3
+NUMBER_PATTERN = r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+TRUE_VALUES = {"true", "t", "yes", "y", "1"}
+FALSE_VALUES = {"false", "f", "no", "n", "0"}
+
+# "## Machine-Readable Operations" section -> first ```json fenced block after it (or anywhere, as a fallback)
+_OPS_SECTION = re.compile(r"^#+\s*Machine-Readable Operations\s*$", re.I | re.M)
+_JSON_BLOCK = re.compile(r"```json\s*\n(.*?)```", re.S)
+
+
+class OpError(ValueError):
+    """An operation that cannot be applied (bad shape, unknown column, wrong dtype)."""
+
+
+def extract_ops(plan_markdown: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Pull the planner's op list out of its markdown plan.
+    - Returns None when the plan has no parseable ```json list (caller falls back to the cleaning crew).
+    - Returns [] when the planner explicitly asked for no cleaning.
+    """
+    if not plan_markdown:
+        return None
+    section = _OPS_SECTION.search(plan_markdown)
+    text = plan_markdown[section.end():] if section else plan_markdown
+    block = _JSON_BLOCK.search(text)
+    if block is None:
+        return None
+    try:
+        ops = json.loads(block.group(1))
+    except ValueError:
+        return None
+    if isinstance(ops, dict):
+        ops = ops.get("operations", ops.get("ops"))
+    if not isinstance(ops, list) or not all(isinstance(op, dict) and "op" in op for op in ops):
+        return None
+    return ops
+
+
+# ---------- helpers ----------
+def _columns(op: Dict[str, Any], df: pd.DataFrame, key: str = "columns") -> List[str]:
+    cols = op.get(key)
+    if cols is None and "column" in op:
+        cols = [op["column"]]
+    if isinstance(cols, str):
+        cols = [cols]
+    if not cols:
+        raise OpError(f"'{op['op']}' needs a non-empty '{key}' list")
+    missing = [c for c in cols if c not in df.columns]
+    if missing:
+        raise OpError(f"unknown column(s) {missing}")
+    return list(cols)
+
+
+def _text_apply(s: pd.Series, fn: Callable[[Any], pd.Series]) -> pd.Series:
+    """Apply a `.str` transformation to the string cells only; numbers/NaN pass through untouched."""
+    if not (ptypes.is_object_dtype(s) or ptypes.is_string_dtype(s)):
+        return s
+    out = fn(s.str)
+    return out.where(out.notna(), s)
+
+
+def _numeric(s: pd.Series, col: str) -> pd.Series:
+    if ptypes.is_numeric_dtype(s) and not ptypes.is_bool_dtype(s):
+        return s
+    raise OpError(f"column '{col}' is {s.dtype}, not numeric (cast or strip_units it first)")
+
+
+def _changed(before: pd.Series, after: pd.Series) -> pd.Series:
+    # Object views with NA/NaT as None, so nullable dtypes compare without "ambiguous NA" errors
+    b = before.astype(object).where(before.notna(), None)
+    a = after.astype(object).where(after.notna(), None)
+    return ~(b.eq(a) | (before.isna() & after.isna()))
+
+
+# ---------- operations: (df, op) -> (df, {column: detail}) ----------
+def _op_strip_whitespace(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    for col in _columns(op, df):
+        df[col] = _text_apply(df[col], lambda s: s.strip())
+    return df, {}
+
+
+def _op_normalize_case(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    case = op.get("case", "lower")
+    if case not in {"lower", "upper", "title"}:
+        raise OpError(f"unsupported case '{case}'")
+    for col in _columns(op, df):
+        df[col] = _text_apply(df[col], lambda s: getattr(s, case)())
+    return df, {"case": case}
+
+
+def _op_replace(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    values = op.get("values")
+    if not isinstance(values, list) or not values:
+        raise OpError("'replace' needs a non-empty 'values' list")
+    new = op.get("with")
+    for col in _columns(op, df):
+        df[col] = df[col].mask(df[col].isin(values), np.nan if new is None else new)
+    return df, {"values": values, "with": new}
+
+
+def _op_strip_units(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    factor = float(op.get("factor", 1.0))
+    thousands = op.get("thousands", ",")
+    for col in _columns(op, df):
+        s = df[col]
+        if not ptypes.is_numeric_dtype(s):
+            text = s.astype("string")
+            if thousands:
+                text = text.str.replace(thousands, "", regex=False)
+            s = pd.to_numeric(text.str.extract(NUMBER_PATTERN, expand=False), errors="coerce").astype("float64")
+        df[col] = s * factor if factor != 1.0 else s
+    return df, {"factor": factor}
+
+
+def _op_cast(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    to = op.get("to")
+    for col in _columns(op, df):
+        s = df[col]
+        if to == "float":
+            df[col] = pd.to_numeric(s, errors="coerce").astype("float64")
+        elif to == "int":
+            df[col] = pd.to_numeric(s, errors="coerce").round().astype("Int64")
+        elif to == "string":
+            df[col] = s.astype("string")
+        elif to == "category":
+            df[col] = s.astype("category")
+        elif to == "datetime":
+            df[col] = pd.to_datetime(s, errors="coerce", format=op.get("format"))
+        elif to == "bool":
+            lowered = s.astype("string").str.strip().str.lower()
+            df[col] = lowered.map(lambda v: True if v in TRUE_VALUES else False if v in FALSE_VALUES else pd.NA).astype("boolean")
+        else:
+            raise OpError(f"unsupported cast target '{to}'")
+    return df, {"to": to}
+
+
+def _op_clip(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    lower, upper = op.get("lower"), op.get("upper")
+    action = op.get("action", "clip")
+    if lower is None and upper is None:
+        raise OpError("'clip' needs 'lower' and/or 'upper'")
+    if action not in {"clip", "null"}:
+        raise OpError(f"unsupported clip action '{action}'")
+    for col in _columns(op, df):
+        s = _numeric(df[col], col)
+        if action == "clip":
+            df[col] = s.clip(lower=lower, upper=upper)
+        else:
+            outside = pd.Series(False, index=s.index)
+            if lower is not None:
+                outside |= s < lower
+            if upper is not None:
+                outside |= s > upper
+            df[col] = s.mask(outside)
+    return df, {"lower": lower, "upper": upper, "action": action}
+
+
+def _op_impute(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    strategy = op.get("strategy", "median")
+    resolved = {}
+    for col in _columns(op, df):
+        s = df[col]
+        if strategy in {"median", "mean"}:
+            value = getattr(_numeric(s, col), strategy)()
+            if ptypes.is_integer_dtype(s):
+                value = round(value)
+        elif strategy == "mode":
+            modes = s.mode(dropna=True)
+            value = modes.iloc[0] if len(modes) else None
+        elif strategy == "constant":
+            value = (op.get("values") or {}).get(col, op.get("value"))
+        else:
+            raise OpError(f"unsupported impute strategy '{strategy}'")
+        if value is None or (isinstance(value, float) and pd.isna(value)):
+            continue
+        df[col] = s.fillna(value)
+        resolved[col] = value.item() if hasattr(value, "item") else value
+    return df, {"strategy": strategy, "values": resolved}
+
+
+def _op_map_categories(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    mapping = op.get("mapping")
+    if not isinstance(mapping, dict) or not mapping:
+        raise OpError("'map_categories' needs a non-empty 'mapping' object")
+    case_insensitive = bool(op.get("case_insensitive", True))
+    for col in _columns(op, df):
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype(object)
+        if case_insensitive:
+            lookup = {str(k).strip().lower(): v for k, v in mapping.items()}
+            keys = s.astype("string").str.strip().str.lower()
+        else:
+            lookup, keys = mapping, s
+        hit = keys.isin(list(lookup)).fillna(False).astype(bool)
+        df[col] = s.mask(hit, keys.map(lookup))
+    return df, {"mapping": mapping}
+
+
+def _op_drop_duplicates(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    subset = _columns(op, df, "subset") if op.get("subset") else None
+    keep = op.get("keep", "first")
+    if keep not in {"first", "last"}:
+        raise OpError(f"unsupported keep '{keep}'")
+    before = len(df)
+    df = df.drop_duplicates(subset=subset, keep=keep)
+    return df, {"rows_removed": before - len(df), "subset": subset}
+
+
+def _op_drop_rows(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    if op.get("where", "missing") != "missing":
+        raise OpError("'drop_rows' only supports where='missing'")
+    cols = _columns(op, df)
+    before = len(df)
+    df = df.dropna(subset=cols)
+    return df, {"rows_removed": before - len(df)}
+
+
+def _op_drop_columns(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    cols = _columns(op, df)
+    return df.drop(columns=cols), {"columns_removed": cols}
+
+
+def _op_rename(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    mapping = op.get("mapping")
+    if not isinstance(mapping, dict) or not mapping:
+        raise OpError("'rename' needs a non-empty 'mapping' object")
+    missing = [c for c in mapping if c not in df.columns]
+    if missing:
+        raise OpError(f"unknown column(s) {missing}")
+    return df.rename(columns=mapping), {"mapping": mapping}
+
+
+OPERATIONS: Dict[str, Callable[[pd.DataFrame, Dict[str, Any]], Tuple[pd.DataFrame, Dict[str, Any]]]] = {
+    "strip_whitespace": _op_strip_whitespace,
+    "normalize_case": _op_normalize_case,
+    "replace": _op_replace,
+    "strip_units": _op_strip_units,
+    "cast": _op_cast,
+    "clip": _op_clip,
+    "impute": _op_impute,
+    "map_categories": _op_map_categories,
+    "drop_duplicates": _op_drop_duplicates,
+    "drop_rows": _op_drop_rows,
+    "drop_columns": _op_drop_columns,
+    "rename": _op_rename,
+}
+
+# Ops that change the row set / schema are logged once for the whole frame, not per column
+FRAME_OPS = {"drop_duplicates", "drop_rows", "drop_columns", "rename"}
+
+
+def apply_op(df: pd.DataFrame, op: Dict[str, Any]) -> Tuple[pd.DataFrame, List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Apply one operation and diff its effect.
+    Returns (new_df, change_log_rows, resolved_details); raises OpError if the op is invalid for `df`.
+    """
+    name = op.get("op")
+    if name not in OPERATIONS:
+        raise OpError(f"unknown operation '{name}'")
+
+    if name in FRAME_OPS:
+        new_df, details = OPERATIONS[name](df, op)
+        changed = details.get("rows_removed", len(details.get("columns_removed", details.get("mapping", {}))))
+        return new_df, [{"column": "*", "rows_changed": int(changed), "examples": ""}], details
+
+    cols = _columns(op, df)
+    before = df[cols].copy()
+    new_df, details = OPERATIONS[name](df.copy(deep=False), op)
+
+    log = []
+    for col in cols:
+        changed = _changed(before[col], new_df[col])
+        n = int(changed.sum())
+        examples = [
+            {"row": str(idx), "original": str(before.at[idx, col]), "new": str(new_df.at[idx, col])}
+            for idx in changed[changed].index[:EXAMPLES_PER_CHANGE]
+        ]
+        log.append({"column": col, "rows_changed": n, "examples": json.dumps(examples, default=str) if examples else ""})
+    return new_df, log, details
+
+
+def row_hashes(df: pd.DataFrame, subset: Optional[List[str]] = None) -> np.ndarray:
+    """uint64 hash per row over `subset` (all columns if None), independent of the index."""
+    return pd.util.hash_pandas_object(df[subset] if subset else df, index=False).to_numpy()
+
+
+def _drop_seen_duplicates(
+    df: pd.DataFrame, op: Dict[str, Any], seen: np.ndarray
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]], Dict[str, Any], np.ndarray]:
+    """drop_duplicates(keep="first") for appended rows: also drops rows already kept by an earlier run."""
+    subset = _columns(op, df, "subset") if op.get("subset") else None
+    hashes = row_hashes(df, subset)
+    dup = pd.Series(hashes).duplicated().to_numpy() | np.isin(hashes, seen)
+    kept = df[~dup]
+    details = {"rows_removed": int(dup.sum()), "subset": subset, "checked_against": int(len(seen))}
+    return kept, [{"column": "*", "rows_changed": int(dup.sum()), "examples": ""}], details, np.concatenate([seen, hashes[~dup]])
+
+
+def _resolved(op: Dict[str, Any], details: Dict[str, Any]) -> Dict[str, Any]:
+    # Data-dependent values are frozen, so re-applying the op to new rows reproduces this run exactly
+    if op["op"] == "impute" and details.get("values"):
+        return {"op": "impute", "columns": list(details["values"]), "strategy": "constant", "values": details["values"]}
+    return op
+
+
+def run_cleaning_ops(
+    df: pd.DataFrame,
+    ops_by_stage: Dict[str, List[Dict[str, Any]]],
+    dedup_hashes: Optional[Dict[str, np.ndarray]] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Run every stage's op list, in pipeline order (numerical -> categorical -> integrity).
+    - Invalid or failing ops are skipped and reported; they never abort the run.
+    - `dedup_hashes` ({"<stage>-<applied index>": row hashes}) is filled with the rows each keep="first"
+      drop_duplicates kept; when it already holds hashes (appended rows), those rows count as seen.
+    Returns (cleaned_df, change_log DataFrame, skipped ops, applied ops with resolved values).
+    """
+    log_rows: List[Dict[str, Any]] = []
+    skipped: List[Dict[str, Any]] = []
+    applied: Dict[str, List[Dict[str, Any]]] = {stage: [] for stage in STAGES}
+    for stage in STAGES:
+        for step, op in enumerate(ops_by_stage.get(stage, []), start=1):
+            dedup_key = f"{stage}-{len(applied[stage])}"
+            try:
+                if dedup_hashes is not None and dedup_key in dedup_hashes and op.get("op") == "drop_duplicates":
+                    df, changes, details, dedup_hashes[dedup_key] = _drop_seen_duplicates(df, op, dedup_hashes[dedup_key])
+                else:
+                    df, changes, details = apply_op(df, op)
+                    if dedup_hashes is not None and op["op"] == "drop_duplicates" and op.get("keep", "first") == "first":
+                        dedup_hashes[dedup_key] = row_hashes(df, details["subset"])
+            except (OpError, KeyError, TypeError, ValueError) as e:
+                skipped.append({"stage": stage, "step": step, "op": op, "reason": str(e)})
+                continue
+            applied[stage].append(_resolved(op, details))
+            for change in changes:
+                log_rows.append({
+                    "stage": stage,
+                    "step": step,
+                    "op": op["op"],
+                    **change,
+                    "details": json.dumps(details, default=str),
+                })
+    columns = ["stage", "step", "op", "column", "rows_changed", "examples", "details"]
+    return df, pd.DataFrame(log_rows, columns=columns), skipped, applied
+
+
+def render_cleaning_log(
+    change_log: pd.DataFrame,
+    skipped: List[Dict[str, Any]],
+    shape_before: Tuple[int, int],
+    shape_after: Tuple[int, int],
+) -> str:
+    """Markdown summary of the engine run, handed to the reporting agent instead of three LLM cleaning reports."""
+    out = [
+        "# Cleaning Engine Log",
+        "",
+        f"- Shape before: {shape_before[0]} rows x {shape_before[1]} columns",
+        f"- Shape after: {shape_after[0]} rows x {shape_after[1]} columns",
+        f"- Operations applied: {change_log[['stage', 'step']].drop_duplicates().shape[0]}, skipped: {len(skipped)}",
+        "",
+    ]
+    for stage in STAGES:
+        rows = change_log[change_log["stage"] == stage]
+        out += [f"## {stage.capitalize()} stage", ""]
+        if rows.empty:
+            out += ["- No operations applied.", ""]
+            continue
+        out += ["| Step | Operation | Column | Rows changed | Details | Examples |", "|---|---|---|---|---|---|"]
+        out += [
+            f"| {r.step} | {r.op} | {r.column} | {r.rows_changed} | {r.details} | {r.examples or '-'} |"
+            for r in rows.itertuples(index=False)
+        ]
+        out.append("")
+    out += ["## Skipped Operations", ""]
+    out += [f"- {s['stage']} step {s['step']}: `{json.dumps(s['op'], default=str)}` - {s['reason']}" for s in skipped] or ["- None."]
+    out.append("")
+    return "\n".join(out)
@@ -0,0 +1,136 @@
+from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+import re
+
+
+FAMILIES = ("numerical", "categorical", "integrity", "summary")
+
+# Report-wide sections each task family receives, besides its per-column blocks
+FAMILY_SECTIONS = {
+    "numerical": ("dataset overview", "short notes", "online research"),
+    "categorical": ("dataset overview", "categorical value summaries", "short notes", "online research"),
+    "integrity": (
+        "dataset overview",
+        "data types and missingness",
+        "missingness overview",
+        "non-informative",
+        "short notes",
+    ),
+    "summary": ("dataset overview", "data types and missingness", "non-informative"),
+}
+SUMMARY_SAMPLE_ROWS = 2
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """tiktoken count when available, otherwise the usual ~4 characters per token estimate."""
+    enc = _encoder()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def split_report(report: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Split the baseline profiling report into:
+    - sections: {"## heading" (lower-case): body} for the report-wide sections
+    - column_blocks: {column: "### column" block} from "Per-Column Documentation"
+    """
+    sections: Dict[str, str] = {}
+    column_blocks: Dict[str, str] = {}
+    parts = re.split(r"^##\s+(?!#)(.+)$", report, flags=re.M)
+    for heading, body in zip(parts[1::2], parts[2::2]):
+        key = heading.strip().lower()
+        if key.startswith("per-column documentation"):
+            blocks = re.split(r"^###\s+(?!#)(.+)$", body, flags=re.M)
+            for name, block in zip(blocks[1::2], blocks[2::2]):
+                column_blocks[name.strip().strip("`")] = f"### {name.strip()}\n{block.strip()}"
+        elif key != "table of contents":
+            sections[key] = body.strip()
+    return sections, column_blocks
+
+
+def _is_numeric(block: str) -> bool:
+    return "Summary Statistics (Numeric)" in block or "Needs type conversion" in block
+
+
+def family_columns(columns: List[str], column_blocks: Dict[str, str]) -> Dict[str, List[str]]:
+    """Columns per task family; numeric-stored-as-text columns belong to both numerical and categorical."""
+    numerical = [c for c in columns if _is_numeric(column_blocks.get(c, ""))]
+    categorical = [
+        c for c in columns
+        if "Top " in column_blocks.get(c, "") or c not in numerical
+    ]
+    return {"numerical": numerical, "categorical": categorical, "integrity": list(columns), "summary": list(columns)}
+
+
+def build_task_contexts(
+    report: str, columns: List[str], sample_rows: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Per-family crew inputs, so each task only gets the slice of the profiling report it works on:
+    - {family}_profiling_context : matching "### column" blocks + the family's report-wide sections
+    - {family}_columns / {family}_sample_rows : the same column subset
+    Families: numerical, categorical, integrity (dataset-wide tables, no per-column blocks), summary.
+    A report that can't be split is passed through whole.
+    """
+    sections, column_blocks = split_report(report or "")
+    by_family = family_columns(columns, column_blocks)
+    title = (report or "").strip().splitlines()[0] if (report or "").strip() else "# Dataset Baseline Profiling Report"
+
+    inputs: Dict[str, Any] = {}
+    for family in FAMILIES:
+        cols = by_family[family]
+        if not column_blocks:
+            context = report
+        else:
+            picked = [
+                f"## {heading.title()}\n{body}"
+                for heading, body in sections.items()
+                if any(heading.startswith(name) for name in FAMILY_SECTIONS[family])
+            ]
+            # Dataset overview first, then the family's columns, then the dataset-wide sections
+            overview, rest = picked[:1], picked[1:]
+            per_column = [column_blocks[c] for c in cols if c in column_blocks] if family in {"numerical", "categorical"} else []
+            context = "\n\n".join([
+                f"{title} (excerpt for {family} tasks: {len(cols)} of {len(columns)} columns)",
+                *overview,
+                *(["## Per-Column Documentation", *per_column] if per_column else []),
+                *rest,
+            ])
+        rows = sample_rows[:SUMMARY_SAMPLE_ROWS] if family == "summary" else sample_rows
+        inputs[f"{family}_profiling_context"] = context
+        inputs[f"{family}_columns"] = cols
+        inputs[f"{family}_sample_rows"] = [{c: row.get(c) for c in cols if c in row} for row in rows]
+    return inputs
+
+
+def report_task_tokens(crew: Any, inputs: Dict[str, Any], label: str) -> Dict[str, int]:
+    """
+    Print (and return) the interpolated prompt size of each task in `crew`
+    (description + expected output, after the inputs are filled in).
+    """
+    from crewai.utilities.string_utils import interpolate_only
+
+    counts = {}
+    for task in crew.tasks:
+        name = task.name or task.description[:40]
+        try:
+            text = interpolate_only(task.description, inputs) + "\n" + interpolate_only(task.expected_output, inputs)
+        except (KeyError, ValueError):
+            continue
+        counts[name] = count_tokens(text)
+
+    full = count_tokens(inputs.get("data_profiling_report", "") or "")
+    print(f"[Context] {label}: full profiling report = {full} tokens")
+    for name, n in counts.items():
+        print(f"[Context]   {name}: {n} tokens")
+    return counts
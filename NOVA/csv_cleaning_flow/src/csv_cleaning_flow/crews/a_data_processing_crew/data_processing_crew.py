@@ -1,9 +1,9 @@
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List, Optional, Tuple
+from typing import List, Optional
+from nova_common.llm_registry import agent_tasks, get_llm
 from crewai_tools import (
-    CodeInterpreterTool,
     SerperDevTool
 )
 from pathlib import Path
@@ -80,112 +80,16 @@ class DataProcessingCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
-
-
-
-    @property
-    def processing_llm(self) -> LLM:
-        """Build an LLM for deterministic processing (e.g., profiling) using the latest model_config.txt."""
-        cfg_path = (NOVA_ROOT / "model_config.txt").resolve()
-        # 1) Read config (2 lines: source, selection)
-        try:
-            lines = [ln.strip() for ln in cfg_path.read_text(encoding="utf-8").splitlines() if ln.strip()]
-            source    = (lines[0] if len(lines) >= 1 else "API").strip()
-            selection = (lines[1] if len(lines) >= 2 else "gemini/gemini-2.5-flash").strip()
-        except Exception:
-            source, selection = "API", "gemini/gemini-2.5-flash"
-
-        
-        print(f"\n\n\n\n\n\n[LLM] processing_llm config: source='{source}', selection='{selection}'\n\n\n\n\n\n")
-
-        src = source.lower()
-        src = src if src in {"local", "api"} else "api"
-
-        # 2) Resolve to a CrewAI LLM
-        temperature = 0.1
-        if src == "local":
-            # Force Ollama for local selections (e.g., 'llama3.2' -> 'ollama/llama3.2')
-            tag = selection.split("/", 1)[-1]
-            model_id = f"ollama/{tag}"
-            print(f"[LLM] processing_llm -> {model_id}")
-            return LLM(model=model_id, temperature=temperature)
-
-        # API branch: expect 'provider/model'
-        if "/" not in selection:
-            provider, model_name = "gemini", selection
-        else:
-            provider, model_name = selection.split("/", 1)
-
-        provider = provider.lower().strip()
-        model_id = f"{provider}/{model_name.strip()}"
-
-        # Map provider to env var key if known
-        env_keys = {
-            "openai": "OPENAI_API_KEY",
-            "gemini": "GEMINI_API_KEY",
-        }
-        #kwargs = {"temperature": temperature, "additional_drop_params": ["stop"]}
-        kwargs = {"temperature": temperature}
-        api_env = env_keys.get(provider, f"{provider.upper()}_API_KEY")
-        api_key = os.getenv(api_env)
-        if api_key:
-            kwargs["api_key"] = api_key
-        elif provider in env_keys:
-            raise RuntimeError(f"{api_env} is not set but '{provider}' was selected in model_config.txt.")
-
-        print(f"[LLM] processing_llm -> {model_id}")
-        return LLM(model=model_id, **kwargs)
-
-    @property
-    def researching_llm(self) -> LLM:
-        """Build an LLM for research/exploration using the latest model_config.txt."""
-        cfg_path = (NOVA_ROOT / "model_config.txt").resolve()
-        # 1) Read config (2 lines: source, selection)
-        try:
-            lines = [ln.strip() for ln in cfg_path.read_text(encoding="utf-8").splitlines() if ln.strip()]
-            source    = (lines[0] if len(lines) >= 1 else "API").strip()
-            selection = (lines[1] if len(lines) >= 2 else "gemini/gemini-2.5-flash").strip()
-        except Exception:
-            source, selection = "API", "gemini/gemini-2.5-flash"
-
-        src = source.lower()
-        src = src if src in {"local", "api"} else "api"
-
-        # 2) Resolve to a CrewAI LLM
-        temperature = 0.4
-        if src == "local":
-            tag = selection.split("/", 1)[-1]
-            model_id = f"ollama/{tag}"
-            print(f"[LLM] researching_llm -> {model_id}")
-            return LLM(model=model_id, temperature=temperature)
-
-        if "/" not in selection:
-            provider, model_name = "gemini", selection
-        else:
-            provider, model_name = selection.split("/", 1)
-
-        provider = provider.lower().strip()
-        model_id = f"{provider}/{model_name.strip()}"
-
-        env_keys = {
-            "openai": "OPENAI_API_KEY",
-            "gemini": "GEMINI_API_KEY",
-        }
-        #kwargs = {"temperature": temperature, "additional_drop_params": ["stop"]}
-        kwargs = {"temperature": temperature}
-        api_env = env_keys.get(provider, f"{provider.upper()}_API_KEY")
-        api_key = os.getenv(api_env)
-        if api_key:
-            kwargs["api_key"] = api_key
-        elif provider in env_keys:
-            raise RuntimeError(f"{api_env} is not set but '{provider}' was selected in model_config.txt.")
-
-        print(f"[LLM] researching_llm -> {model_id}")
-        return LLM(model=model_id, **kwargs)
+    def __init__(self, session_id: Optional[str] = None):
+        # Id of the flow run: the agents' models are recorded under it (llm_registry.routing_metadata)
+        self.session_id = session_id
 
 
 
 
+    def routed_llm(self, agent_name: str, role: str) -> LLM:
+        """Shared LLM of one agent: its model_routing.yaml route (tasks > agent > role), else model_config.txt (see llm_registry)."""
+        return get_llm(NOVA_ROOT, role, agent_name, agent_tasks(self.tasks_config, agent_name), run_id=self.session_id or "")
 
     # If you would lik to add tools to your crew, you can learn more about it here:
     # https://docs.crewai.com/concepts/agents#agent-tools
@@ -195,7 +99,7 @@ class DataProcessingCrew:
         return Agent(
             config=self.agents_config["data_research_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.researching_llm,
+            llm=self.routed_llm("data_research_agent", "researching"),
             memory=True,
             tools=[SerperDevTool()]  # type: ignore[index]
         )
@@ -205,9 +109,10 @@ class DataProcessingCrew:
         return Agent(
             config=self.agents_config["data_profiling_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.processing_llm,
+            llm=self.routed_llm("data_profiling_agent", "processing"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            # Statistics are computed by the flow (profiling.py); the agent only writes the narrative
+            tools=[]  # type: ignore[index]
         )
 
     # To learn more about structured task outputs,
@@ -218,14 +123,14 @@ class DataProcessingCrew:
     def data_research_task(self) -> Task:
         return Task(
             config=self.tasks_config["data_research_task"],  # type: ignore[index]
-            output_file=str(NOVA_ROOT / "reports" / "dataset_overview.md")
+            output_file="{reports_dir}/dataset_overview.md"
         )
     
     @task
     def data_profiling_task(self) -> Task:
         return Task(
             config=self.tasks_config["data_profiling_task"],  # type: ignore[index]
-            output_file=str(NOVA_ROOT / "reports" / "data_profiling_report.md")
+            output_file="{reports_dir}/data_profiling_narrative.md"
         )
 
     @crew
@@ -1,11 +1,12 @@
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List, Optional, Tuple
+from typing import List, Optional
+from nova_common.llm_registry import agent_tasks, get_llm
 from crewai_tools import (
-    CodeInterpreterTool,
     FileReadTool
 )
+from ...tools import SessionCodeInterpreterTool
 from pathlib import Path
 from dotenv import load_dotenv
 import os
@@ -81,59 +82,15 @@ class DataExploringCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    def __init__(self, session_id: Optional[str] = None):
+        # Code session of the flow run (tools/session_code_tool.py): the agents' tools bind to it by id
+        self.session_id = session_id
 
 
-    @property
-    def exploring_llm(self) -> LLM:
-        """Build an LLM for deterministic processing (e.g., profiling) using the latest model_config.txt."""
-        cfg_path = (NOVA_ROOT / "model_config.txt").resolve()
-        # 1) Read config (2 lines: source, selection)
-        try:
-            lines = [ln.strip() for ln in cfg_path.read_text(encoding="utf-8").splitlines() if ln.strip()]
-            source    = (lines[0] if len(lines) >= 1 else "API").strip()
-            selection = (lines[1] if len(lines) >= 2 else "gemini/gemini-2.5-flash").strip()
-        except Exception:
-            source, selection = "API", "gemini/gemini-2.5-flash"
-
-        print(f"\n\n\n\n\n\n[LLM] processing_llm config: source='{source}', selection='{selection}'\n\n\n\n\n\n")
-        
-        src = source.lower()
-        src = src if src in {"local", "api"} else "api"
-
-        # 2) Resolve to a CrewAI LLM
-        temperature = 0.1
-        if src == "local":
-            # Force Ollama for local selections (e.g., 'llama3.2' -> 'ollama/llama3.2')
-            tag = selection.split("/", 1)[-1]
-            model_id = f"ollama/{tag}"
-            print(f"[LLM] processing_llm -> {model_id}")
-            return LLM(model=model_id, temperature=temperature)
-
-        # API branch: expect 'provider/model'
-        if "/" not in selection:
-            provider, model_name = "gemini", selection
-        else:
-            provider, model_name = selection.split("/", 1)
-
-        provider = provider.lower().strip()
-        model_id = f"{provider}/{model_name.strip()}"
-
-        # Map provider to env var key if known
-        env_keys = {
-            "openai": "OPENAI_API_KEY",
-            "gemini": "GEMINI_API_KEY",
-        }
-        #kwargs = {"temperature": temperature, "additional_drop_params": ["stop"]}
-        kwargs = {"temperature": temperature}
-        api_env = env_keys.get(provider, f"{provider.upper()}_API_KEY")
-        api_key = os.getenv(api_env)
-        if api_key:
-            kwargs["api_key"] = api_key
-        elif provider in env_keys:
-            raise RuntimeError(f"{api_env} is not set but '{provider}' was selected in model_config.txt.")
-
-        print(f"[LLM] processing_llm -> {model_id}")
-        return LLM(model=model_id, **kwargs)
+
+    def routed_llm(self, agent_name: str, role: str) -> LLM:
+        """Shared LLM of one agent: its model_routing.yaml route (tasks > agent > role), else model_config.txt (see llm_registry)."""
+        return get_llm(NOVA_ROOT, role, agent_name, agent_tasks(self.tasks_config, agent_name), run_id=self.session_id or "")
 
 
 
@@ -148,9 +105,9 @@ class DataExploringCrew:
         return Agent(
             config=self.agents_config["numerical_diagnostic_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.exploring_llm,
+            llm=self.routed_llm("numerical_diagnostic_agent", "exploring"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
     
 
@@ -159,9 +116,9 @@ class DataExploringCrew:
         return Agent(
             config=self.agents_config["numerical_diagnostic_agent_two"],  # type: ignore[index]
             verbose=True,
-            llm=self.exploring_llm,
+            llm=self.routed_llm("numerical_diagnostic_agent_two", "exploring"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
     
 
@@ -170,9 +127,9 @@ class DataExploringCrew:
         return Agent(
             config=self.agents_config["numerical_cleaning_planner_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.exploring_llm,
+            llm=self.routed_llm("numerical_cleaning_planner_agent", "exploring"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True), FileReadTool()]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id), FileReadTool()]  # type: ignore[index]
         )
 
 
@@ -181,9 +138,9 @@ class DataExploringCrew:
         return Agent(
             config=self.agents_config["categorical_diagnostic_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.exploring_llm,
+            llm=self.routed_llm("categorical_diagnostic_agent", "exploring"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
     
 
@@ -192,9 +149,9 @@ class DataExploringCrew:
         return Agent(
             config=self.agents_config["categorical_diagnostic_agent_two"],  # type: ignore[index]
             verbose=True,
-            llm=self.exploring_llm,
+            llm=self.routed_llm("categorical_diagnostic_agent_two", "exploring"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
     
 
@@ -203,9 +160,9 @@ class DataExploringCrew:
         return Agent(
             config=self.agents_config["categorical_cleaning_planner_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.exploring_llm,
+            llm=self.routed_llm("categorical_cleaning_planner_agent", "exploring"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True), FileReadTool()]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id), FileReadTool()]  # type: ignore[index]
         )
 
 
@@ -215,9 +172,9 @@ class DataExploringCrew:
         return Agent(
             config=self.agents_config["integrity_diagnostic_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.exploring_llm,
+            llm=self.routed_llm("integrity_diagnostic_agent", "exploring"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
 
 
@@ -226,9 +183,9 @@ class DataExploringCrew:
         return Agent(
             config=self.agents_config["integrity_diagnostic_agent_two"],  # type: ignore[index]
             verbose=True,
-            llm=self.exploring_llm,
+            llm=self.routed_llm("integrity_diagnostic_agent_two", "exploring"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
 
 
@@ -237,9 +194,9 @@ class DataExploringCrew:
         return Agent(
             config=self.agents_config["integrity_cleaning_planner_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.exploring_llm,
+            llm=self.routed_llm("integrity_cleaning_planner_agent", "exploring"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True), FileReadTool()]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id), FileReadTool()]  # type: ignore[index]
         )
 
 
@@ -272,7 +229,7 @@ class DataExploringCrew:
         return Task(
             config=self.tasks_config["numerical_cleaning_planner_task"],  # type: ignore[index]
             #context=['data_profiling_task'],
-            output_file=str(NOVA_ROOT / "reports" / "numerical_cleaning_plan.md")
+            output_file="{reports_dir}/numerical_cleaning_plan.md"
         )
 
     
@@ -300,7 +257,7 @@ class DataExploringCrew:
         return Task(
             config=self.tasks_config["categorical_cleaning_planner_task"],  # type: ignore[index]
             #context=['data_profiling_task'],
-            output_file=str(NOVA_ROOT / "reports" / "categorical_cleaning_plan.md")
+            output_file="{reports_dir}/categorical_cleaning_plan.md"
         )
     
 
@@ -326,7 +283,7 @@ class DataExploringCrew:
         return Task(
             config=self.tasks_config["integrity_cleaning_planner_task"],  # type: ignore[index]
             #context=['data_profiling_task'],
-            output_file=str(NOVA_ROOT / "reports" / "integrity_cleaning_plan.md")
+            output_file="{reports_dir}/integrity_cleaning_plan.md"
         )
 
 
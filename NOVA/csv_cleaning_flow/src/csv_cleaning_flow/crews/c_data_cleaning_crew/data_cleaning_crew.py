@@ -1,10 +1,9 @@
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List, Optional, Tuple
-from crewai_tools import (
-    CodeInterpreterTool
-)
+from typing import List, Optional
+from nova_common.llm_registry import agent_tasks, get_llm
+from ...tools import SessionCodeInterpreterTool
 from pathlib import Path
 from dotenv import load_dotenv
 import os
@@ -168,116 +167,17 @@ class DataCleaningCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    def __init__(self, session_id: Optional[str] = None):
+        # Code session of the flow run (tools/session_code_tool.py): the agents' tools bind to it by id
+        self.session_id = session_id
 
 
 
 
-    @property
-    def cleaning_llm(self) -> LLM:
-        """Build an LLM for deterministic processing (e.g., profiling) using the latest model_config.txt."""
-        cfg_path = (NOVA_ROOT / "model_config.txt").resolve()
-        # 1) Read config (2 lines: source, selection)
-        try:
-            lines = [ln.strip() for ln in cfg_path.read_text(encoding="utf-8").splitlines() if ln.strip()]
-            source    = (lines[0] if len(lines) >= 1 else "API").strip()
-            selection = (lines[1] if len(lines) >= 2 else "gemini/gemini-2.5-flash").strip()
-        except Exception:
-            source, selection = "API", "gemini/gemini-2.5-flash"
 
-        print(f"\n\n\n\n\n\n[LLM] processing_llm config: source='{source}', selection='{selection}'\n\n\n\n\n\n")
-        
-        src = source.lower()
-        src = src if src in {"local", "api"} else "api"
-
-        # 2) Resolve to a CrewAI LLM
-        temperature = 0.1
-        if src == "local":
-            # Force Ollama for local selections (e.g., 'llama3.2' -> 'ollama/llama3.2')
-            tag = selection.split("/", 1)[-1]
-            model_id = f"ollama/{tag}"
-            print(f"[LLM] processing_llm -> {model_id}")
-            return LLM(model=model_id, temperature=temperature)
-
-        # API branch: expect 'provider/model'
-        if "/" not in selection:
-            provider, model_name = "gemini", selection
-        else:
-            provider, model_name = selection.split("/", 1)
-
-        provider = provider.lower().strip()
-        model_id = f"{provider}/{model_name.strip()}"
-
-        # Map provider to env var key if known
-        env_keys = {
-            "openai": "OPENAI_API_KEY",
-            "gemini": "GEMINI_API_KEY",
-        }
-        #kwargs = {"temperature": temperature, "additional_drop_params": ["stop"]}
-        kwargs = {"temperature": temperature}
-        api_env = env_keys.get(provider, f"{provider.upper()}_API_KEY")
-        api_key = os.getenv(api_env)
-        if api_key:
-            kwargs["api_key"] = api_key
-        elif provider in env_keys:
-            raise RuntimeError(f"{api_env} is not set but '{provider}' was selected in model_config.txt.")
-
-        print(f"[LLM] processing_llm -> {model_id}")
-        return LLM(model=model_id, **kwargs)
-
-
-
-
-
-
-    @property
-    def summarizing_llm(self) -> LLM:
-        """Build an LLM for deterministic processing (e.g., profiling) using the latest model_config.txt."""
-        cfg_path = (NOVA_ROOT / "model_config.txt").resolve()
-        # 1) Read config (2 lines: source, selection)
-        try:
-            lines = [ln.strip() for ln in cfg_path.read_text(encoding="utf-8").splitlines() if ln.strip()]
-            source    = (lines[0] if len(lines) >= 1 else "API").strip()
-            selection = (lines[1] if len(lines) >= 2 else "gemini/gemini-2.5-flash").strip()
-        except Exception:
-            source, selection = "API", "gemini/gemini-2.5-flash"
-
-        src = source.lower()
-        src = src if src in {"local", "api"} else "api"
-
-        # 2) Resolve to a CrewAI LLM
-        temperature = 0.2
-        if src == "local":
-            # Force Ollama for local selections (e.g., 'llama3.2' -> 'ollama/llama3.2')
-            tag = selection.split("/", 1)[-1]
-            model_id = f"ollama/{tag}"
-            print(f"[LLM] processing_llm -> {model_id}")
-            return LLM(model=model_id, temperature=temperature)
-
-        # API branch: expect 'provider/model'
-        if "/" not in selection:
-            provider, model_name = "gemini", selection
-        else:
-            provider, model_name = selection.split("/", 1)
-
-        provider = provider.lower().strip()
-        model_id = f"{provider}/{model_name.strip()}"
-
-        # Map provider to env var key if known
-        env_keys = {
-            "openai": "OPENAI_API_KEY",
-            "gemini": "GEMINI_API_KEY",
-        }
-        #kwargs = {"temperature": temperature, "additional_drop_params": ["stop"]}
-        kwargs = {"temperature": temperature}
-        api_env = env_keys.get(provider, f"{provider.upper()}_API_KEY")
-        api_key = os.getenv(api_env)
-        if api_key:
-            kwargs["api_key"] = api_key
-        elif provider in env_keys:
-            raise RuntimeError(f"{api_env} is not set but '{provider}' was selected in model_config.txt.")
-
-        print(f"[LLM] processing_llm -> {model_id}")
-        return LLM(model=model_id, **kwargs)
+    def routed_llm(self, agent_name: str, role: str) -> LLM:
+        """Shared LLM of one agent: its model_routing.yaml route (tasks > agent > role), else model_config.txt (see llm_registry)."""
+        return get_llm(NOVA_ROOT, role, agent_name, agent_tasks(self.tasks_config, agent_name), run_id=self.session_id or "")
 
 
 
@@ -292,9 +192,9 @@ class DataCleaningCrew:
         return Agent(
             config=self.agents_config["numerical_cleaning_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.cleaning_llm,
+            llm=self.routed_llm("numerical_cleaning_agent", "cleaning"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
     
     @agent
@@ -302,9 +202,9 @@ class DataCleaningCrew:
         return Agent(
             config=self.agents_config["categorical_cleaning_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.cleaning_llm,
+            llm=self.routed_llm("categorical_cleaning_agent", "cleaning"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
     
 
@@ -313,9 +213,9 @@ class DataCleaningCrew:
         return Agent(
             config=self.agents_config["integral_cleaning_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.cleaning_llm,
+            llm=self.routed_llm("integral_cleaning_agent", "cleaning"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
 
 
@@ -325,9 +225,9 @@ class DataCleaningCrew:
         return Agent(
             config=self.agents_config["cleaning_reporting_agent"],  # type: ignore[index]
             verbose=True,
-            llm=self.summarizing_llm,
+            llm=self.routed_llm("cleaning_reporting_agent", "summarizing"),
             memory=True,
-            tools=[CodeInterpreterTool(unsafe_mode=True)]  # type: ignore[index]
+            tools=[SessionCodeInterpreterTool(session_id=self.session_id)]  # type: ignore[index]
         )
 
     # To learn more about structured task outputs,
@@ -338,21 +238,21 @@ class DataCleaningCrew:
     def numerical_cleaning_task(self) -> Task:
         return Task(
             config=self.tasks_config["numerical_cleaning_task"],  # type: ignore[index]
-            output_file=str(NOVA_ROOT / "reports" / "numerical_cleaning_report.md")
+            output_file="{reports_dir}/numerical_cleaning_report.md"
         )
 
     @task
     def categorical_cleaning_task(self) -> Task:
         return Task(
             config=self.tasks_config["categorical_cleaning_task"],  # type: ignore[index]
-            output_file=str(NOVA_ROOT / "reports" / "categorical_cleaning_report.md")
+            output_file="{reports_dir}/categorical_cleaning_report.md"
         )
     
     @task
     def integral_cleaning_task(self) -> Task:
         return Task(
             config=self.tasks_config["integral_cleaning_task"],  # type: ignore[index]
-            output_file=str(NOVA_ROOT / "reports" / "integral_cleaning_report.md")
+            output_file="{reports_dir}/integral_cleaning_report.md"
         )
     
 
@@ -360,7 +260,14 @@ class DataCleaningCrew:
     def cleaning_reporting_task(self) -> Task:
         return Task(
             config=self.tasks_config["cleaning_reporting_task"],  # type: ignore[index]
-            output_file=str(NOVA_ROOT / "reports" / "summary_cleaning_report.md")
+            output_file="{reports_dir}/summary_cleaning_report.md"
+        )
+
+    def engine_cleaning_reporting_task(self) -> Task:
+        # Not a @task: it only runs in reporting_crew(), after the cleaning engine replaced the three cleaning tasks
+        return Task(
+            config=self.tasks_config["engine_cleaning_reporting_task"],  # type: ignore[index]
+            output_file="{reports_dir}/summary_cleaning_report.md"
         )
 
     @crew
@@ -375,3 +282,12 @@ class DataCleaningCrew:
             process=Process.sequential,
             verbose=True,
         )
+
+    def reporting_crew(self) -> Crew:
+        """Creates a one-task crew that only writes the master cleaning report from the engine log"""
+        return Crew(
+            agents=[self.cleaning_reporting_agent()],
+            tasks=[self.engine_cleaning_reporting_task()],
+            process=Process.sequential,
+            verbose=True,
+        )
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+
+from .cleaning_ops import run_cleaning_ops
+
+
+CHUNK_SIZE = 1 << 20
+MAX_MANIFESTS = 8
+COMPRESSED_SUFFIXES = {".gz", ".zst", ".bz2", ".xz", ".zip"}
+
+
+def prefix_sha256(path: Path, length: int) -> str:
+    """sha256 of the first `length` bytes of `path`."""
+    h = hashlib.sha256()
+    remaining = length
+    with open(path, "rb") as f:
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            h.update(chunk)
+            remaining -= len(chunk)
+    return h.hexdigest()
+
+
+class IncrementalStore:
+    """
+    Manifests of engine-cleaned uploads, used to recognise append-only re-uploads.
+    - <raw sha256>/manifest.json : byte length, header, raw dtypes, resolved ops, artifact-cache stage keys
+    - <raw sha256>/dedup.npz     : row hashes kept by each drop_duplicates op
+    Only the MAX_MANIFESTS most recent versions are kept.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def manifests(self) -> List[Dict[str, Any]]:
+        found = []
+        for path in self.root.glob("*/manifest.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    found.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(found, key=lambda m: m.get("created", 0), reverse=True)
+
+    def load_dedup(self, raw_sha256: str) -> Dict[str, np.ndarray]:
+        path = self.root / raw_sha256 / "dedup.npz"
+        if not path.exists():
+            return {}
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+
+    def save(self, manifest: Dict[str, Any], dedup_hashes: Dict[str, np.ndarray]) -> None:
+        entry_dir = self.root / manifest["raw_sha256"]
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        with open(entry_dir / "dedup.npz", "wb") as f:
+            np.savez(f, **dedup_hashes)
+        tmp = entry_dir / "manifest.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({**manifest, "created": time.time()}, f, indent=2, default=str)
+        os.replace(tmp, entry_dir / "manifest.json")
+
+        for old in self.manifests()[MAX_MANIFESTS:]:
+            shutil.rmtree(self.root / old["raw_sha256"], ignore_errors=True)
+
+
+@lru_cache(maxsize=4)
+def get_incremental_store(nova_root: Path) -> Optional[IncrementalStore]:
+    """
+    Store under NOVA/.cache/incremental.
+    - Off unless NOVA_INCREMENTAL=1 (returns None).
+    """
+    if os.getenv("NOVA_INCREMENTAL", "0").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+    return IncrementalStore(Path(nova_root) / ".cache" / "incremental")
+
+
+def build_manifest(
+    csv_path: str,
+    raw_sha256: str,
+    raw_df: pd.DataFrame,
+    applied: Dict[str, List[Dict[str, Any]]],
+    cleaned_columns: List[str],
+    stage_keys: Dict[str, str],
+) -> Dict[str, Any]:
+    """Everything needed to clean rows appended to `csv_path` later, without re-running the crews."""
+    p = Path(csv_path)
+    with open(p, "rb") as f:
+        header = f.readline()
+        f.seek(-1, os.SEEK_END)
+        ends_with_newline = f.read(1) == b"\n"
+    return {
+        "csv_name": p.name,
+        "raw_sha256": raw_sha256,
+        "byte_length": p.stat().st_size,
+        "rows": int(len(raw_df)),
+        "header": header.decode("utf-8", errors="replace"),
+        "ends_with_newline": ends_with_newline,
+        "raw_dtypes": {str(c): str(t) for c, t in raw_df.dtypes.items()},
+        "applied_ops": applied,
+        "cleaned_columns": [str(c) for c in cleaned_columns],
+        "stage_keys": dict(stage_keys),
+    }
+
+
+def find_appended_base(csv_path: str, store: IncrementalStore) -> Optional[Dict[str, Any]]:
+    """
+    Latest manifest whose file is a strict byte prefix of `csv_path` (same header, rows appended at the end).
+    Compressed uploads are never matched: appending to them does not preserve a byte prefix.
+    """
+    p = Path(csv_path)
+    if p.suffix.lower() in COMPRESSED_SUFFIXES:
+        return None
+    size = p.stat().st_size
+    for manifest in store.manifests():
+        length = manifest.get("byte_length", 0)
+        if not manifest.get("ends_with_newline") or not 0 < length < size:
+            continue
+        if prefix_sha256(p, length) == manifest["raw_sha256"]:
+            return manifest
+    return None
+
+
+def read_delta(csv_path: str, manifest: Dict[str, Any]) -> pd.DataFrame:
+    """Parse only the bytes appended after the base version, with the base's header and dtypes."""
+    with open(csv_path, "rb") as f:
+        f.seek(manifest["byte_length"])
+        tail = f.read()
+    raw_dtypes = manifest["raw_dtypes"]
+    delta = pd.read_csv(
+        io.BytesIO(manifest["header"].encode("utf-8") + tail),
+        dtype={c: str for c, t in raw_dtypes.items() if t == "object"},
+        low_memory=False,
+    )
+    for col, dtype in raw_dtypes.items():
+        if col in delta.columns and str(delta[col].dtype) != dtype:
+            try:
+                delta[col] = delta[col].astype(dtype)
+            except (TypeError, ValueError):
+                # e.g. an int column that now has gaps: nullable Int64 still writes "150", not "150.0"
+                try:
+                    delta[col] = delta[col].astype(dtype.capitalize() if dtype.startswith("int") else dtype)
+                except (TypeError, ValueError):
+                    print(f"[Incremental] Could not restore dtype {dtype} for '{col}' in the appended rows")
+    # Appended rows continue the base's row numbering (matches the change-log row ids of a full run)
+    delta.index = pd.RangeIndex(manifest["rows"], manifest["rows"] + len(delta))
+    return delta
+
+
+def clean_delta(
+    delta: pd.DataFrame, manifest: Dict[str, Any], dedup_hashes: Dict[str, np.ndarray]
+) -> Optional[Tuple[pd.DataFrame, pd.DataFrame, Dict[str, np.ndarray]]]:
+    """
+    Re-apply the base run's resolved ops to the appended rows only.
+    - drop_duplicates / key uniqueness are checked against the stored hashes of every row kept so far.
+    - Returns None if the result would not match a full re-run (an op failed, keep="last" dedup, schema drift).
+    """
+    applied = manifest["applied_ops"]
+    dedup_ops = sum(op["op"] == "drop_duplicates" for ops in applied.values() for op in ops)
+    if dedup_ops != len(dedup_hashes):
+        print("[Incremental] A drop_duplicates op has no stored row hashes (keep='last'?)")
+        return None
+
+    hashes = {key: value.copy() for key, value in dedup_hashes.items()}
+    cleaned, change_log, skipped, _ = run_cleaning_ops(delta, applied, hashes)
+    if skipped:
+        print(f"[Incremental] {len(skipped)} op(s) failed on the appended rows: {[s['reason'] for s in skipped]}")
+        return None
+    if [str(c) for c in cleaned.columns] != manifest["cleaned_columns"]:
+        print("[Incremental] Cleaned columns of the appended rows differ from the base output")
+        return None
+    return cleaned, change_log, hashes
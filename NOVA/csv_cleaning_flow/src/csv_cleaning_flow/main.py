@@ -2,12 +2,28 @@
 from pydantic import BaseModel, Field
 import pandas as pd
 from crewai.flow import Flow, listen, start
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 
 from .crews.a_data_processing_crew.data_processing_crew import DataProcessingCrew
 from .crews.b_data_exploring_crew.data_exploring_crew import DataExploringCrew
 from .crews.c_data_cleaning_crew.data_cleaning_crew import DataCleaningCrew
+from .task_scheduler import kickoff_concurrently
+from .artifact_cache import get_artifact_cache, sha256_file, stage_key
+from nova_common.llm_cache import log_cache_stats
+from nova_common.llm_registry import ROUTING_FILE, routing_metadata, start_routing_run
+from .profiling import profile_dataframe, render_profile_digest, render_profiling_report
+from .schema_probe import probe_csv
+from nova_common.stats_index import stats_index_enabled, write_csv_hashed, write_stats_index
+from .cleaning_ops import STAGES, extract_ops, run_cleaning_ops, render_cleaning_log
+from .context_builder import build_task_contexts, report_task_tokens
+from .incremental import get_incremental_store, build_manifest, find_appended_base, read_delta, clean_delta
+from .checkpoints import get_checkpoint_store
+from nova_common.workspace import create_workspace, workspace_dirs
+from nova_common.tracing import setup_tracing
+from .tools import start_code_session, end_code_session
 import os
+import json
+import time
 from pathlib import Path
 from functools import lru_cache
 
@@ -53,6 +69,25 @@ def find_nova_root(start: Path | None = None, folder_name: str = "NOVA") -> Path
     raise RuntimeError(f"Could not locate '{folder_name}' above {start}")
 
 
+# Spans for every flow step / crew / task / LLM call / tool run when NOVA_TRACING is set
+setup_tracing(find_nova_root())
+
+
+CREWS_DIR = Path(__file__).resolve().parent / "crews"
+
+
+def crew_config_files(crew_dir: str) -> List[Path]:
+    """Files whose contents define a crew's behaviour (YAML configs + crew module), used in cache keys."""
+    base = CREWS_DIR / crew_dir
+    return [base / "config" / "agents.yaml", base / "config" / "tasks.yaml", *sorted(base.glob("*.py"))]
+
+
+def read_model_selection(nova_root: Path) -> str:
+    """The raw model_config.txt selection (source + model), or "" if it is missing."""
+    try:
+        return " ".join((nova_root / "model_config.txt").read_text(encoding="utf-8").split())
+    except Exception:
+        return ""
 
 
 class DataCleaningState(BaseModel):
@@ -62,54 +97,299 @@ class DataCleaningState(BaseModel):
     columns: List[str] = Field(default_factory=list)
     sample_rows: List[Dict[str, Any]] = Field(default_factory=list)
     nova_path: str = ""
+    workspace_path: str = ""
     reports_path: str = ""
     cleaned_datasets_path: str = ""
+    csv_sha256: str = ""
+    stage_keys: Dict[str, str] = Field(default_factory=dict)
+    incremental: bool = False
+    run_id: str = ""
+    completed_stages: List[str] = Field(default_factory=list)
+    # agent -> model it ran on (model_routing.yaml / model_config.txt), plus any runtime fallbacks
+    model_routing: Dict[str, Any] = Field(default_factory=dict)
 
 class DataCleaningFlow(Flow[DataCleaningState]):
+    # Set once the cleaned dataset's statistics index is written in this run
+    _cleaned_indexed = False
+
+    def _artifact_dirs(self) -> Dict[str, Path]:
+        return {"reports": Path(self.state.reports_path), "cleaned": Path(self.state.cleaned_datasets_path)}
+
+    def _stage_cache_key(self, stage: str, crew_dir: str, upstream: str = "", extra_files: Sequence[Path] = ()) -> str:
+        key = stage_key(
+            stage,
+            [self.state.csv_sha256, read_model_selection(Path(self.state.nova_path)), upstream],
+            # model_routing.yaml can move an agent to another model: its artifacts must not be reused
+            [*crew_config_files(crew_dir), Path(self.state.nova_path) / ROUTING_FILE, *extra_files],
+        )
+        self.state.stage_keys[stage] = key
+        return key
+
+    def _restore_stage(self, stage: str, key: str) -> bool:
+        """Restore a stage's artifacts from the cache; True means the crew can be skipped."""
+        cache = get_artifact_cache(Path(self.state.nova_path))
+        if cache is None or not self.state.csv_sha256:
+            return False
+        hit = cache.restore(key, self._artifact_dirs())
+        stats = cache.stats()
+        print(f"[Cache] {stage}: {'hit' if hit else 'miss'} (hits={stats['hits']}, misses={stats['misses']})")
+        return hit
+
+    def _store_stage(self, stage: str, key: str, started: float) -> None:
+        cache = get_artifact_cache(Path(self.state.nova_path))
+        if cache is None or not self.state.csv_sha256:
+            return
+        try:
+            cache.store(key, stage, self._artifact_dirs(), since=started)
+        except OSError as e:
+            print(f"[Cache] Could not store {stage} artifacts: {e}")
+
+    def _resume_stage(self, stage: str) -> bool:
+        """True if a resumed run already completed `stage`; its files are copied back from the checkpoint."""
+        if stage not in self.state.completed_stages:
+            return False
+        store = get_checkpoint_store(Path(self.state.nova_path))
+        if store is None or not store.restore_stage(self.state.run_id, stage, self._artifact_dirs()):
+            # Later stages were built on this one's files, so they re-run too
+            print(f"[Checkpoint] {stage}: checkpoint files missing; re-running from this stage")
+            self.state.completed_stages = []
+            return False
+        print(f"[Checkpoint] {stage}: restored from run {self.state.run_id}")
+        return True
+
+    def _record_models(self) -> None:
+        """Store which model every agent ran on; a resumed run keeps the entries of the stages it restored."""
+        current = routing_metadata(self.flow_id)
+        previous = self.state.model_routing or {}
+        fallbacks = list(previous.get("fallbacks", []))
+        fallbacks += [f for f in current["fallbacks"] if f not in fallbacks]
+        self.state.model_routing = {"agents": {**previous.get("agents", {}), **current["agents"]}, "fallbacks": fallbacks}
+
+    def _checkpoint_stage(self, stage: str, started: float) -> None:
+        """Record `stage` as completed: state + the files it wrote since `started`."""
+        if stage not in self.state.completed_stages:
+            self.state.completed_stages.append(stage)
+        self._record_models()
+        store = get_checkpoint_store(Path(self.state.nova_path))
+        if store is None:
+            return
+        try:
+            store.save_stage(
+                self.state.run_id, stage, self.state.model_dump(exclude={"id"}), self._artifact_dirs(), since=started
+            )
+        except OSError as e:
+            print(f"[Checkpoint] Could not save {stage}: {e}")
+
+    def _run_cleaning_engine(self, plans: Dict[str, str]) -> str:
+        """
+        Execute the planners' machine-readable op lists with the vectorized cleaning engine.
+        - Writes <stage>_cleaning_ops.json, cleaning_change_log.csv, cleaning_engine_log.md and cleaned_data_three.csv.
+        - Returns the engine log (markdown), or "" if the crew has to clean instead
+          (engine disabled via NOVA_CLEANING_ENGINE=0, or a plan without a parseable op list).
+        """
+        if os.getenv("NOVA_CLEANING_ENGINE", "1").strip().lower() in {"0", "false", "no", "off"}:
+            return ""
+        ops_by_stage = {stage: extract_ops(plans.get(stage, "")) for stage in STAGES}
+        missing = [stage for stage, ops in ops_by_stage.items() if ops is None]
+        if missing:
+            print(f"[CleaningEngine] No machine-readable operations in the {', '.join(missing)} plan(s); using the cleaning crew")
+            return ""
+
+        reports_dir = Path(self.state.reports_path)
+        for stage, ops in ops_by_stage.items():
+            with open(reports_dir / f"{stage}_cleaning_ops.json", "w", encoding="utf-8") as f:
+                json.dump(ops, f, indent=2)
+
+        try:
+            df = pd.read_csv(self.state.csv_path, low_memory=False)
+        except Exception as e:
+            print(f"[CleaningEngine] Error loading CSV: {e}; using the cleaning crew")
+            return ""
+        dedup_hashes = {}
+        cleaned, change_log, skipped, applied = run_cleaning_ops(df, ops_by_stage, dedup_hashes)
+
+        change_log.to_csv(reports_dir / "cleaning_change_log.csv", index=False)
+        engine_log = render_cleaning_log(change_log, skipped, df.shape, cleaned.shape)
+        with open(reports_dir / "cleaning_engine_log.md", "w", encoding="utf-8") as f:
+            f.write(engine_log)
+        cleaned_path = Path(self.state.cleaned_datasets_path) / "cleaned_data_three.csv"
+        digest = write_csv_hashed(cleaned, cleaned_path)
+        print(f"[CleaningEngine] {len(change_log)} changes logged, {len(skipped)} ops skipped -> cleaned_data_three.csv")
+        # The cleaned frame and its hash are at hand: index it without re-reading / re-hashing the CSV
+        self._index_cleaned(cleaned_path, cleaned, digest)
+
+        # Remember how this upload was cleaned, so a re-upload with appended rows only cleans the new rows
+        store = get_incremental_store(Path(self.state.nova_path))
+        if store is not None and self.state.csv_sha256:
+            try:
+                store.save(
+                    build_manifest(self.state.csv_path, self.state.csv_sha256, df, applied, list(cleaned.columns), self.state.stage_keys),
+                    dedup_hashes,
+                )
+            except OSError as e:
+                print(f"[Incremental] Could not save manifest: {e}")
+        return engine_log
+
+    def _run_incremental_update(self) -> bool:
+        """
+        Append-only re-upload of an engine-cleaned CSV: restore the base run's reports and cleaned output,
+        clean only the appended rows with the stored (resolved) ops and append them to cleaned_data_three.csv.
+        Returns False whenever a full run is needed instead.
+        """
+        nova_root = Path(self.state.nova_path)
+        store = get_incremental_store(nova_root)
+        cache = get_artifact_cache(nova_root)
+        if store is None or cache is None or not self.state.csv_sha256:
+            return False
+        base = find_appended_base(self.state.csv_path, store)
+        if base is None:
+            return False
+
+        started = time.time()
+        print(f"[Incremental] {Path(self.state.csv_path).name} extends a cleaned upload of {base['rows']} rows")
+        if not all(cache.restore(key, self._artifact_dirs()) for key in base["stage_keys"].values()):
+            print("[Incremental] Base artifacts are no longer cached; running the full flow")
+            return False
+
+        try:
+            delta = read_delta(self.state.csv_path, base)
+            result = clean_delta(delta, base, store.load_dedup(base["raw_sha256"]))
+        except Exception as e:
+            print(f"[Incremental] Error cleaning appended rows: {e}; running the full flow")
+            return False
+        if result is None:
+            print("[Incremental] Appended rows can't be cleaned incrementally; running the full flow")
+            return False
+        cleaned, change_log, dedup_hashes = result
+
+        reports_dir = Path(self.state.reports_path)
+        cleaned_path = Path(self.state.cleaned_datasets_path) / "cleaned_data_three.csv"
+        cleaned.to_csv(cleaned_path, mode="a", header=False, index=False)
+        change_log.to_csv(reports_dir / "incremental_change_log.csv", index=False)
+
+        total_rows = base["rows"] + len(delta)
+        update_log = render_cleaning_log(change_log, [], delta.shape, cleaned.shape).replace(
+            "# Cleaning Engine Log", "## Incremental Update", 1
+        )
+        with open(reports_dir / "summary_cleaning_report.md", "a", encoding="utf-8") as f:
+            f.write(
+                f"\n\n{update_log}\n"
+                f"- {len(delta)} appended rows cleaned with the stored operations of the {base['rows']}-row version; "
+                f"{len(cleaned)} appended to cleaned_data_three.csv.\n"
+                f"- Profiling and diagnostic reports still describe the first {base['rows']} of {total_rows} rows.\n"
+            )
+
+        # Register the new version (artifacts + manifest) so the next append chains from it
+        cleaning_key = stage_key("run_cleaning_crew", [self.state.csv_sha256, "incremental", base["stage_keys"]["run_cleaning_crew"]], [])
+        # The update itself is done: a full disk or locked index only costs the next append its shortcut
+        try:
+            cache.store(cleaning_key, "run_cleaning_crew", self._artifact_dirs(), since=started)
+        except OSError as e:
+            print(f"[Cache] Could not store run_cleaning_crew artifacts: {e}")
+        self.state.stage_keys = {**base["stage_keys"], "run_cleaning_crew": cleaning_key}
+        try:
+            store.save(
+                {
+                    **base,
+                    "raw_sha256": self.state.csv_sha256,
+                    "byte_length": Path(self.state.csv_path).stat().st_size,
+                    "rows": total_rows,
+                    "stage_keys": self.state.stage_keys,
+                },
+                dedup_hashes,
+            )
+        except OSError as e:
+            print(f"[Incremental] Could not save manifest: {e}")
+        print(f"[Incremental] {len(cleaned)}/{len(delta)} appended rows added to cleaned_data_three.csv")
+        return True
 
     @start()
     def dataset_overview_crew(self):
 
         if not self.state.csv_path:
             raise ValueError("csv_path is empty in DataCleaningState")
+        started = time.time()
+        if not self.state.run_id:
+            self.state.run_id = self.flow_id
+        start_routing_run(self.flow_id)
 
         current_file = Path(__file__).resolve()
         NOVA_ROOT = find_nova_root(current_file, "NOVA")
         self.state.nova_path = str(NOVA_ROOT)
-        REPORTS_DIR = NOVA_ROOT / "reports"
-        CLEANED_DIR = NOVA_ROOT / "cleaned_datasets"
-        os.makedirs(REPORTS_DIR, exist_ok=True)
-        os.makedirs(CLEANED_DIR, exist_ok=True)
-        self.state.reports_path = str(REPORTS_DIR)
-        self.state.cleaned_datasets_path = str(CLEANED_DIR)
+        # Every file of this run lives in its own workspace (NOVA/workspaces/<run id>), so runs can overlap
+        if not self.state.workspace_path:
+            self.state.workspace_path = str(create_workspace(NOVA_ROOT, self.state.run_id))
+        dirs = workspace_dirs(Path(self.state.workspace_path))
+        self.state.reports_path = str(dirs["reports"])
+        self.state.cleaned_datasets_path = str(dirs["cleaned"])
 
         # --- Your deterministic data extraction step here ---
+        # Header + first rows only; the full file is parsed below only if the profile isn't cached.
         try:
-            df = pd.read_csv(self.state.csv_path)
-            self.state.columns = df.columns.tolist()
-            self.state.sample_rows = df.head().to_dict(orient="records")
+            self.state.columns, self.state.sample_rows = probe_csv(self.state.csv_path)
         except Exception as e:
             self.state.columns = []
             self.state.sample_rows = []
             print(f"Error loading CSV: {e}")
 
-        # --- Now pass ONLY what you want to the research agent ---
-        result = (
-            DataProcessingCrew()
-            .crew()
-            .kickoff(
-                inputs={
-                    "columns": self.state.columns,
-                    "sample_rows": self.state.sample_rows,
-                    "csv_file_path": self.state.csv_path,
-                }
-            )
+        # One warm interpreter per run: agents' code finds pandas/matplotlib imported and `df` (the original
+        # upload) loaded; the cleaners read the later Arrow versions themselves.
+        start_code_session(self.flow_id, {"df": self.state.csv_path})
+
+        # --- Resumed run: this stage's reports (and the state it produced) come from the checkpoint ---
+        if self._resume_stage("dataset_overview_crew"):
+            return
+
+        try:
+            self.state.csv_sha256 = sha256_file(Path(self.state.csv_path))
+        except OSError as e:
+            self.state.csv_sha256 = ""
+            print(f"Error hashing CSV: {e}")
+
+        # --- Rows appended to an upload we already cleaned: only the new rows go through the engine ---
+        self.state.incremental = self._run_incremental_update()
+
+        # --- Reuse the reports of an identical upload if we have them ---
+        reports_dir = Path(self.state.reports_path)
+        cache_key = self._stage_cache_key(
+            "dataset_overview_crew", "a_data_processing_crew", extra_files=[Path(__file__).resolve().parent / "profiling.py"]
         )
+        if not self.state.incremental and not self._restore_stage("dataset_overview_crew", cache_key):
+
+            # --- Deterministic profiling: stats are computed here, the agent only writes the narrative ---
+            profile = {"rows": 0, "n_columns": 0, "columns": []}
+            try:
+                profile = profile_dataframe(pd.read_csv(self.state.csv_path, low_memory=False))
+            except Exception as e:
+                print(f"Error profiling CSV: {e}")
+            with open(reports_dir / "data_profile.json", "w", encoding="utf-8") as f:
+                json.dump(profile, f, indent=2, default=str)
+
+            # --- Now pass ONLY what you want to the research agent ---
+            result = (
+                DataProcessingCrew(session_id=self.flow_id)
+                .crew()
+                .kickoff(
+                    inputs={
+                        "columns": self.state.columns,
+                        "sample_rows": self.state.sample_rows,
+                        "csv_file_path": self.state.csv_path,
+                        "profiling_stats": render_profile_digest(profile),
+                        "reports_dir": self.state.reports_path,
+                    }
+                )
+            )
+
+            narrative_path = reports_dir / "data_profiling_narrative.md"
+            narrative = narrative_path.read_text(encoding="utf-8") if narrative_path.exists() else ""
+            with open(reports_dir / "data_profiling_report.md", "w", encoding="utf-8") as f:
+                f.write(render_profiling_report(profile, Path(self.state.csv_path).name, narrative))
+
+            self._store_stage("dataset_overview_crew", cache_key, started)
 
 
 
         # When reading/writing:
-        reports_dir = Path(self.state.reports_path)
 
         dataset_overview_path = reports_dir / "dataset_overview.md"
         data_profiling_report_path = reports_dir / "data_profiling_report.md"
@@ -126,33 +406,96 @@ class DataCleaningFlow(Flow[DataCleaningState]):
 
         self.state.data_profiling_report = data_profiling_report
         self.state.dataset_overview = dataset_overview
+        self._checkpoint_stage("dataset_overview_crew", started)
 
 
 
     @listen("dataset_overview_crew")
     def run_exploring_crew(self):
-
+        if self._resume_stage("run_exploring_crew"):
+            return
+        started = time.time()
+        self._run_exploring_crew()
+        self._checkpoint_stage("run_exploring_crew", started)
+
+    def _run_exploring_crew(self):
+        if self.state.incremental:
+            return
+
+
+        cache_key = self._stage_cache_key(
+            "run_exploring_crew",
+            "b_data_exploring_crew",
+            self.state.stage_keys.get("dataset_overview_crew", ""),
+            extra_files=[Path(__file__).resolve().parent / "context_builder.py"],
+        )
+        if self._restore_stage("run_exploring_crew", cache_key):
+            return
+        started = time.time()
 
         # Now, run the exploring crew with all needed inputs!
-        exploring_result = (
-            DataExploringCrew()
-            .crew()
-            .kickoff(
-                inputs={
-                    "columns": self.state.columns,
-                    "sample_rows": self.state.sample_rows,
-                    "csv_file_path": self.state.csv_path,  
-                    "data_profiling_report": self.state.data_profiling_report,
-                    "reports_dir": self.state.reports_path,
-                }
-            )
-        )
+        # The numerical / categorical / integrity chains don't read each other's files,
+        # so they run side by side (capped by NOVA_MAX_PARALLEL_CHAINS).
+        # Each chain only sees its slice of the profiling report (numeric columns for the numerical tasks, ...)
+        inputs = {
+            "columns": self.state.columns,
+            "sample_rows": self.state.sample_rows,
+            "csv_file_path": self.state.csv_path,  
+            "data_profiling_report": self.state.data_profiling_report,
+            "reports_dir": self.state.reports_path,
+            **build_task_contexts(self.state.data_profiling_report, self.state.columns, self.state.sample_rows),
+        }
+        exploring_crew = DataExploringCrew(session_id=self.flow_id).crew()
+        report_task_tokens(exploring_crew, inputs, "exploring crew")
+        exploring_result = kickoff_concurrently(exploring_crew, inputs=inputs)
+        self._store_stage("run_exploring_crew", cache_key, started)
 
 
 
     @listen("run_exploring_crew")
     def run_cleaning_crew(self):
+        try:
+            self._run_cleaning_crew()
+        finally:
+            # Last step of the run: free the session's frames so the next upload starts clean
+            end_code_session(self.flow_id)
+            log_cache_stats(Path(self.state.nova_path))
+            self._record_models()
+
+        # Quantiles / histograms / value counts / correlations of the cleaned dataset, read by the answering flow
+        # (already built by the cleaning engine; the crew / cache / incremental paths index the file here)
+        cleaned_path = Path(self.state.cleaned_datasets_path) / "cleaned_data_three.csv"
+        if not self._cleaned_indexed and cleaned_path.exists():
+            self._index_cleaned(cleaned_path)
+
+        # Finished run: nothing left to resume
+        self.state.completed_stages.append("run_cleaning_crew")
+        store = get_checkpoint_store(Path(self.state.nova_path))
+        if store is not None:
+            store.discard(self.state.run_id)
+
+    def _index_cleaned(self, cleaned_path: Path, df: Optional[pd.DataFrame] = None, sha256: str = "") -> None:
+        if not stats_index_enabled():
+            return
+        try:
+            write_stats_index(cleaned_path, df=df, sha256=sha256)
+            self._cleaned_indexed = True
+        except Exception as e:
+            print(f"[StatsIndex] Could not index {cleaned_path.name}: {e}")
 
+    def _run_cleaning_crew(self):
+        if self.state.incremental:
+            return
+
+        cache_key = self._stage_cache_key(
+            "run_cleaning_crew",
+            "c_data_cleaning_crew",
+            self.state.stage_keys.get("run_exploring_crew", ""),
+            extra_files=[Path(__file__).resolve().parent / f for f in ("cleaning_ops.py", "context_builder.py")],
+        )
+        if self._restore_stage("run_cleaning_crew", cache_key):
+            return
+        started = time.time()
 
         reports_dir = Path(self.state.reports_path)
 
@@ -176,24 +519,37 @@ class DataCleaningFlow(Flow[DataCleaningState]):
             with open(integrity_cleaning_plan_path, "r", encoding="utf-8") as f:
                 integrity_cleaning_plan = f.read()
 
-        # Now, run the cleaning crew with all needed inputs!
-        cleaning_result = (
-            DataCleaningCrew()
-            .crew()
-            .kickoff(
-                inputs={
-                    "columns": self.state.columns,
-                    "sample_rows": self.state.sample_rows,
-                    "csv_file_path": self.state.csv_path,  
-                    "data_profiling_report": self.state.data_profiling_report,
-                    "numerical_cleaning_plan": numerical_cleaning_plan,
-                    "categorical_cleaning_plan": categorical_cleaning_plan,
-                    "integrity_cleaning_plan": integrity_cleaning_plan,
-                    "reports_dir": self.state.reports_path,
-                    "cleaned_dir": self.state.cleaned_datasets_path,
-                }
-            )
-        )
+        inputs = {
+            "columns": self.state.columns,
+            "sample_rows": self.state.sample_rows,
+            "csv_file_path": self.state.csv_path,  
+            "data_profiling_report": self.state.data_profiling_report,
+            "numerical_cleaning_plan": numerical_cleaning_plan,
+            "categorical_cleaning_plan": categorical_cleaning_plan,
+            "integrity_cleaning_plan": integrity_cleaning_plan,
+            "reports_dir": self.state.reports_path,
+            "cleaned_dir": self.state.cleaned_datasets_path,
+            **build_task_contexts(self.state.data_profiling_report, self.state.columns, self.state.sample_rows),
+        }
+
+        # Deterministic path: the planners' op lists are applied in one vectorized pass,
+        # so only the master report is left to an agent.
+        engine_log = self._run_cleaning_engine({
+            "numerical": numerical_cleaning_plan,
+            "categorical": categorical_cleaning_plan,
+            "integrity": integrity_cleaning_plan,
+        })
+        if engine_log:
+            inputs["engine_cleaning_log"] = engine_log
+            reporting_crew = DataCleaningCrew(session_id=self.flow_id).reporting_crew()
+            report_task_tokens(reporting_crew, inputs, "cleaning reporting crew")
+            cleaning_result = reporting_crew.kickoff(inputs=inputs)
+        else:
+            # Now, run the cleaning crew with all needed inputs!
+            cleaning_crew = DataCleaningCrew(session_id=self.flow_id).crew()
+            report_task_tokens(cleaning_crew, inputs, "cleaning crew")
+            cleaning_result = cleaning_crew.kickoff(inputs=inputs)
+        self._store_stage("run_cleaning_crew", cache_key, started)
 
 
 
@@ -209,6 +565,31 @@ def kickoff():
 
 
 
+def resume_cleaning_flow(run_id: str) -> DataCleaningFlow:
+    """
+    Re-run a failed DataCleaningFlow from its first incomplete stage.
+    - Completed stages restore their reports and state from NOVA/.cache/checkpoints/<run_id>.
+    - Raises ValueError if the run has no checkpoint (finished, evicted, or NOVA_CHECKPOINTS=0).
+    """
+    store = get_checkpoint_store(find_nova_root())
+    checkpoint = store.load(run_id) if store is not None else None
+    if checkpoint is None:
+        raise ValueError(f"No checkpoint found for cleaning run {run_id}")
+    print(f"[Checkpoint] Resuming run {run_id} after {', '.join(checkpoint['completed_stages'])}")
+    flow = DataCleaningFlow()
+    flow.kickoff(inputs=checkpoint["state"])
+    return flow
+
+
+def resume():
+    # Resume the given run id, or the most recent checkpointed run
+    import sys
+    store = get_checkpoint_store(find_nova_root())
+    runs = store.runs() if store is not None else []
+    run_id = sys.argv[1] if len(sys.argv) > 1 else (runs[0]["run_id"] if runs else "")
+    resume_cleaning_flow(run_id)
+
+
 def plot():
     flow = DataCleaningFlow()
     flow.plot()
@@ -0,0 +1,254 @@
+import pandas as pd
+from pandas.api import types as ptypes
+from typing import Any, Dict, List
+import re
+
+
+TOP_K = 10
+HIGH_CARDINALITY_RATIO = 0.9
+
+
+def _fmt(value: Any) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return "NaN"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def _text_profile(df: pd.DataFrame, text_cols: List[Any], top_k: int) -> Dict[str, Dict[Any, Any]]:
+    """
+    Every text column's value facts from one groupby over all text columns at once:
+    - the cells are counted per distinct (column, value) pair first, so the string checks run once per
+      distinct value instead of once per cell
+    - top: top-k values with counts, non_null: non-empty cells
+    - parseable: cells that parse as numbers, bad_examples: first values that do not
+    - raw_unique / folded_unique: distinct values as is / stripped + lower-cased, variants: first case/whitespace variant group
+    """
+    empty = {k: {} for k in ("top", "non_null", "parseable", "bad_examples", "raw_unique", "folded_unique", "variants")}
+    if not text_cols:
+        return empty
+    long = df[text_cols].melt(var_name="column", value_name="value").dropna(subset=["value"])
+    if long.empty:
+        return empty
+    counts = long.groupby(["column", "value"], sort=False).size()
+
+    pairs = counts.reset_index(name="n")
+    col = pairs["column"]
+    raw = pairs["value"].astype(str)
+    text = raw.str.strip()
+    folded = text.str.lower()
+    parsed = pd.to_numeric(text, errors="coerce").notna()
+
+    top: Dict[Any, List[List[Any]]] = {}
+    ranked = counts.sort_values(ascending=False, kind="stable")
+    for (c, v), n in ranked.groupby(level=0, sort=False).head(top_k).items():
+        top.setdefault(c, []).append([str(v), int(n)])
+
+    bad = text[~parsed].groupby(col[~parsed], sort=False).unique()
+    groups = raw.groupby([col, folded]).unique()
+    groups = groups[groups.map(len) > 1]
+    return {
+        "top": top,
+        "non_null": pairs["n"].groupby(col, sort=False).sum().to_dict(),
+        "parseable": pairs["n"].where(parsed, 0).groupby(col, sort=False).sum().to_dict(),
+        "bad_examples": {c: v[:3].tolist() for c, v in bad.items()},
+        "raw_unique": raw.groupby(col, sort=False).nunique().to_dict(),
+        "folded_unique": folded.groupby(col, sort=False).nunique().to_dict(),
+        "variants": {c: [str(x) for x in v[:3]] for (c, _), v in groups.groupby(level=0, sort=False).head(1).items()},
+    }
+
+
+def profile_dataframe(df: pd.DataFrame, top_k: int = TOP_K) -> Dict[str, Any]:
+    """
+    Deterministic baseline profile of `df`, from frame-wide vectorized passes only:
+    - isna().sum(), nunique() and describe() once over the whole frame
+    - the text checks (top-k values, numeric-as-text / mixed types, case/whitespace variants) once over
+      all text columns together (_text_profile); the loop below only assembles the per-column dicts
+    Returns a JSON-serialisable dict (also used by downstream context building).
+    """
+    n_rows = len(df)
+    null_counts = df.isna().sum()
+    unique_counts = df.nunique(dropna=True)
+    numeric_cols = [c for c in df.columns if ptypes.is_numeric_dtype(df[c]) and not ptypes.is_bool_dtype(df[c])]
+    describe = (
+        df[numeric_cols].describe(percentiles=[0.25, 0.5, 0.75]).T if numeric_cols else pd.DataFrame()
+    )
+    text = _text_profile(df, [c for c in df.columns if c not in numeric_cols], top_k)
+
+    columns: List[Dict[str, Any]] = []
+    for col in df.columns:
+        nulls = int(null_counts[col])
+        uniques = int(unique_counts[col])
+        info: Dict[str, Any] = {
+            "name": str(col),
+            "dtype": str(df[col].dtype),
+            "kind": "numeric" if col in numeric_cols else "categorical",
+            "missing": nulls,
+            "missing_pct": round(100.0 * nulls / n_rows, 2) if n_rows else 0.0,
+            "unique": uniques,
+            "flags": [],
+            "problem_examples": [],
+        }
+
+        if col in numeric_cols:
+            stats = describe.loc[col]
+            info["stats"] = {k: (None if pd.isna(v) else float(v)) for k, v in stats.items()}
+        else:
+            top = text["top"].get(col, [])
+            info["top_values"] = top
+            if top:
+                info["most_frequent_pct"] = round(100.0 * top[0][1] / n_rows, 2)
+
+            non_null = int(text["non_null"].get(col, 0))
+            parseable = int(text["parseable"].get(col, 0))
+            if non_null and parseable == non_null:
+                info["flags"].append("Needs type conversion: numeric values stored as text")
+            elif parseable and parseable / non_null >= 0.5:
+                info["flags"].append(
+                    f"Needs type conversion: mixed types ({round(100.0 * parseable / non_null, 2)}% numeric)"
+                )
+                info["problem_examples"] = text["bad_examples"].get(col, [])
+
+            if non_null and text["folded_unique"].get(col, 0) < text["raw_unique"].get(col, 0):
+                info["flags"].append("Inconsistent encoding: case/whitespace variants")
+                if not info["problem_examples"] and col in text["variants"]:
+                    info["problem_examples"] = text["variants"][col]
+
+        if nulls == n_rows:
+            info["flags"].insert(0, "Non-informative: All values missing")
+        elif uniques <= 1:
+            info["flags"].insert(0, "Non-informative: Constant column")
+        elif nulls:
+            info["flags"].insert(0, f"Needs imputation due to {info['missing_pct']}% missingness")
+        if n_rows and uniques > HIGH_CARDINALITY_RATIO * n_rows and info["kind"] == "categorical":
+            info["flags"].append(f"High cardinality: >{int(HIGH_CARDINALITY_RATIO * 100)}% unique values")
+        if not info["flags"]:
+            info["flags"].append("No action needed")
+
+        columns.append(info)
+
+    return {"rows": n_rows, "n_columns": int(df.shape[1]), "columns": columns}
+
+
+def render_profile_digest(profile: Dict[str, Any]) -> str:
+    """One line per column - the compact facts the narrative agent needs (not the full tables)."""
+    lines = [f"Shape: {profile['rows']} rows x {profile['n_columns']} columns"]
+    for c in profile["columns"]:
+        line = f"- {c['name']} ({c['dtype']}): missing {c['missing_pct']}%, unique {c['unique']}"
+        if c["kind"] == "numeric" and c.get("stats"):
+            line += f", min {_fmt(c['stats'].get('min'))}, median {_fmt(c['stats'].get('50%'))}, max {_fmt(c['stats'].get('max'))}"
+        elif c.get("top_values"):
+            line += f", top '{c['top_values'][0][0]}'"
+        line += f"; flags: {c['flags']}"
+        if c["problem_examples"]:
+            line += f"; examples: {c['problem_examples']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def parse_narrative(narrative: str) -> Dict[str, Any]:
+    """
+    Split the narrative agent's markdown into:
+    - "descriptions": {column: one-sentence description} from "- **column**: ..." lines
+    - "sections": {heading: body} for each "## heading"
+    """
+    descriptions = {}
+    for m in re.finditer(r"^\s*[-*]\s+\*\*`?(.+?)`?\*\*\s*[:\-–—]\s*(.+)$", narrative, flags=re.M):
+        descriptions[m.group(1).strip()] = m.group(2).strip()
+
+    sections = {}
+    parts = re.split(r"^##\s+(.+)$", narrative, flags=re.M)
+    for heading, body in zip(parts[1::2], parts[2::2]):
+        sections[heading.strip().lower()] = body.replace("END OF REPORT", "").strip()
+    return {"descriptions": descriptions, "sections": sections}
+
+
+def _section(sections: Dict[str, str], *names: str) -> str:
+    for key, body in sections.items():
+        if any(name in key for name in names):
+            return body
+    return ""
+
+
+def render_profiling_report(profile: Dict[str, Any], dataset_name: str, narrative: str = "") -> str:
+    """Render the baseline profiling report (same sections the LLM used to write) from `profile` + narrative."""
+    parsed = parse_narrative(narrative)
+    descriptions, sections = parsed["descriptions"], parsed["sections"]
+    cols = profile["columns"]
+
+    out = [f"# Dataset Baseline Profiling Report for {dataset_name}", ""]
+    out += [
+        "## Table of Contents",
+        "- [Dataset Overview](#dataset-overview)",
+        "- [Per-Column Documentation](#per-column-documentation)",
+        "- [Data Types and Missingness Overview](#data-types-and-missingness-overview)",
+        "- [Online Research Summary](#online-research-summary)",
+        "- [Disclaimer](#disclaimer)",
+        "",
+        "## Dataset Overview",
+        f"- Shape: {profile['rows']} rows × {profile['n_columns']} columns",
+        f"- Columns: {[c['name'] for c in cols]}",
+        "",
+        "### Pandas Data Types",
+    ]
+    out += [f"- {c['name']}: {c['dtype']}  " for c in cols]
+    out += ["", "## Per-Column Documentation", ""]
+
+    for c in cols:
+        out += [
+            f"### {c['name']}",
+            f"- **Description:** {descriptions.get(c['name'], 'unknown')}",
+            f"- **Pandas Data Type:** {c['dtype']}",
+            f"- **Missing Values:** {c['missing']} ({c['missing_pct']}%)",
+            f"- **Unique Values:** {c['unique']}",
+        ]
+        if c["kind"] == "numeric" and c.get("stats"):
+            out += ["#### Summary Statistics (Numeric)", "", "| Metric | Value |", "|--------|-------|"]
+            out += [f"| {k} | {_fmt(v) if k != 'count' else int(v or 0)} |" for k, v in c["stats"].items()]
+            out.append("")
+        elif c.get("top_values"):
+            out += [f"#### Top {len(c['top_values'])} Value Counts (Categorical)", "", "| Value | Count |", "|-------|-------|"]
+            out += [f"| {v} | {n} |" for v, n in c["top_values"]]
+            out.append("")
+            out.append(f"- **Most Frequent Value:** {c['top_values'][0][0]}, occurring {c.get('most_frequent_pct', 0.0)}% of the time")
+        if c["problem_examples"]:
+            out.append(f"- **Example Problematic Values:** {c['problem_examples']}")
+        out += [f"- **Actionable Flags:** {c['flags']}", ""]
+
+    out += ["## Data Types and Missingness Overview", "", "| Column | Dtype | Missing | Missing % | Unique |", "|---|---|---|---|---|"]
+    out += [f"| {c['name']} | {c['dtype']} | {c['missing']} | {c['missing_pct']}% | {c['unique']} |" for c in cols]
+    mismatches = [c for c in cols if any(f.startswith("Needs type conversion") for f in c["flags"])]
+    out += ["", "**Type mismatches:** " + (", ".join(f"{c['name']} ({c['problem_examples'] or 'numeric stored as text'})" for c in mismatches) or "none detected")]
+
+    missing = sorted((c for c in cols if c["missing"]), key=lambda c: -c["missing"])
+    out += ["", "## Missingness Overview"]
+    out += [f"- {c['name']}: {c['missing']} ({c['missing_pct']}%)" for c in missing] or ["- No missing values."]
+
+    out += ["", "## Categorical Value Summaries"]
+    out += [
+        f"- {c['name']}: {c['unique']} unique; most frequent '{c['top_values'][0][0]}' ({c.get('most_frequent_pct', 0.0)}%)"
+        for c in cols if c["kind"] == "categorical" and c.get("top_values")
+    ] or ["- No categorical columns."]
+
+    constant = [c["name"] for c in cols if any(f.startswith("Non-informative") for f in c["flags"])]
+    out += ["", "## Non-informative / Constant Columns", f"- {constant}" if constant else "- None."]
+
+    notes = _section(sections, "notes", "downstream")
+    out += ["", "## Short Notes for Downstream Diagnostics"]
+    if notes:
+        out.append(notes)
+    out += [
+        "- Duplicate rows/columns were not checked in this report.",
+        "- No cleaning, dropping, or alteration was performed in this report—this is descriptive profiling only.",
+    ]
+
+    out += ["", "## Online Research Summary", _section(sections, "research") or "No research summary was provided."]
+    out += [
+        "",
+        "## Disclaimer",
+        "No cleaning, dropping, or alteration was performed in this report—this is descriptive profiling only.",
+        "END OF REPORT",
+        "",
+    ]
+    return "\n".join(out)
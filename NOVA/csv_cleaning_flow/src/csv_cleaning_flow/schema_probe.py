@@ -0,0 +1,30 @@
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+import os
+
+
+SAMPLE_ROWS = 5
+
+
+@lru_cache(maxsize=64)
+def _probe(path: str, size: int, mtime_ns: int, nrows: int) -> Tuple[Tuple[str, ...], Tuple[Tuple[Tuple[str, Any], ...], ...]]:
+    # size/mtime_ns are only part of the cache key: a re-uploaded file gets a fresh probe.
+    # compression="infer" streams .gz/.zst/.bz2/.xz/.zip, and nrows stops the parser after the head.
+    head = pd.read_csv(path, nrows=nrows, compression="infer")
+    rows = head.to_dict(orient="records")
+    return tuple(str(c) for c in head.columns), tuple(tuple(r.items()) for r in rows)
+
+
+def probe_csv(csv_path: str, nrows: int = SAMPLE_ROWS) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Read only the header and the first `nrows` rows of a (possibly compressed) CSV.
+    - Results are cached per file fingerprint (path, size, mtime), so repeated questions
+      about the same upload never touch the file again.
+    - Returns (columns, sample_rows) in the shape the crews expect.
+    """
+    p = Path(csv_path).expanduser().resolve()
+    st = os.stat(p)
+    columns, rows = _probe(str(p), st.st_size, st.st_mtime_ns, nrows)
+    return list(columns), [dict(r) for r in rows]
@@ -0,0 +1,123 @@
+from crewai import Crew, Process, Task
+from crewai.crews.crew_output import CrewOutput
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+from pathlib import Path
+import os
+import re
+
+
+# File names mentioned in task descriptions/expected outputs, e.g. "{reports_dir}/numerical_checks_table.csv"
+FILE_NAME_PATTERN = re.compile(r"[A-Za-z0-9_\-]+\.(?:md|csv|json|png|parquet|arrow|feather)\b")
+
+DEFAULT_MAX_CONCURRENCY = 3
+
+
+def max_concurrency_from_env(default: int = DEFAULT_MAX_CONCURRENCY) -> int:
+    """Read the chain concurrency cap from NOVA_MAX_PARALLEL_CHAINS (falls back to `default`)."""
+    try:
+        return max(1, int(os.getenv("NOVA_MAX_PARALLEL_CHAINS", default)))
+    except ValueError:
+        return default
+
+
+def _produced_files(task: Task) -> Set[str]:
+    files = set(FILE_NAME_PATTERN.findall(task.expected_output or ""))
+    if task.output_file:
+        files.add(Path(task.output_file).name)
+    return files
+
+
+def _consumed_files(task: Task) -> Set[str]:
+    return set(FILE_NAME_PATTERN.findall(task.description or ""))
+
+
+def build_task_graph(tasks: List[Task]) -> Dict[int, Set[int]]:
+    """
+    Build a dependency DAG over `tasks` (by index) from:
+    - explicit `context` lists (Task objects)
+    - files a task reads that another task writes (expected_output / output_file)
+    Returns {task_index: {indices of tasks it depends on}}.
+    """
+    produced = [_produced_files(t) for t in tasks]
+    deps: Dict[int, Set[int]] = {i: set() for i in range(len(tasks))}
+
+    for i, task in enumerate(tasks):
+        # 1) Explicit context
+        if isinstance(task.context, list):
+            for ctx_task in task.context:
+                for j, other in enumerate(tasks):
+                    if other is ctx_task and j != i:
+                        deps[i].add(j)
+
+        # 2) Files read that an earlier-or-later task produces
+        reads = _consumed_files(task) - produced[i]
+        for j, files in enumerate(produced):
+            if j != i and reads & files:
+                deps[i].add(j)
+
+    return deps
+
+
+def independent_chains(tasks: List[Task]) -> List[List[Task]]:
+    """
+    Split `tasks` into the connected components of their dependency graph.
+    Each chain keeps the original declaration order, so it can still run sequentially.
+    """
+    deps = build_task_graph(tasks)
+    parent = list(range(len(tasks)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, task_deps in deps.items():
+        for j in task_deps:
+            parent[find(i)] = find(j)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(tasks)):
+        groups.setdefault(find(i), []).append(i)
+
+    chains = [[tasks[i] for i in sorted(idx)] for idx in groups.values()]
+    chains.sort(key=lambda chain: tasks.index(chain[0]))
+    return chains
+
+
+def kickoff_concurrently(
+    crew: Crew,
+    inputs: Optional[Dict[str, Any]] = None,
+    max_concurrency: Optional[int] = None,
+) -> List[CrewOutput]:
+    """
+    Run a sequential crew as independent chains in parallel.
+    - Each chain becomes its own sequential sub-crew (same agents, tasks and verbosity).
+    - At most `max_concurrency` chains run at the same time.
+    - Returns one CrewOutput per chain, in declaration order; re-raises the first failure.
+    """
+    chains = independent_chains(list(crew.tasks))
+    if max_concurrency is None:
+        max_concurrency = max_concurrency_from_env()
+
+    if len(chains) <= 1 or max_concurrency <= 1:
+        return [crew.kickoff(inputs=inputs)]
+
+    def run_chain(chain: List[Task]) -> CrewOutput:
+        agents = []
+        for t in chain:
+            if t.agent is not None and t.agent not in agents:
+                agents.append(t.agent)
+        sub_crew = Crew(
+            agents=agents,
+            tasks=chain,
+            process=Process.sequential,
+            verbose=crew.verbose,
+        )
+        return sub_crew.kickoff(inputs=dict(inputs or {}))
+
+    print(f"[Scheduler] {len(chains)} independent chains, running up to {max_concurrency} at a time")
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chains))) as pool:
+        futures = [pool.submit(run_chain, chain) for chain in chains]
+        return [f.result() for f in futures]
@@ -0,0 +1,6 @@
+from nova_common.session_code_tool import (
+    SessionCodeInterpreterTool,
+    start_code_session,
+    end_code_session,
+    get_code_session,
+)
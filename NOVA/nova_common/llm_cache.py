@@ -0,0 +1,208 @@
+from pathlib import Path
+from typing import Any, Dict, Optional
+from functools import lru_cache
+import threading
+import argparse
+import hashlib
+import sqlite3
+import json
+import time
+import os
+
+
+DEFAULT_TTL_HOURS = 168
+DEFAULT_MAX_MB = 256
+COUNTERS = ("hits", "misses", "bypasses", "stores", "evictions")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+def response_key(model: str, temperature: Any, messages: Any, tools: Any = None, stop: Any = None) -> str:
+    """sha256 of everything that determines a completion: model id, temperature, messages, tools, stop words."""
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages, "tools": tools, "stop": stop},
+        sort_keys=True, default=str, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Exact-match store of LLM completions in SQLite (NOVA/.cache/llm/responses.sqlite).
+    - Entries older than `ttl_s` count as misses and are deleted.
+    - Beyond `max_bytes` of responses the least recently used entries are evicted.
+    - Counters (hits / misses / bypasses / stores / evictions) live in the same file, so they add up
+      across job workers; `session` holds this process's share.
+    - Any SQLite error is logged and treated as a miss: the cache never fails a crew.
+    """
+
+    def __init__(self, path: Path, ttl_s: float = DEFAULT_TTL_HOURS * 3600, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = Path(path)
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.session = {name: 0 for name in COUNTERS}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, conn: sqlite3.Connection, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.session[name] += n
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+            (name, n, n),
+        )
+
+    # ---------- public API ----------
+    def get(self, key: str) -> Optional[str]:
+        """The stored response for `key`, or None (miss / expired)."""
+        now = time.time()
+        try:
+            conn = self._conn()
+            with conn:
+                row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[1] > self.ttl_s:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                if row is None:
+                    self._count(conn, "misses")
+                    return None
+                conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                self._count(conn, "hits")
+                return row[0]
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Lookup failed: {e}")
+            return None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, bytes, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, size, now, now),
+                )
+                self._count(conn, "stores")
+                self._evict(conn, now)
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Could not store response: {e}")
+
+    def bypass(self) -> None:
+        """Count a call that skipped the cache (its role is listed in NOVA_LLM_CACHE_BYPASS)."""
+        try:
+            conn = self._conn()
+            with conn:
+                self._count(conn, "bypasses")
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals across all processes, plus entries / bytes / hit rate."""
+        try:
+            conn = self._conn()
+            totals = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM responses").fetchone()
+        except sqlite3.Error:
+            totals, entries, size = {}, 0, 0
+        stats = {name: totals.get(name, 0) for name in COUNTERS}
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({"entries": entries, "bytes": size, "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0})
+        return stats
+
+    def clear(self) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM counters")
+
+    # ---------- eviction ----------
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        evicted = conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_s,)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM responses").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = conn.execute("SELECT key, bytes FROM responses ORDER BY last_used LIMIT 64").fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                evicted += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        if evicted:
+            self._count(conn, "evictions", evicted)
+
+
+def bypassed_roles() -> set:
+    """Agent roles (see llm_registry.ROLE_TEMPERATURES) that always call the model: NOVA_LLM_CACHE_BYPASS=researching,answering."""
+    return {r.strip().lower() for r in os.getenv("NOVA_LLM_CACHE_BYPASS", "").split(",") if r.strip()}
+
+
+@lru_cache(maxsize=4)
+def get_llm_cache(nova_root: Path) -> Optional[LLMResponseCache]:
+    """
+    Shared response cache under NOVA/.cache/llm.
+    - NOVA_LLM_CACHE=0 disables it (returns None).
+    - NOVA_LLM_CACHE_TTL_HOURS (default 168) and NOVA_LLM_CACHE_MAX_MB (default 256) bound it.
+    """
+    if os.getenv("NOVA_LLM_CACHE", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    try:
+        ttl_h = float(os.getenv("NOVA_LLM_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS))
+    except ValueError:
+        ttl_h = DEFAULT_TTL_HOURS
+    try:
+        max_mb = float(os.getenv("NOVA_LLM_CACHE_MAX_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        max_mb = DEFAULT_MAX_MB
+    return LLMResponseCache(Path(nova_root) / ".cache" / "llm" / "responses.sqlite", ttl_h * 3600, int(max_mb * 1024 * 1024))
+
+
+def log_cache_stats(nova_root: Path) -> None:
+    """One-line summary of this process's lookups and the all-time totals."""
+    cache = get_llm_cache(Path(nova_root))
+    if cache is None:
+        return
+    s, total = cache.session, cache.stats()
+    lookups = s["hits"] + s["misses"]
+    rate = f"{s['hits'] / lookups:.0%}" if lookups else "n/a"
+    print(
+        f"[LLMCache] this process: hits={s['hits']} misses={s['misses']} bypasses={s['bypasses']} (hit rate {rate}); "
+        f"all runs: hit rate {total['hit_rate']:.0%}, {total['entries']} entries, {total['bytes'] / (1 << 20):.1f} MB"
+    )
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the LLM response cache")
+    parser.add_argument("nova_root", type=Path, help="The NOVA/ folder")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached responses and counters")
+    args = parser.parse_args(argv)
+    cache = LLMResponseCache(args.nova_root / ".cache" / "llm" / "responses.sqlite")
+    if args.clear:
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict, deque
+from functools import lru_cache
+import threading
+import os
+
+from .llm_cache import bypassed_roles, get_llm_cache, response_key
+from .rate_limiter import get_limiter
+
+
+ROUTING_FILE = "model_routing.yaml"
+DEFAULT_SOURCE = "API"
+DEFAULT_SELECTION = "gemini/gemini-2.5-flash"
+DEFAULT_MAX_CONNECTIONS = 8
+KEEPALIVE_SECONDS = 120.0
+# Runs whose routing metadata is kept per process, and fallbacks remembered across them
+MAX_RUNS = 8
+MAX_FALLBACKS = 100
+
+# Sampling temperature of every agent role (one shared client per model + temperature)
+ROLE_TEMPERATURES = {
+    "processing": 0.1,
+    "researching": 0.4,
+    "exploring": 0.1,
+    "cleaning": 0.1,
+    "summarizing": 0.2,
+    "answering": 0.4,
+}
+API_KEY_ENVS = {
+    "openai": "OPENAI_API_KEY",
+    "gemini": "GEMINI_API_KEY",
+}
+# Providers litellm serves through its own httpx handler (accepts a `client=` per call);
+# OpenAI goes through the OpenAI SDK, which picks up `litellm.client_session` instead.
+HANDLER_PROVIDERS = {"ollama", "gemini"}
+
+_LOCK = threading.Lock()
+_CONFIGS: Dict[Path, Tuple[Tuple[int, int], Tuple[str, str]]] = {}
+_ROUTINGS: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_LLMS: Dict[Tuple[str, float, Optional[str], bool, bool, Tuple[str, ...]], Any] = {}
+_POOLS: Dict[str, Any] = {}
+# Run metadata: run id -> {agent/role -> model it was given}; fallbacks taken at call time as
+# (sequence number, text), and the sequence number each run started at (LLMs are shared between runs)
+_ROUTED: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+_FALLBACKS: "deque[Tuple[int, str]]" = deque(maxlen=MAX_FALLBACKS)
+_RUN_STARTS: Dict[str, int] = {}
+_fallback_seq = 0
+
+
+def _max_connections() -> int:
+    try:
+        return max(1, int(os.getenv("NOVA_LLM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)))
+    except ValueError:
+        return DEFAULT_MAX_CONNECTIONS
+
+
+def read_model_config(nova_root: Path) -> Tuple[str, str]:
+    """
+    (source, selection) from NOVA/model_config.txt (2 lines, written by the UI).
+    - Parsed once and re-read only when the file's mtime/size change, so a model switch in the UI
+      applies to the next crew without re-reading the file for every agent.
+    - Missing/unreadable file -> ("API", "gemini/gemini-2.5-flash").
+    """
+    path = Path(nova_root) / "model_config.txt"
+    try:
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return DEFAULT_SOURCE, DEFAULT_SELECTION
+
+    with _LOCK:
+        cached = _CONFIGS.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        lines = [ln.strip() for ln in path.read_text(encoding="utf-8").splitlines() if ln.strip()]
+        source = (lines[0] if len(lines) >= 1 else DEFAULT_SOURCE).strip()
+        selection = (lines[1] if len(lines) >= 2 else DEFAULT_SELECTION).strip()
+    except Exception:
+        source, selection = DEFAULT_SOURCE, DEFAULT_SELECTION
+
+    with _LOCK:
+        if cached and cached[1] != (source, selection):
+            # The model changed: clients of the old one are no longer handed out
+            _LLMS.clear()
+        _CONFIGS[path] = (stamp, (source, selection))
+    print(f"[LLM] model_config.txt: source='{source}', selection='{selection}'")
+    return source, selection
+
+
+def resolve_model(source: str, selection: str) -> Tuple[str, str, Optional[str]]:
+    """
+    (provider, litellm model id, api key) for a model_config.txt selection.
+    - Local selections always go to Ollama ('llama3.2' -> 'ollama/llama3.2').
+    - API selections are 'provider/model' (bare names are Gemini); the key comes from <PROVIDER>_API_KEY.
+    - Raises RuntimeError if OpenAI/Gemini is selected without its key.
+    """
+    if source.strip().lower() == "local":
+        tag = selection.split("/", 1)[-1]
+        return "ollama", f"ollama/{tag}", None
+
+    if "/" not in selection:
+        provider, model_name = "gemini", selection
+    else:
+        provider, model_name = selection.split("/", 1)
+    provider = provider.lower().strip()
+
+    api_env = API_KEY_ENVS.get(provider, f"{provider.upper()}_API_KEY")
+    api_key = os.getenv(api_env)
+    if not api_key and provider in API_KEY_ENVS:
+        raise RuntimeError(f"{api_env} is not set but '{provider}' was selected in model_config.txt.")
+    return provider, f"{provider}/{model_name.strip()}", api_key
+
+
+def read_routing(nova_root: Path) -> Dict[str, Any]:
+    """
+    {"tiers": {name: [model, ...]}, "routes": {task / agent / role: tier or model}} from NOVA/model_routing.yaml.
+    - Re-read only when the file changes; no file (or an unreadable one) means no routing.
+    """
+    path = Path(nova_root) / ROUTING_FILE
+    try:
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return {}
+
+    with _LOCK:
+        cached = _ROUTINGS.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        import yaml
+        with open(path, "r", encoding="utf-8") as f:
+            routing = yaml.safe_load(f) or {}
+        if not isinstance(routing, dict):
+            raise ValueError("expected a mapping with 'tiers' and 'routes'")
+    except Exception as e:
+        print(f"[LLM] Ignoring {ROUTING_FILE}: {e}")
+        routing = {}
+
+    with _LOCK:
+        _ROUTINGS[path] = (stamp, routing)
+    print(f"[LLM] {ROUTING_FILE}: {len(routing.get('routes') or {})} routes, tiers {sorted(routing.get('tiers') or {})}")
+    return routing
+
+
+def route_chain(nova_root: Path, keys: Iterable[str]) -> List[str]:
+    """
+    Model fallback chain for the first of `keys` (task names, agent name, role) routed in model_routing.yaml.
+    A route names a tier or directly a model (or a list of models); unrouted agents get ["default"],
+    the model picked in the UI (model_config.txt).
+    """
+    routing = read_routing(nova_root)
+    routes = routing.get("routes") or {}
+    tiers = routing.get("tiers") or {}
+    for key in keys:
+        if key and key in routes:
+            target = routes[key]
+            chain = tiers.get(target, target) if isinstance(target, str) else target
+            return [str(m).strip() for m in ([chain] if isinstance(chain, str) else chain or [])] or ["default"]
+    return ["default"]
+
+
+def _selection_config(nova_root: Path, selection: str) -> Tuple[str, str]:
+    """model_config.txt-style (source, selection) for a routing entry ('default', 'ollama/<tag>' or 'provider/model')."""
+    if selection.lower() == "default":
+        return read_model_config(nova_root)
+    if selection.lower().startswith("ollama/"):
+        return "Local", selection
+    return "API", selection
+
+
+def agent_tasks(tasks_config: Dict[str, Any], agent_name: str) -> List[str]:
+    """Names of the tasks assigned to `agent_name` in a crew's tasks.yaml (the agent may already be resolved by CrewBase)."""
+    names = []
+    for task_name, cfg in (tasks_config or {}).items():
+        assigned = cfg.get("agent") if isinstance(cfg, dict) else None
+        if (assigned if isinstance(assigned, str) else getattr(assigned, "__name__", "")) == agent_name:
+            names.append(task_name)
+    return names
+
+
+def start_routing_run(run_id: str) -> None:
+    """
+    Start recording a flow run's routing under `run_id` (the id its crews pass to get_llm), so a process
+    running several flows (pooled workers, CLI, benchmarks) never reports another run's agents or fallbacks.
+    - Keeps the metadata of at most MAX_RUNS runs; the oldest is dropped first.
+    """
+    with _LOCK:
+        _ROUTED.pop(run_id, None)
+        _ROUTED[run_id] = {}
+        _RUN_STARTS[run_id] = _fallback_seq
+        while len(_ROUTED) > MAX_RUNS:
+            old, _ = _ROUTED.popitem(last=False)
+            _RUN_STARTS.pop(old, None)
+
+
+def routing_metadata(run_id: str) -> Dict[str, Any]:
+    """
+    Models chosen in run `run_id` (agent/role -> model id) and the fallbacks taken since it started, for run state / job records.
+    - Fallbacks are recorded on the shared LLMs: runs that overlap in one process also see each other's.
+    """
+    with _LOCK:
+        since = _RUN_STARTS.get(run_id, _fallback_seq)
+        return {"agents": dict(_ROUTED.get(run_id, {})), "fallbacks": [text for seq, text in _FALLBACKS if seq > since]}
+
+
+def http_pool(provider: str) -> Optional[Any]:
+    """
+    Shared keep-alive connection pool for one provider (at most NOVA_LLM_MAX_CONNECTIONS connections),
+    so every agent and parallel exploring chain reuses the same TCP/TLS connections.
+    - Ollama/Gemini: a litellm HTTPHandler, passed to each completion as `client=`.
+    - OpenAI: installed as `litellm.client_session` (returns None, nothing to pass per call).
+    - Other providers keep litellm's default clients (None).
+    """
+    if provider not in HANDLER_PROVIDERS and provider != "openai":
+        return None
+    with _LOCK:
+        if provider in _POOLS:
+            return _POOLS[provider]
+
+        import httpx
+        import litellm
+
+        n = _max_connections()
+        client = httpx.Client(
+            limits=httpx.Limits(max_connections=n, max_keepalive_connections=n, keepalive_expiry=KEEPALIVE_SECONDS)
+        )
+        if provider == "openai":
+            litellm.client_session = client
+            pool = None
+        else:
+            from litellm.llms.custom_httpx.http_handler import HTTPHandler
+            pool = HTTPHandler(client=client)
+        _POOLS[provider] = pool
+        print(f"[LLM] {provider}: pooled HTTP client (max {n} connections)")
+        return pool
+
+
+@lru_cache(maxsize=1)
+def _cached_llm_class():
+    from crewai import LLM
+
+    class CachedLLM(LLM):
+        """
+        crewai LLM that answers from the response cache (llm_cache) before calling the provider.
+        - Only text completions are stored; tool-call results and failures always go to the model.
+        - `bypass` (role listed in NOVA_LLM_CACHE_BYPASS) skips the lookup but is counted.
+        - Provider calls run under the provider's rate limiter (rate_limiter), which retries throttled attempts.
+        - A call that still fails is retried on `fallback`, the next model of the routing chain.
+        """
+
+        response_cache = None
+        bypass = False
+        limiter = None
+        fallback = None
+
+        def _complete(self, messages, *args, **kwargs):
+            if self.limiter is None:
+                return LLM.call(self, messages, *args, **kwargs)
+            return self.limiter.call(lambda: LLM.call(self, messages, *args, **kwargs), len(str(messages)))
+
+        def call(self, messages, *args, **kwargs):
+            try:
+                return self._cached_call(messages, *args, **kwargs)
+            except Exception as e:
+                # Context overflows are handled by crewai itself; anything else moves down the fallback chain
+                if self.fallback is None or "ContextLength" in type(e).__name__:
+                    raise
+                global _fallback_seq
+                with _LOCK:
+                    _fallback_seq += 1
+                    _FALLBACKS.append((_fallback_seq, f"{self.model} -> {self.fallback.model}: {type(e).__name__}"))
+                print(f"[LLM] {self.model} failed ({type(e).__name__}: {e}); falling back to {self.fallback.model}")
+                return self.fallback.call(messages, *args, **kwargs)
+
+        def _cached_call(self, messages, *args, **kwargs):
+            cache = self.response_cache
+            if cache is None:
+                return self._complete(messages, *args, **kwargs)
+            if self.bypass:
+                cache.bypass()
+                return self._complete(messages, *args, **kwargs)
+
+            tools = kwargs.get("tools", args[0] if args else None)
+            key = response_key(self.model, self.temperature, messages, tools, self.stop)
+            cached = cache.get(key)
+            if cached is not None:
+                if self.stream:
+                    # Streaming consumers (the chat) still get the text, as a single chunk
+                    from crewai.utilities.events import crewai_event_bus
+                    from crewai.utilities.events.llm_events import LLMStreamChunkEvent
+                    crewai_event_bus.emit(self, event=LLMStreamChunkEvent(chunk=cached))
+                return cached
+            result = self._complete(messages, *args, **kwargs)
+            if isinstance(result, str) and result:
+                cache.put(key, self.model, result)
+            return result
+
+    return CachedLLM
+
+
+def _build_llm(
+    nova_root: Path, chain: List[Tuple[str, str, Optional[str]]], temperature: float, bypass: bool, stream: bool
+):
+    """Shared CachedLLM for chain[0], falling back to the rest of the chain (each built the same way)."""
+    provider, model_id, api_key = chain[0]
+    fallback = _build_llm(nova_root, chain[1:], temperature, bypass, stream) if len(chain) > 1 else None
+    key = (model_id, temperature, api_key, bypass, stream, tuple(m for _, m, _ in chain[1:]))
+    with _LOCK:
+        llm = _LLMS.get(key)
+    if llm is not None:
+        return llm
+
+    kwargs: Dict[str, Any] = {"temperature": temperature, "stream": stream}
+    if api_key:
+        kwargs["api_key"] = api_key
+    pool = http_pool(provider)
+    if pool is not None:
+        kwargs["client"] = pool
+    llm = _cached_llm_class()(model=model_id, **kwargs)
+    llm.response_cache = get_llm_cache(Path(nova_root))
+    llm.bypass = bypass
+    llm.limiter = get_limiter(provider, Path(nova_root))
+    llm.fallback = fallback
+    with _LOCK:
+        return _LLMS.setdefault(key, llm)
+
+
+def get_llm(nova_root: Path, role: str, agent: str = "", tasks: Iterable[str] = (), stream: bool = False, run_id: str = ""):
+    """
+    The shared crewai LLM of an agent, built from model_routing.yaml / model_config.txt.
+    - Routing: the first of the agent's `tasks`, the `agent` itself, then its `role` found in model_routing.yaml
+      picks a model chain; unrouted agents use the model_config.txt selection. Chain entries whose API key
+      is missing are skipped, the remaining ones are runtime fallbacks.
+    - Temperature comes from the role (ROLE_TEMPERATURES); `stream` emits crewai LLMStreamChunkEvents as tokens arrive.
+    - One instance per (model, temperature, api key, cache bypass, stream, fallbacks) per process instead of one per agent;
+      all instances of a provider share its http_pool().
+    - Completions go through the on-disk response cache unless NOVA_LLM_CACHE=0,
+      and API providers' calls through their shared rate limiter.
+    - The chosen model is recorded for `run_id` (see start_routing_run / routing_metadata).
+    """
+    temperature = ROLE_TEMPERATURES.get(role, 0.1)
+    bypass = role in bypassed_roles()
+    name = agent or role
+
+    chain: List[Tuple[str, str, Optional[str]]] = []
+    for selection in route_chain(nova_root, [*tasks, agent, role]):
+        try:
+            resolved = resolve_model(*_selection_config(nova_root, selection))
+        except RuntimeError as e:
+            print(f"[LLM] {name}: skipping {selection} ({e})")
+            continue
+        if all(resolved[1] != c[1] for c in chain):
+            chain.append(resolved)
+    if not chain:
+        # Nothing in the route is usable: the UI selection (raises its usual missing-key error)
+        chain = [resolve_model(*read_model_config(nova_root))]
+
+    llm = _build_llm(nova_root, chain, temperature, bypass, stream)
+    with _LOCK:
+        if run_id in _ROUTED:
+            _ROUTED[run_id][name] = llm.model
+    fallbacks = f" (fallbacks: {', '.join(m for _, m, _ in chain[1:])})" if len(chain) > 1 else ""
+    print(f"[LLM] {name} -> {llm.model}{fallbacks}")
+    return llm
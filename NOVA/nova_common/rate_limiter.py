@@ -0,0 +1,291 @@
+from email.utils import parsedate_to_datetime
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import threading
+import json
+import random
+import time
+import os
+
+
+DEFAULT_RPM = 60
+DEFAULT_TPM = 1_000_000
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 5
+BASE_BACKOFF_S = 1.0
+MAX_BACKOFF_S = 60.0
+
+# Local models have no quota to protect
+UNLIMITED_PROVIDERS = {"ollama"}
+# litellm / provider SDK exceptions worth retrying (matched by class name, so litellm stays a lazy import)
+RETRYABLE_ERRORS = {
+    "RateLimitError", "Timeout", "APITimeoutError", "APIConnectionError",
+    "ServiceUnavailableError", "InternalServerError", "ReadTimeout", "ConnectTimeout",
+}
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+# Bucket state shared by every process of a NOVA folder (app, job workers, CLI runs)
+STATE_DIR = Path(".cache") / "ratelimit"
+
+_LOCK = threading.Lock()
+_LIMITERS: Dict[str, "ProviderLimiter"] = {}
+
+
+def _env_number(name: str, provider: str, default: float) -> float:
+    """<NAME>_<PROVIDER> (e.g. NOVA_LLM_RPM_GEMINI) wins over <NAME>, then the default."""
+    for key in (f"{name}_{provider.upper()}", name):
+        value = os.getenv(key)
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return default
+
+
+class TokenBucket:
+    """Refills `rate` units per second up to `capacity`; acquire() blocks until `amount` units are available."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take `amount` units (capped at the capacity); returns the seconds spent waiting."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.level >= amount:
+                    self.level -= amount
+                    return waited
+                delay = (amount - self.level) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+@contextmanager
+def _locked_file(path: Path):
+    """`path` opened read/write under an exclusive lock shared by every process (flock on POSIX, msvcrt on Windows)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 s; keep waiting
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    TokenBucket whose level lives in the file `path`, so every process drawing from it shares one budget
+    (N job workers together stay within the configured rate instead of N times it).
+    - Wall-clock refill; a missing or unreadable state file counts as a full bucket.
+    """
+
+    def __init__(self, rate: float, capacity: float, path: Path):
+        super().__init__(rate, capacity)
+        self.path = path
+
+    def acquire(self, amount: float = 1.0) -> float:
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock, _locked_file(self.path) as f:
+                now = time.time()
+                try:
+                    f.seek(0)
+                    state = json.loads(f.read() or b"{}")
+                    level, updated = float(state["level"]), float(state["updated"])
+                except (ValueError, KeyError, TypeError):
+                    level, updated = self.capacity, now
+                level = min(self.capacity, level + max(0.0, now - updated) * self.rate)
+                if level >= amount:
+                    level -= amount
+                    delay = 0.0
+                else:
+                    delay = (amount - level) / self.rate
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"level": level, "updated": now}).encode("utf-8"))
+                f.flush()
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+
+class AdaptiveConcurrency:
+    """
+    Caps in-flight calls with an additive-increase / multiplicative-decrease limit:
+    - a throttled call (429, timeout, 5xx) halves the limit
+    - `limit` successes in a row raise it by one, up to `max_limit`
+    """
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.active = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.active >= int(self.limit):
+                self._cond.wait()
+            self.active += 1
+
+    def release(self, throttled: bool) -> None:
+        with self._cond:
+            self.active -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= int(self.limit) and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """The provider's Retry-After (seconds or HTTP date) from a litellm / httpx / openai exception, if any."""
+    headers = None
+    response = getattr(error, "response", None)
+    if response is not None:
+        headers = getattr(response, "headers", None)
+    headers = headers or getattr(error, "litellm_response_headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+    except AttributeError:
+        return None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if names & RETRYABLE_ERRORS:
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS
+
+
+class ProviderLimiter:
+    """
+    Client-side limits for one API provider, shared by every agent / exploring chain of the process.
+    - Request bucket (NOVA_LLM_RPM) and prompt-token bucket (NOVA_LLM_TPM, estimated at 4 chars per token).
+    - In-flight calls capped by AdaptiveConcurrency (NOVA_LLM_MAX_CONCURRENCY).
+    - Retryable failures (429, timeouts, 5xx, connection errors) are retried up to NOVA_LLM_MAX_RETRIES times,
+      waiting the provider's Retry-After if sent, else a full-jitter exponential backoff;
+      a Retry-After pauses every caller of the provider, not just the one that got it.
+    Each setting can be overridden per provider, e.g. NOVA_LLM_RPM_GEMINI=10.
+    With `state_dir` (NOVA/.cache/ratelimit) the request and token budgets are shared by every process of the
+    NOVA folder, so concurrent background jobs split NOVA_LLM_RPM / NOVA_LLM_TPM between them; the concurrency
+    cap and Retry-After pauses stay per process.
+    """
+
+    def __init__(self, provider: str, state_dir: Optional[Path] = None):
+        self.provider = provider
+        rpm = _env_number("NOVA_LLM_RPM", provider, DEFAULT_RPM)
+        tpm = _env_number("NOVA_LLM_TPM", provider, DEFAULT_TPM)
+        if state_dir is None:
+            self.requests = TokenBucket(rpm / 60.0, max(1.0, rpm / 60.0 * 5))
+            self.tokens = TokenBucket(tpm / 60.0, tpm)
+        else:
+            self.requests = SharedTokenBucket(rpm / 60.0, max(1.0, rpm / 60.0 * 5), state_dir / f"{provider}.requests.json")
+            self.tokens = SharedTokenBucket(tpm / 60.0, tpm, state_dir / f"{provider}.tokens.json")
+        self.concurrency = AdaptiveConcurrency(int(_env_number("NOVA_LLM_MAX_CONCURRENCY", provider, DEFAULT_MAX_CONCURRENCY)))
+        self.max_retries = int(_env_number("NOVA_LLM_MAX_RETRIES", provider, DEFAULT_MAX_RETRIES))
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "retries": 0, "throttled": 0, "wait_seconds": 0.0}
+
+    def _wait_for_pause(self) -> None:
+        with self._lock:
+            delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+            self.stats["wait_seconds"] += delay
+
+    def call(self, fn: Callable[[], Any], prompt_chars: int = 0) -> Any:
+        """Run `fn` (one LLM completion) under the provider's limits, retrying throttled attempts."""
+        attempt = 0
+        while True:
+            self._wait_for_pause()
+            waited = self.requests.acquire(1)
+            waited += self.tokens.acquire(max(1, prompt_chars // 4))
+            self.stats["wait_seconds"] += waited
+            self.concurrency.acquire()
+            throttled = False
+            try:
+                self.stats["calls"] += 1
+                return fn()
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                throttled = True
+                delay = retry_after_seconds(e)
+                if delay is not None:
+                    with self._lock:
+                        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                else:
+                    delay = random.uniform(0, min(MAX_BACKOFF_S, BASE_BACKOFF_S * 2 ** attempt))
+                attempt += 1
+                self.stats["retries"] += 1
+                self.stats["throttled"] += 1
+                print(
+                    f"[RateLimit] {self.provider}: {type(e).__name__}, retry {attempt}/{self.max_retries} "
+                    f"in {delay:.1f}s (concurrency limit {int(self.concurrency.limit)})"
+                )
+            finally:
+                self.concurrency.release(throttled)
+            if delay > 0:
+                time.sleep(delay)
+                self.stats["wait_seconds"] += delay
+
+
+def get_limiter(provider: str, nova_root: Optional[Path] = None) -> Optional[ProviderLimiter]:
+    """
+    The process-wide limiter of an API provider; None for local models or with NOVA_RATE_LIMIT=0.
+    - With `nova_root`, its budgets are shared with the other processes through NOVA/.cache/ratelimit.
+    """
+    if provider in UNLIMITED_PROVIDERS:
+        return None
+    if os.getenv("NOVA_RATE_LIMIT", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    with _LOCK:
+        if provider not in _LIMITERS:
+            _LIMITERS[provider] = ProviderLimiter(provider, Path(nova_root) / STATE_DIR if nova_root else None)
+        return _LIMITERS[provider]
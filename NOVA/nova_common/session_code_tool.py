@@ -0,0 +1,236 @@
+from typing import Any, Dict, List, Optional, Type
+from collections import OrderedDict
+from importlib import metadata
+from pathlib import Path
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field, PrivateAttr
+import pandas as pd
+
+from .tracing import traced
+import subprocess
+import threading
+import time
+import json
+import sys
+import os
+import re
+
+
+MAX_SESSIONS = 4
+
+
+class CodeSessionInput(BaseModel):
+    """Input schema for SessionCodeInterpreterTool (same shape as crewai_tools' CodeInterpreterTool)."""
+
+    code: str = Field(
+        ...,
+        description=(
+            "Python3 code to run in the warm session. `pd`, `np`, `plt`, `json`, `os` and `Path` are already "
+            "imported, the DataFrames listed in the tool description are preloaded, and variables persist "
+            "between your calls. Assign the final value to a variable named `result`."
+        ),
+    )
+    libraries_used: List[str] = Field(
+        default_factory=list,
+        description="Extra pip packages the code needs (only missing ones are installed). Example: scipy,seaborn",
+    )
+
+
+def _base_globals() -> Dict[str, Any]:
+    """Imports every session starts with (matplotlib is forced onto the headless Agg backend)."""
+    import numpy as np
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return {"__builtins__": __builtins__, "pd": pd, "np": np, "plt": plt, "json": json, "os": os, "Path": Path}
+
+
+def _read_dataset(path: str) -> pd.DataFrame:
+    if Path(path).suffix.lower() in {".arrow", ".feather"}:
+        from pyarrow import feather
+        return feather.read_table(path, memory_map=True).to_pandas()
+    return pd.read_csv(path, low_memory=False)
+
+
+class CodeSession:
+    """
+    Warm execution state shared by every code-writing agent of one flow run.
+    - `datasets`: {variable name: file path}; each file is parsed at most once per session,
+      and only when an agent's code actually references that variable.
+    - Agents get their own namespace seeded with the base imports and their own copy of each frame they use,
+      so concurrent chains never see each other's edits (the file is still parsed only once). No process-wide
+      pandas option is changed: agent code and the rest of the process keep the default pandas semantics.
+    - pip installs happen once per session and only for packages that are not installed.
+    """
+
+    def __init__(self, session_id: str, datasets: Dict[str, str]):
+        self.session_id = session_id
+        self.datasets = {name: path for name, path in datasets.items() if path}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._namespaces: List[Dict[str, Any]] = []
+        self._base: Optional[Dict[str, Any]] = None
+        self._installed: set = set()
+        self._lock = threading.Lock()
+
+    def base_globals(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._base is None:
+                self._base = _base_globals()
+            return dict(self._base)
+
+    def frame(self, name: str) -> pd.DataFrame:
+        with self._lock:
+            if name not in self._frames:
+                self._frames[name] = _read_dataset(self.datasets[name])
+                print(f"[CodeSession] {self.session_id}: loaded `{name}` from {self.datasets[name]}")
+            return self._frames[name]
+
+    def agent_frame(self, name: str) -> pd.DataFrame:
+        """The shared frame as an agent's own variable (a copy, so its edits stay in its namespace)."""
+        return self.frame(name).copy()
+
+    def describe_datasets(self) -> str:
+        if not self.datasets:
+            return ""
+        names = ", ".join(f"`{name}` = {Path(path).name}" for name, path in self.datasets.items())
+        return f" Preloaded DataFrames (parsed on first use): {names}."
+
+    def register_namespace(self, ns: Dict[str, Any]) -> None:
+        with self._lock:
+            if all(ns is not other for other in self._namespaces):
+                self._namespaces.append(ns)
+
+    def derived_frames(self) -> Dict[str, pd.DataFrame]:
+        """DataFrames the agents built in their namespaces (not the loaded datasets), later agents winning."""
+        with self._lock:
+            namespaces = list(self._namespaces)
+        frames: Dict[str, pd.DataFrame] = {}
+        for ns in namespaces:
+            for name, value in ns.items():
+                if isinstance(value, pd.DataFrame) and not name.startswith("_") and name not in self.datasets:
+                    frames[name] = value
+        return frames
+
+    def ensure_libraries(self, libraries: List[str]) -> None:
+        for library in libraries:
+            name = re.split(r"[<>=!~\[ ]", library.strip(), maxsplit=1)[0]
+            if not name or name in self._installed:
+                continue
+            try:
+                metadata.version(name)
+            except metadata.PackageNotFoundError:
+                print(f"[CodeSession] {self.session_id}: installing {library}")
+                subprocess.run([sys.executable, "-m", "pip", "install", library], check=False)
+            self._installed.add(name)
+
+    def close(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._namespaces.clear()
+            if self._base is not None:
+                self._base["plt"].close("all")
+            self._base = None
+
+
+_SESSIONS: "OrderedDict[str, CodeSession]" = OrderedDict()
+_SESSIONS_LOCK = threading.Lock()
+
+
+def start_code_session(session_id: str, datasets: Dict[str, str]) -> CodeSession:
+    """
+    Open (or reset) the session of a flow run; its tools are created with the same `session_id`.
+    - Keeps at most MAX_SESSIONS sessions alive; the oldest is closed first.
+    """
+    with _SESSIONS_LOCK:
+        old = _SESSIONS.pop(session_id, None)
+        if old is not None:
+            old.close()
+        session = _SESSIONS[session_id] = CodeSession(session_id, datasets)
+        while len(_SESSIONS) > MAX_SESSIONS:
+            _, evicted = _SESSIONS.popitem(last=False)
+            evicted.close()
+    return session
+
+
+def get_code_session(session_id: str) -> Optional[CodeSession]:
+    with _SESSIONS_LOCK:
+        return _SESSIONS.get(session_id)
+
+
+def end_code_session(session_id: str) -> None:
+    """Drop the run's loaded frames and figures so the next run starts clean."""
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.pop(session_id, None)
+    if session is not None:
+        session.close()
+
+
+class SessionCodeInterpreterTool(BaseTool):
+    """
+    Drop-in replacement for `CodeInterpreterTool(unsafe_mode=True)` that runs code in the flow's warm session.
+    - Binds to the session named by `session_id` (the flow passes its id to the crew, which passes it here),
+      so two flows in one process never share data; the description lists that session's DataFrames.
+    - Variables persist across calls of the same agent; `result` is returned like the original tool.
+    - Without a session it behaves like a plain interpreter with the base imports.
+    """
+
+    name: str = "Code Interpreter"
+    description: str = (
+        "Runs Python3 code in a persistent session: pandas (pd), numpy (np), matplotlib.pyplot (plt) are imported "
+        "and variables persist between calls. Assign the final value to `result`."
+    )
+    args_schema: Type[BaseModel] = CodeSessionInput
+    session_id: Optional[str] = None
+    _namespace: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _local_session: Optional[CodeSession] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        session = get_code_session(self.session_id) if self.session_id else None
+        if session is not None:
+            self.description += session.describe_datasets()
+        super().model_post_init(__context)
+
+    def _session(self) -> CodeSession:
+        session = get_code_session(self.session_id) if self.session_id else None
+        if session is None:
+            if self._local_session is None:
+                self._local_session = CodeSession("local", {})
+            session = self._local_session
+        return session
+
+    def _prepare(self, code: str, session: CodeSession) -> Dict[str, Any]:
+        ns = self._namespace
+        if not ns:
+            ns.update(session.base_globals())
+            session.register_namespace(ns)
+        for name in session.datasets:
+            if name not in ns and re.search(rf"\b{re.escape(name)}\b", code):
+                ns[name] = session.agent_frame(name)
+        return ns
+
+    def _run(self, code: str, libraries_used: Optional[List[str]] = None, **kwargs) -> Any:
+        session = self._session()
+        attrs = {
+            "nova.code.session_id": session.session_id,
+            "nova.code.size_bytes": len(code.encode("utf-8")),
+            "nova.code.lines": code.count("\n") + 1,
+            "nova.code.libraries": ",".join(libraries_used or []),
+        }
+        with traced("code_interpreter.exec", attrs) as span:
+            started = time.perf_counter()
+            try:
+                session.ensure_libraries(libraries_used or [])
+                ns = self._prepare(code, session)
+                ns.pop("result", None)
+                exec(code, ns)
+                result = ns.get("result", "No result variable found.")
+            except Exception as e:
+                result = f"An error occurred: {str(e)}"
+                if span is not None:
+                    span.set_attribute("nova.code.error", type(e).__name__)
+            if span is not None:
+                span.set_attribute("nova.code.exec_seconds", time.perf_counter() - started)
+                span.set_attribute("nova.code.result_chars", len(str(result)))
+            return result
@@ -0,0 +1,222 @@
+from pandas.api import types as ptypes
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import pandas as pd
+import numpy as np
+import threading
+import hashlib
+import json
+import time
+import os
+
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".stats.json"
+CHUNK_SIZE = 1 << 20
+QUANTILES = [0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 1.0]
+HISTOGRAM_BINS = 20
+TOP_VALUES = 50
+MAX_CORR_COLUMNS = 60
+MAX_LOADED = 16
+
+_LOCK = threading.Lock()
+# (index path, dataset size, dataset mtime, index mtime) -> verified index
+_LOADED: Dict[tuple, Dict[str, Any]] = {}
+
+
+def stats_index_enabled() -> bool:
+    """NOVA_STATS_INDEX=0 skips building the index at the end of cleaning."""
+    return os.getenv("NOVA_STATS_INDEX", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def index_path(dataset: Path) -> Path:
+    """The index lives next to its dataset: cleaned_data_three.csv -> cleaned_data_three.csv.stats.json."""
+    dataset = Path(dataset)
+    return dataset.with_name(dataset.name + INDEX_SUFFIX)
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _num(value: Any) -> Optional[float]:
+    """JSON-safe float (NaN / inf -> None)."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if np.isfinite(value) else None
+
+
+def _value_counts(s: pd.Series, top: int) -> Dict[str, Any]:
+    counts = s.value_counts(dropna=True)
+    shown = counts.head(top)
+    return {
+        "top_values": [[str(v), int(c)] for v, c in shown.items()],
+        "other_count": int(counts.iloc[top:].sum()) if len(counts) > top else 0,
+    }
+
+
+def build_stats_index(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compact statistics of `df`, keyed by column name:
+    - every column: dtype, kind, null count, distinct count
+    - numeric columns: mean / std / quantiles and a HISTOGRAM_BINS-bin histogram
+    - text columns (and numeric ones with few distinct values): the TOP_VALUES most frequent values
+    - "correlations": pairwise Pearson matrix of the first MAX_CORR_COLUMNS numeric columns
+    """
+    n_rows = len(df)
+    null_counts = df.isna().sum()
+    unique_counts = df.nunique(dropna=True)
+    numeric = [c for c in df.columns if ptypes.is_numeric_dtype(df[c]) and not ptypes.is_bool_dtype(df[c])]
+    quantiles = df[numeric].quantile(QUANTILES) if numeric and n_rows else pd.DataFrame()
+
+    columns: Dict[str, Dict[str, Any]] = {}
+    for col in df.columns:
+        s = df[col]
+        info: Dict[str, Any] = {
+            "dtype": str(s.dtype),
+            "kind": "numeric" if col in numeric else "categorical",
+            "nulls": int(null_counts[col]),
+            "unique": int(unique_counts[col]),
+        }
+        if col in numeric:
+            values = s.to_numpy(dtype="float64", na_value=np.nan)
+            values = values[np.isfinite(values)]
+            info["mean"] = _num(values.mean()) if len(values) else None
+            info["std"] = _num(values.std(ddof=1)) if len(values) > 1 else None
+            info["quantiles"] = {str(q): _num(quantiles.at[q, col]) for q in QUANTILES} if len(quantiles) else {}
+            if len(values):
+                counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+                info["histogram"] = {"edges": [_num(e) for e in edges], "counts": counts.tolist()}
+            if info["unique"] <= HISTOGRAM_BINS:
+                info.update(_value_counts(s, TOP_VALUES))
+        else:
+            info.update(_value_counts(s, TOP_VALUES))
+        columns[str(col)] = info
+
+    corr_cols = numeric[:MAX_CORR_COLUMNS]
+    correlations: Dict[str, Dict[str, Optional[float]]] = {}
+    if len(corr_cols) > 1:
+        corr = df[corr_cols].corr()
+        correlations = {str(a): {str(b): _num(corr.at[a, b]) for b in corr_cols} for a in corr_cols}
+
+    return {"rows": n_rows, "n_columns": int(df.shape[1]), "columns": columns, "correlations": correlations}
+
+
+class _HashingWriter:
+    """Text file wrapper that feeds everything written through it to sha256 (as the UTF-8 bytes on disk)."""
+
+    def __init__(self, f):
+        self.f = f
+        self.hash = hashlib.sha256()
+
+    def write(self, text: str) -> int:
+        self.hash.update(text.encode("utf-8"))
+        return self.f.write(text)
+
+    def __iter__(self):
+        # pandas only accepts objects with both write() and __iter__ as file handles
+        return iter(())
+
+
+def write_csv_hashed(df: pd.DataFrame, path: Path) -> str:
+    """`df.to_csv(path, index=False)` that also returns the file's sha256, without reading it back."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = _HashingWriter(f)
+        df.to_csv(writer, index=False)
+    return writer.hash.hexdigest()
+
+
+def write_stats_index(dataset: Path, df: Optional[pd.DataFrame] = None, sha256: str = "") -> Optional[Path]:
+    """
+    Build (or keep) the index of `dataset`, versioned by the dataset's sha256.
+    - An index whose hash still matches the file is left as is.
+    - `df` / `sha256` skip re-reading / re-hashing the CSV when the caller already holds them (write_csv_hashed).
+    Returns the index path, or None when the dataset does not exist.
+    """
+    dataset = Path(dataset)
+    if not dataset.exists():
+        return None
+    path = index_path(dataset)
+    digest = sha256 or _sha256(dataset)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            existing = json.load(f)
+        if existing.get("sha256") == digest and existing.get("version") == INDEX_VERSION:
+            print(f"[StatsIndex] {path.name} is up to date")
+            return path
+    except (OSError, ValueError):
+        pass
+
+    started = time.time()
+    if df is None:
+        df = pd.read_csv(dataset, low_memory=False, compression="infer")
+    stat = dataset.stat()
+    index = {
+        "version": INDEX_VERSION,
+        "dataset": dataset.name,
+        "sha256": digest,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "built": time.time(),
+        **build_stats_index(df),
+    }
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"), allow_nan=False)
+    os.replace(tmp, path)
+    print(f"[StatsIndex] {index['n_columns']} columns x {index['rows']} rows indexed in {time.time() - started:.1f}s -> {path.name}")
+    return path
+
+
+def load_stats_index(dataset: Path) -> Optional[Dict[str, Any]]:
+    """
+    The index of `dataset` if it still describes the file, else None (missing or stale).
+    An unchanged size + mtime is trusted; otherwise the file is re-hashed and compared to the stored sha256.
+    Verified indexes are kept in memory, so repeated lookups cost a dict access.
+    """
+    dataset = Path(dataset)
+    path = index_path(dataset)
+    try:
+        stat, index_mtime = dataset.stat(), path.stat().st_mtime_ns
+    except OSError:
+        return None
+    key = (str(path), stat.st_size, stat.st_mtime_ns, index_mtime)
+    with _LOCK:
+        if key in _LOADED:
+            return _LOADED[key]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[StatsIndex] Could not read {path.name}: {e}")
+        return None
+    if index.get("version") != INDEX_VERSION:
+        return None
+    if (index.get("size"), index.get("mtime_ns")) != (stat.st_size, stat.st_mtime_ns) and index.get("sha256") != _sha256(dataset):
+        print(f"[StatsIndex] {path.name} is stale ({dataset.name} changed)")
+        return None
+    with _LOCK:
+        if len(_LOADED) >= MAX_LOADED:
+            _LOADED.clear()
+        _LOADED[key] = index
+    return index
+
+
+def strongest_correlations(index: Dict[str, Any], column: Optional[str] = None, top: int = 10) -> List[tuple]:
+    """(column a, column b, r) pairs by |r|, optionally only those involving `column`."""
+    corr = index.get("correlations", {})
+    pairs = []
+    for a, row in corr.items():
+        for b, r in row.items():
+            if r is None or a == b or (column is None and a > b):
+                continue
+            if column is not None and a != column:
+                continue
+            pairs.append((a, b, r))
+    return sorted(pairs, key=lambda p: abs(p[2]), reverse=True)[:top]
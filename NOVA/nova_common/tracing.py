@@ -0,0 +1,336 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from datetime import datetime
+import threading
+import argparse
+import json
+import os
+
+
+TRACES_DIR_NAME = "traces"
+_LOCK = threading.Lock()
+_LISTENER = None
+
+
+def _attr(value: Any) -> Any:
+    """OTel attributes only take str/bool/int/float (or lists of them)."""
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+def _estimate_tokens(text: str) -> int:
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("cl100k_base").encode(text, disallowed_special=()))
+    except Exception:
+        return (len(text) + 3) // 4
+
+
+class JsonFileSpanExporter:
+    """
+    One JSON span per line in NOVA/.cache/traces/spans-<pid>.jsonl (one file per process, so workers never interleave).
+    The pid is read at export time: job workers forked from the preloading fork server inherit this exporter.
+    """
+
+    def __init__(self, traces_dir: Path):
+        self.traces_dir = Path(traces_dir)
+        self.traces_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.traces_dir / f"spans-{os.getpid()}.jsonl"
+
+    def export(self, spans):
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(span.to_json(indent=None) + "\n")
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+class FlowTracingListener:
+    """
+    Turns crewai events into nested spans: flow step > crew kickoff > task > LLM call / tool execution.
+    - Parents come from a per-thread stack of open spans; a crew started from a worker thread
+      (parallel exploring chains) falls back to the flow step that is currently open.
+    - Token counts: exact per crew (CrewOutput.token_usage), estimated per LLM call.
+    """
+
+    def __init__(self, tracer):
+        from crewai.utilities.events import (
+            crewai_event_bus,
+            CrewKickoffStartedEvent, CrewKickoffCompletedEvent, CrewKickoffFailedEvent,
+            TaskStartedEvent, TaskCompletedEvent, TaskFailedEvent,
+            LLMCallStartedEvent, LLMCallCompletedEvent, LLMCallFailedEvent,
+            ToolUsageStartedEvent, ToolUsageFinishedEvent, ToolUsageErrorEvent,
+        )
+        from crewai.utilities.events.flow_events import (
+            MethodExecutionStartedEvent, MethodExecutionFinishedEvent, MethodExecutionFailedEvent,
+        )
+
+        self.tracer = tracer
+        self._spans: Dict[Any, Any] = {}
+        self._local = threading.local()
+        self._step_spans: List[Any] = []
+        self._lock = threading.Lock()
+        on = crewai_event_bus.on
+
+        # ---------- flow steps ----------
+        @on(MethodExecutionStartedEvent)
+        def _(source, event):
+            span = self._open(("step", id(source), event.method_name), f"flow.step {event.method_name}", {
+                "nova.flow": event.flow_name,
+                "nova.step": event.method_name,
+                "nova.flow_id": getattr(source, "flow_id", ""),
+            })
+            with self._lock:
+                self._step_spans.append(span)
+
+        @on(MethodExecutionFinishedEvent)
+        def _(source, event):
+            self._close(("step", id(source), event.method_name))
+
+        @on(MethodExecutionFailedEvent)
+        def _(source, event):
+            self._close(("step", id(source), event.method_name), error=event.error)
+
+        # ---------- crews ----------
+        @on(CrewKickoffStartedEvent)
+        def _(source, event):
+            self._open(("crew", id(source)), f"crew.kickoff {event.crew_name}", {
+                "nova.crew": event.crew_name or "",
+                "nova.crew.tasks": len(getattr(source, "tasks", []) or []),
+            })
+
+        @on(CrewKickoffCompletedEvent)
+        def _(source, event):
+            usage = getattr(getattr(event, "output", None), "token_usage", None)
+            attrs = {}
+            if usage is not None:
+                attrs = {
+                    "gen_ai.usage.input_tokens": usage.prompt_tokens,
+                    "gen_ai.usage.output_tokens": usage.completion_tokens,
+                    "nova.llm.total_tokens": usage.total_tokens,
+                    "nova.llm.requests": usage.successful_requests,
+                }
+            self._close(("crew", id(source)), attrs)
+
+        @on(CrewKickoffFailedEvent)
+        def _(source, event):
+            self._close(("crew", id(source)), error=event.error)
+
+        # ---------- tasks ----------
+        @on(TaskStartedEvent)
+        def _(source, event):
+            task = event.task
+            agent = getattr(task, "agent", None)
+            self._open(("task", id(task)), f"task {task.name or 'unnamed'}", {
+                "nova.task": task.name or "",
+                "nova.agent": getattr(agent, "role", "") or "",
+                "nova.llm.failures": 0,
+            })
+
+        @on(TaskCompletedEvent)
+        def _(source, event):
+            self._close(("task", id(event.task)), {"nova.task.output_chars": len(str(getattr(event.output, "raw", "") or ""))})
+
+        @on(TaskFailedEvent)
+        def _(source, event):
+            self._close(("task", id(event.task)), error=event.error)
+
+        # ---------- LLM calls ----------
+        @on(LLMCallStartedEvent)
+        def _(source, event):
+            messages = event.messages if isinstance(event.messages, list) else [{"content": event.messages}]
+            prompt = "\n".join(str(m.get("content", "")) for m in messages if isinstance(m, dict))
+            self._open(("llm", threading.get_ident()), "llm.call", {
+                "gen_ai.request.model": getattr(event, "model", None) or getattr(source, "model", "") or "",
+                "gen_ai.usage.input_tokens": _estimate_tokens(prompt),
+                "nova.llm.messages": len(messages),
+            })
+
+        @on(LLMCallCompletedEvent)
+        def _(source, event):
+            self._close(("llm", threading.get_ident()), {
+                "gen_ai.usage.output_tokens": _estimate_tokens(str(event.response or "")),
+            })
+
+        @on(LLMCallFailedEvent)
+        def _(source, event):
+            # Every failed call is retried by the agent executor: count them on the task
+            task_span = self._top(kind="task")
+            if task_span is not None:
+                failures = (getattr(task_span, "attributes", None) or {}).get("nova.llm.failures", 0)
+                task_span.set_attribute("nova.llm.failures", failures + 1)
+            self._close(("llm", threading.get_ident()), error=event.error)
+
+        # ---------- tools ----------
+        @on(ToolUsageStartedEvent)
+        def _(source, event):
+            args = event.tool_args if isinstance(event.tool_args, dict) else {"input": event.tool_args}
+            self._open(("tool", threading.get_ident(), event.tool_name), f"tool {event.tool_name}", {
+                "nova.tool": event.tool_name,
+                "nova.tool.run_attempts": getattr(event, "run_attempts", 0) or 0,
+                "nova.tool.args_chars": len(json.dumps(args, default=str)),
+            })
+
+        @on(ToolUsageFinishedEvent)
+        def _(source, event):
+            attrs = {"nova.tool.from_cache": bool(getattr(event, "from_cache", False))}
+            if getattr(event, "started_at", None) and getattr(event, "finished_at", None):
+                attrs["nova.tool.seconds"] = (event.finished_at - event.started_at).total_seconds()
+            self._close(("tool", threading.get_ident(), event.tool_name), attrs)
+
+        @on(ToolUsageErrorEvent)
+        def _(source, event):
+            self._close(("tool", threading.get_ident(), event.tool_name), error=event.error)
+
+    # ---------- span bookkeeping ----------
+    def _stack(self) -> List[Any]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _top(self, kind: Optional[str] = None):
+        for key, span in reversed(self._stack()):
+            if kind is None or key[0] == kind:
+                return span
+        return None
+
+    def _open(self, key, name: str, attrs: Dict[str, Any]):
+        from opentelemetry import trace
+
+        parent = self._top()
+        if parent is None:
+            with self._lock:
+                parent = self._step_spans[-1] if self._step_spans else None
+        context = trace.set_span_in_context(parent) if parent is not None else None
+        span = self.tracer.start_span(name, context=context, attributes={k: _attr(v) for k, v in attrs.items()})
+        with self._lock:
+            self._spans[key] = span
+        self._stack().append((key, span))
+        return span
+
+    def _close(self, key, attrs: Optional[Dict[str, Any]] = None, error: Any = None) -> None:
+        from opentelemetry.trace import Status, StatusCode
+
+        with self._lock:
+            span = self._spans.pop(key, None)
+            if span is not None and span in self._step_spans:
+                self._step_spans.remove(span)
+        if span is None:
+            return
+        stack = self._stack()
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i][1] is span:
+                del stack[i]
+                break
+        for k, v in (attrs or {}).items():
+            span.set_attribute(k, _attr(v))
+        if error is not None:
+            span.set_status(Status(StatusCode.ERROR, str(error)[:500]))
+        span.end()
+
+
+def setup_tracing(nova_root: Path):
+    """
+    Start exporting spans for this process (idempotent: both flows call it at import).
+    - NOVA_TRACING=json : NOVA/.cache/traces/spans-<pid>.jsonl
+    - NOVA_TRACING=otlp : OTLP/HTTP to OTEL_EXPORTER_OTLP_ENDPOINT (default http://localhost:4318)
+    - NOVA_TRACING=json,otlp for both; unset/0 disables tracing.
+    Returns the tracer, or None when tracing is off.
+    """
+    global _LISTENER
+    modes = {m.strip().lower() for m in os.getenv("NOVA_TRACING", "").split(",") if m.strip()}
+    modes -= {"0", "false", "no", "off"}
+    if not modes:
+        return None
+
+    with _LOCK:
+        if _LISTENER is not None:
+            return _LISTENER.tracer
+
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        # A private provider: crewai's own telemetry may own the global one
+        provider = TracerProvider(resource=Resource.create({"service.name": "nova"}))
+        if "json" in modes:
+            provider.add_span_processor(BatchSpanProcessor(JsonFileSpanExporter(Path(nova_root) / ".cache" / TRACES_DIR_NAME)))
+        if "otlp" in modes:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+
+        import atexit
+        atexit.register(provider.shutdown)
+
+        _LISTENER = FlowTracingListener(provider.get_tracer("nova"))
+        print(f"[Tracing] Exporting spans ({', '.join(sorted(modes))})")
+        return _LISTENER.tracer
+
+
+@contextmanager
+def traced(name: str, attrs: Optional[Dict[str, Any]] = None):
+    """
+    Span nested under the innermost open crewai span of this thread (e.g. the tool call running this code).
+    Yields the span, or None when tracing is off; an exception marks the span as failed and is re-raised.
+    """
+    listener = _LISTENER
+    if listener is None:
+        yield None
+        return
+    key = ("traced", object())
+    span = listener._open(key, name, attrs or {})
+    try:
+        yield span
+    except Exception as e:
+        listener._close(key, error=e)
+        raise
+    listener._close(key)
+
+
+def summarize_spans(traces_dir: Path, top: int = 20) -> List[Dict[str, Any]]:
+    """p50/p95/max duration (seconds) per span name across the JSON trace files, slowest p95 first."""
+    durations: Dict[str, List[float]] = {}
+    for path in Path(traces_dir).glob("spans-*.jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                span = json.loads(line)
+                start = datetime.fromisoformat(span["start_time"].replace("Z", "+00:00"))
+                end = datetime.fromisoformat(span["end_time"].replace("Z", "+00:00"))
+                durations.setdefault(span["name"], []).append((end - start).total_seconds())
+
+    rows = []
+    for name, values in durations.items():
+        values.sort()
+        pick = lambda q: values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+        rows.append({"name": name, "count": len(values), "p50": pick(0.5), "p95": pick(0.95), "max": values[-1]})
+    rows.sort(key=lambda r: r["p95"], reverse=True)
+    return rows[:top]
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Slowest spans (p95) from NOVA_TRACING=json trace files")
+    parser.add_argument("traces_dir", type=Path)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+    print(f"{'span':60} {'count':>6} {'p50 s':>8} {'p95 s':>8} {'max s':>8}")
+    for r in summarize_spans(args.traces_dir, args.top):
+        print(f"{r['name'][:60]:60} {r['count']:>6} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['max']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from pathlib import Path
+from typing import Dict, Optional
+import os
+import shutil
+import time
+
+
+DEFAULT_MAX_WORKSPACES = 16
+# A workspace whose lease file was refreshed within LEASE_SECONDS has a queued / running flow: never evicted
+LEASE_FILE = ".lease"
+LEASE_SECONDS = 120
+
+# Sub-directories of every workspace (same names as the legacy shared folders under NOVA/)
+WORKSPACE_DIRS = {
+    "reports": "reports",
+    "cleaned": "cleaned_datasets",
+    "answering": "answering_reports",
+    "uploads": "uploads",
+}
+
+
+def workspaces_enabled() -> bool:
+    """NOVA_WORKSPACES=0 falls back to the shared NOVA/reports, NOVA/cleaned_datasets, ... folders."""
+    return os.getenv("NOVA_WORKSPACES", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _max_workspaces() -> int:
+    try:
+        return max(1, int(os.getenv("NOVA_MAX_WORKSPACES", DEFAULT_MAX_WORKSPACES)))
+    except ValueError:
+        return DEFAULT_MAX_WORKSPACES
+
+
+def workspace_dirs(workspace: Path) -> Dict[str, Path]:
+    """{"reports", "cleaned", "answering", "uploads"} -> directory inside `workspace` (created if missing)."""
+    dirs = {label: Path(workspace) / name for label, name in WORKSPACE_DIRS.items()}
+    for d in dirs.values():
+        d.mkdir(parents=True, exist_ok=True)
+    return dirs
+
+
+def create_workspace(nova_root: Path, run_id: str) -> Path:
+    """
+    Run-scoped workspace NOVA/workspaces/<run_id>, so concurrent flows never overwrite each other's files.
+    - The least recently used workspaces beyond NOVA_MAX_WORKSPACES (default 16) are deleted,
+      except leased ones (a flow is queued or running in them, see lease_workspace).
+    - The new workspace is leased right away, since the caller is about to start a flow in it.
+    - With NOVA_WORKSPACES=0 every run shares NOVA/ itself (the legacy layout).
+    """
+    nova_root = Path(nova_root)
+    if not workspaces_enabled():
+        return nova_root
+    root = nova_root / "workspaces"
+    workspace = root / run_id
+    if not workspace.exists():
+        others = sorted(
+            (p for p in root.glob("*") if p.is_dir()), key=_last_used, reverse=True
+        ) if root.is_dir() else []
+        for old in others[_max_workspaces() - 1:]:
+            if not is_leased(old):
+                shutil.rmtree(old, ignore_errors=True)
+    workspace_dirs(workspace)
+    touch_workspace(workspace)
+    lease_workspace(workspace)
+    return workspace
+
+
+def touch_workspace(workspace: Path) -> None:
+    """Mark a workspace as recently used (eviction is least-recently-used first)."""
+    try:
+        os.utime(workspace)
+    except OSError:
+        pass
+
+
+def lease_workspace(workspace: Path) -> None:
+    """
+    Create / refresh the workspace's lease file. The job runner refreshes it every LEASE_SECONDS / 4
+    for each queued or running job, so eviction skips the workspace until the flow is done.
+    """
+    lease = Path(workspace) / LEASE_FILE
+    try:
+        lease.touch()
+    except OSError:
+        pass
+
+
+def is_leased(workspace: Path) -> bool:
+    try:
+        return time.time() - (Path(workspace) / LEASE_FILE).stat().st_mtime < LEASE_SECONDS
+    except OSError:
+        return False
+
+
+def _last_used(workspace: Path) -> float:
+    """Latest of the workspace's own mtime (touch_workspace) and its lease (refreshed while a flow runs)."""
+    times = [workspace.stat().st_mtime]
+    try:
+        times.append((workspace / LEASE_FILE).stat().st_mtime)
+    except OSError:
+        pass
+    return max(times)
+
+
+def latest_workspace(nova_root: Path) -> Optional[Path]:
+    """Most recently used workspace with a cleaned dataset (for CLI runs that don't name one)."""
+    nova_root = Path(nova_root)
+    if not workspaces_enabled():
+        return nova_root
+    candidates = [
+        p.parent.parent for p in (nova_root / "workspaces").glob(f"*/{WORKSPACE_DIRS['cleaned']}/cleaned_data_three.csv")
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=_last_used)
@@ -4,8 +4,8 @@ import streamlit as st
 import sys
 from pathlib import Path
 import os
-from functools import lru_cache
 import re
+import uuid
 from datetime import datetime
 
 
@@ -14,7 +14,9 @@ from datetime import datetime
 # ----------------------------
 # Helpers
 # ----------------------------
-@lru_cache(maxsize=1)
+# Streamlit re-executes this script on every interaction: anything expensive below is cached across reruns
+# with st.cache_resource / st.cache_data (functools.lru_cache would be rebuilt with the function on every run).
+@st.cache_resource(show_spinner=False)
 def find_nova_root(start: Path | None = None, folder_name: str = "NOVA") -> Path:
     """
     Walk upward from `start` (or this file) to locate the folder named `folder_name`.
@@ -67,23 +69,47 @@ MODEL_CFG     = NOVA_ROOT / "model_config.txt"
 # Point to the `NOVA` directory
 sys.path.append(str(NOVA_ROOT))
 
-# Import your flows & states
-from csv_cleaning_flow.src.csv_cleaning_flow.main import DataCleaningFlow, DataCleaningState
-from answering_flow.src.answering_flow.main import DataAnsweringFlow, DataAnsweringState
+# The flows themselves run in job_runner's worker processes
+from nova_common.workspace import create_workspace, touch_workspace, workspace_dirs
+from answering_flow.src.answering_flow.answering_context import get_answering_context
+from job_runner import FINISHED, JobRunner
 
 
 def write_model_config_to_file(model_source: str, model_name: str):
+    # Only rewrite on a change: a new mtime makes every worker re-read it (llm_registry.read_model_config)
+    content = f"{model_source}\n{model_name}"
     try:
-        MODEL_CFG.write_text(f"{model_source}\n{model_name}")
+        if not MODEL_CFG.exists() or MODEL_CFG.read_text() != content:
+            MODEL_CFG.write_text(content)
     except Exception as e:
         st.warning(f"Could not persist model config: {e}")
 
 
+@st.cache_data(max_entries=64, show_spinner=False)
+def read_file_bytes(path: str, mtime_ns: int) -> bytes:
+    # mtime_ns is only part of the cache key: a rewritten file is read again
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def cached_read(path: Path) -> bytes:
+    """File contents, read from disk only when the file changed since the last rerun."""
+    return read_file_bytes(str(path), path.stat().st_mtime_ns)
+
+
+
+
+def session_dirs():
+    """Folders of this session's run workspace (the shared NOVA/ folders before the first upload)."""
+    if st.session_state.get("workspace_path"):
+        return workspace_dirs(Path(st.session_state.workspace_path))
+    return {"reports": REPORTS_DIR, "cleaned": CLEANED_DIR, "answering": ANSWERING_DIR, "uploads": UPLOADS_DIR}
 
 
 # For markdown box
 def render_final_answer_box():
-    md_path = ANSWERING_DIR / "final_answer.md"
+    answering_dir = session_dirs()["answering"]
+    md_path = answering_dir / "final_answer.md"
     st.markdown("---")
     st.subheader("📝 Final Answer (live preview)")
 
@@ -95,7 +121,7 @@ def render_final_answer_box():
         if md_path.exists():
             st.download_button(
                 "⬇️ Download",
-                data=md_path.read_text(encoding="utf-8"),
+                data=cached_read(md_path),
                 file_name="final_answer.md",
                 mime="text/markdown",
                 use_container_width=True
@@ -110,7 +136,7 @@ def render_final_answer_box():
     st.caption(f"Last updated: {mtime}")
 
     # Read markdown
-    text = md_path.read_text(encoding="utf-8")
+    text = cached_read(md_path).decode("utf-8")
 
     # --- Extract image refs like ![alt](fig_01.png) ---
     img_refs = re.findall(r"!\[[^\]]*\]\(([^)]+)\)", text)
@@ -124,7 +150,7 @@ def render_final_answer_box():
     # Render figures below using Streamlit so local files display correctly
     shown_any = False
     for rel in img_refs:
-        img_path = (ANSWERING_DIR / rel).resolve()
+        img_path = (answering_dir / rel).resolve()
         if img_path.exists():
             if not shown_any:
                 st.markdown("#### Figures")
@@ -135,7 +161,7 @@ def render_final_answer_box():
 
     # Optional: help debug what's in the folder
     with st.expander("🧩 Debug: files in answering_reports"):
-        files = sorted(p.name for p in ANSWERING_DIR.glob("*"))
+        files = sorted(p.name for p in answering_dir.glob("*"))
         st.write(files)
 
 
@@ -200,6 +226,13 @@ if "conversation_history" not in st.session_state:
 if "last_upload_fingerprint" not in st.session_state:
     st.session_state.last_upload_fingerprint = None
 
+# Run-scoped workspace (NOVA/workspaces/<run id>) of the current upload
+if "workspace_path" not in st.session_state:
+    st.session_state.workspace_path = None
+elif st.session_state.workspace_path:
+    # Every interaction marks the chat's workspace as used, so newer uploads evict idle sessions' first
+    touch_workspace(Path(st.session_state.workspace_path))
+
 # Cleaning flow artifacts/state
 if "original_csv_path" not in st.session_state:
     st.session_state.original_csv_path = None
@@ -210,11 +243,29 @@ if "profiling_report_path" not in st.session_state:
 if "cleaning_report_path" not in st.session_state:
     st.session_state.cleaning_report_path = None
 
-# Flows stored once in session
-if "cleaning_flow" not in st.session_state:
-    st.session_state.cleaning_flow = None
-if "answering_flow" not in st.session_state:
-    st.session_state.answering_flow = None
+# Background jobs of this session (flows run in worker processes, see job_runner.py)
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if "cleaning_job" not in st.session_state:
+    st.session_state.cleaning_job = None
+if "answering_job" not in st.session_state:
+    st.session_state.answering_job = None
+# Follow-up questions are answered against the earlier turns of the same conversation (see conversation.py)
+if "conversation_id" not in st.session_state:
+    st.session_state.conversation_id = uuid.uuid4().hex
+
+# Run id of a cleaning flow that failed part-way (resumable from its checkpoint)
+if "failed_cleaning_run" not in st.session_state:
+    st.session_state.failed_cleaning_run = None
+if "cleaning_run_id" not in st.session_state:
+    st.session_state.cleaning_run_id = None
+
+
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    # One runner per server: every analyst's session shares its worker pool (NOVA_MAX_JOBS)
+    return JobRunner(NOVA_ROOT)
+
 
 # ----------------------------
 # Actions
@@ -222,32 +273,125 @@ if "answering_flow" not in st.session_state:
 def run_cleaning_flow_immediately(csv_bytes, filename: str):
     st.session_state.conversation_history = []
     st.session_state.conversation_history_full = []
-    uploads_dir = UPLOADS_DIR
-    uploads_dir.mkdir(parents=True, exist_ok=True)
+    st.session_state.conversation_id = uuid.uuid4().hex
+    # Each upload gets its own workspace, so concurrent sessions never overwrite each other's files
+    run_id = str(uuid.uuid4())
+    st.session_state.workspace_path = str(create_workspace(NOVA_ROOT, run_id))
+    uploads_dir = session_dirs()["uploads"]
     saved_path = uploads_dir / (filename or "uploaded.csv")
     with open(saved_path, "wb") as f:
         f.write(csv_bytes if isinstance(csv_bytes, (bytes, bytearray)) else bytes(csv_bytes))
 
     st.session_state.original_csv_path = str(saved_path)
+    st.session_state.cleaning_run_id = run_id
+    st.session_state.failed_cleaning_run = None
+
+    # A newer upload supersedes whatever this session was still cleaning
+    if st.session_state.cleaning_job:
+        get_job_runner().cancel(st.session_state.cleaning_job)
+    st.session_state.cleaning_job = get_job_runner().submit(
+        "cleaning",
+        {"csv_path": str(saved_path), "run_id": run_id, "workspace_path": st.session_state.workspace_path},
+        owner=st.session_state.session_id,
+    )
+    st.toast("Cleaning flow started in the background.")
 
-    st.session_state.cleaning_flow = DataCleaningFlow()
-
-    st.session_state.cleaning_flow.state.csv_path = str(saved_path)
-
-    with st.spinner("Running dataset research, profiling, exploration, and cleaning..."):
-        try:
-            st.session_state.cleaning_flow.kickoff()
-        except Exception as e:
-            st.error(f"Cleaning flow failed: {e}")
-            return
 
-    # Optional chat notice
-    st.session_state.conversation_history_full.append(
-        {"role": "assistant", "content": "✅ CSV uploaded and cleaned. Reports saved in /reports."}
+def resume_failed_cleaning_flow():
+    run_id = st.session_state.failed_cleaning_run
+    st.session_state.failed_cleaning_run = None
+    st.session_state.cleaning_job = get_job_runner().submit(
+        "resume", {"run_id": run_id, "workspace_path": st.session_state.workspace_path or ""}, owner=st.session_state.session_id
     )
+    st.toast("Resuming the cleaning flow from its last completed stage...")
+
+
+def finish_job(kind: str, record: dict):
+    """Turn a finished job record into chat messages / session state, once."""
+    st.session_state[f"{kind}_job"] = None
+    status = record.get("status")
+    if kind == "cleaning":
+        if status == "succeeded":
+            cleaned = Path((record.get("result") or {}).get("cleaned_datasets_path", "")) / "cleaned_data_three.csv"
+            st.session_state.cleaned_csv_path = str(cleaned) if cleaned.exists() else None
+            message = "✅ CSV uploaded and cleaned. Reports saved in the run workspace."
+            st.toast("Cleaning flow completed!")
+        elif status == "failed":
+            st.session_state.failed_cleaning_run = st.session_state.cleaning_run_id
+            message = f"❌ Cleaning flow failed: {record.get('error', 'unknown error')}"
+        else:
+            message = "⏹️ Cleaning flow cancelled."
+    else:
+        result = record.get("result") or {}
+        if status == "succeeded" and result.get("answer_cache"):
+            message = "♻️ Answer restored from an earlier run of the same question (tick 'Recompute answers' to run it again)."
+        elif status == "succeeded":
+            message = "✅ Answer generated. Check /answering_reports for the markdown file."
+        elif status == "failed":
+            message = f"❌ Answering flow failed: {record.get('error', 'unknown error')}"
+        else:
+            message = "⏹️ Answering flow cancelled."
+    st.session_state.conversation_history_full.append({"role": "assistant", "content": message})
+
+
+@st.fragment(run_every=2)
+def render_jobs():
+    """Poll this session's jobs without blocking the page; a finished job reruns the whole app once."""
+    runner = get_job_runner()
+    for kind, label in (("cleaning", "Cleaning"), ("answering", "Answering")):
+        job_id = st.session_state.get(f"{kind}_job")
+        if not job_id:
+            continue
+        record = runner.status(job_id)
+        status = record.get("status", "queued")
+        if status in FINISHED:
+            finish_job(kind, record)
+            st.rerun(scope="app")
+
+        steps = record.get("steps") or [""]
+        progress = record.get("progress") or {}
+        done = len([m for m in progress.get("completed", []) if m in steps])
+        step = progress.get("step") or ("waiting for a free worker" if status == "queued" else "starting")
+        st.progress(done / len(steps), text=f"{label}: {status} ({step})")
+        if st.button("⏹️ Cancel", key=f"cancel_{kind}_{job_id}"):
+            runner.cancel(job_id)
+
+
+
+# Chat labels of the answering crew's tasks
+TASK_LABELS = {
+    "answering_plan_task": "Analysis plan",
+    "plan_review_task": "Reviewed plan",
+    "final_answering_task": "Final answer",
+}
 
-    st.toast("Cleaning flow completed!")
 
+@st.fragment(run_every=1)
+def render_live_answer():
+    """The running answering job in the chat: plan / review steps as they finish, then the final agent's tokens."""
+    job_id = st.session_state.get("answering_job")
+    if not job_id:
+        return
+    runner = get_job_runner()
+    progress = runner.status(job_id).get("progress") or {}
+    events = progress.get("tasks") or []
+    done = {e.get("task") for e in events if e.get("status") == "completed"}
+
+    with st.chat_message("assistant"):
+        for event in events:
+            label = TASK_LABELS.get(event.get("task"), event.get("task") or "Task")
+            if event.get("status") == "completed":
+                with st.expander(f"✅ {label}"):
+                    st.markdown(event.get("output", ""))
+            elif event.get("task") not in done:
+                st.caption(f"⏳ {label}...")
+        text = runner.stream(job_id)
+        if text:
+            st.markdown(text)
+            if progress.get("first_token_s") is not None:
+                st.caption(f"First token after {progress['first_token_s']:.1f}s")
+        elif not events:
+            st.caption("⏳ Starting the answering flow...")
 
 
 if "busy" not in st.session_state: st.session_state.busy = False
@@ -266,15 +410,22 @@ def send_and_clear():
             st.session_state.input = ""
             return
 
-        reports_dir = REPORTS_DIR
+        reports_dir = session_dirs()["reports"]
         required = ["dataset_overview.md", "data_profiling_report.md", "summary_cleaning_report.md"]
-        if not all((reports_dir / r).exists() for r in required):
+        if st.session_state.cleaning_job or not all((reports_dir / r).exists() for r in required):
             st.session_state.conversation_history_full.append(
                 {"role": "assistant", "content": "⏳ Still preparing reports. Please try again in a moment."}
             )
             st.session_state.input = ""
             return
 
+        if st.session_state.answering_job:
+            st.session_state.conversation_history_full.append(
+                {"role": "assistant", "content": "⏳ Still answering your previous question."}
+            )
+            st.session_state.input = ""
+            return
+
 
         user_input = st.session_state.input.strip()
         if not user_input:
@@ -284,27 +435,29 @@ def send_and_clear():
         st.session_state.conversation_history_full.append({"role": "user", "content": user_input})
 
 
-        st.session_state.answering_flow = DataAnsweringFlow()
-        st.session_state.answering_flow.state.user_prompt = user_input
-        st.session_state.answering_flow.state.csv_path = st.session_state.original_csv_path
-
-        with st.spinner("Answering your question..."):
-            try:
-                st.session_state.answering_flow.kickoff()
-            except Exception as e:
-                st.exception(e)
-                return
-
-        # Your answering flow doesn’t expose a final text field; it writes to answering_reports/.
-        # If your PromptAnsweringCrew returns text into state, display it; else confirm completion.
-        ans_state = st.session_state.answering_flow.state
-        maybe_text = getattr(ans_state, "final_markdown", None) or getattr(ans_state, "answer_markdown", None)
-        if maybe_text:
-            st.session_state.conversation_history_full.append({"role": "assistant", "content": maybe_text})
-        else:
-            st.session_state.conversation_history_full.append(
-                {"role": "assistant", "content": "✅ Answer generated. Check /answering_reports for the markdown file."}
+        # Columns, sample rows and reports are prepared once per dataset and kept in the session;
+        # the job worker reuses them unless a file changed in between
+        try:
+            context = get_answering_context(
+                reports_dir, st.session_state.original_csv_path, st.session_state.get("answering_context")
             )
+            st.session_state.answering_context = context.to_dict()
+        except Exception as e:
+            print(f"[AnsweringContext] Left to the job worker: {e}")
+            st.session_state.answering_context = {}
+
+        st.session_state.answering_job = get_job_runner().submit(
+            "answering",
+            {
+                "user_prompt": user_input,
+                "csv_path": st.session_state.original_csv_path,
+                "workspace_path": st.session_state.workspace_path or "",
+                "recompute": bool(st.session_state.get("recompute_answers")),
+                "conversation_id": st.session_state.conversation_id,
+                "answering_context": st.session_state.answering_context,
+            },
+            owner=st.session_state.session_id,
+        )
 
         st.session_state.input = ""
 
@@ -334,7 +487,7 @@ with left_col:
     st.markdown("### Data")
 
     # --- replace your upload handling block ---
-    uploaded_csv = st.file_uploader("Upload CSV file", type=["csv"], key="csv_upload")
+    uploaded_csv = st.file_uploader("Upload CSV file", type=["csv", "gz", "zst"], key="csv_upload")
     if uploaded_csv is not None:
         # fingerprint: name + size (fast and good enough)
         try:
@@ -349,19 +502,25 @@ with left_col:
 
 
     st.markdown("### Actions")
+    render_jobs()
+    if st.session_state.failed_cleaning_run:
+        if st.button("▶️ Resume Cleaning"):
+            resume_failed_cleaning_flow()
+    st.checkbox("🔁 Recompute answers", key="recompute_answers", help="Ignore answers stored for the same question and run the crew again")
     if st.button("🧹 Clear Chat"):
         st.session_state.conversation_history = []
         st.session_state.conversation_history_full = []
+        st.session_state.conversation_id = uuid.uuid4().hex
         st.toast("Chat history cleared!")
 
 
     with st.expander("Artifacts"):
+        workspace = Path(st.session_state.workspace_path or NOVA_ROOT)
         for rel in ["reports/dataset_overview.md", "reports/data_profiling_report.md",
                     "reports/summary_cleaning_report.md", "answering_reports/final_answer.md"]:
-            p = NOVA_ROOT / rel
+            p = workspace / rel
             if p.exists():
-                with open(p, "rb") as f:
-                    st.download_button(f"Download {rel}", f, file_name=Path(rel).name)
+                st.download_button(f"Download {rel}", cached_read(p), file_name=Path(rel).name)
 
 with right_col:
     st.title("📊 CSV Analysis Assistant")
@@ -371,6 +530,7 @@ with right_col:
         with st.chat_message("user" if role == "user" else "assistant"):
             # render as markdown; Streamlit safely ignores raw HTML by default
             st.markdown(str(entry["content"]))
+    render_live_answer()
 
 
     # Bottom input
@@ -0,0 +1,332 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from collections import deque
+import multiprocessing
+import threading
+import traceback
+import json
+import sys
+import os
+import time
+import uuid
+
+
+DEFAULT_MAX_JOBS = 2
+MAX_RECORDS = 200
+POLL_SECONDS = 0.5
+TASK_OUTPUT_CHARS = 2000
+LEASE_REFRESH_SECONDS = 30
+# A queued record older than this, found at startup, belonged to a server that is gone
+STALE_QUEUED_SECONDS = 6 * 3600
+
+# Flow steps per job kind (for the progress bar)
+JOB_STEPS = {
+    "cleaning": ["dataset_overview_crew", "run_exploring_crew", "run_cleaning_crew"],
+    "resume": ["dataset_overview_crew", "run_exploring_crew", "run_cleaning_crew"],
+    "answering": ["run_answering_crew"],
+}
+FINISHED = {"succeeded", "failed", "cancelled"}
+# Imported once by the fork server, so each job starts with crewai / litellm / pandas and both flows loaded
+PRELOAD_MODULES = [
+    "answering_flow.src.answering_flow.main",
+    "csv_cleaning_flow.src.csv_cleaning_flow.main",
+]
+
+
+def max_jobs_from_env(default: int = DEFAULT_MAX_JOBS) -> int:
+    """Flows allowed to run at the same time, from NOVA_MAX_JOBS (falls back to `default`)."""
+    try:
+        return max(1, int(os.getenv("NOVA_MAX_JOBS", default)))
+    except ValueError:
+        return default
+
+
+def worker_context() -> Any:
+    """
+    Start method of the job workers; neither inherits the Streamlit server's threads.
+    - forkserver (Linux / macOS): workers are forked from a server process that imported PRELOAD_MODULES once.
+    - spawn (Windows, or NOVA_PRELOAD_WORKERS=0): every job imports the flows in a fresh interpreter.
+    """
+    preload = os.getenv("NOVA_PRELOAD_WORKERS", "1").strip().lower() not in {"0", "false", "no", "off"}
+    if not preload or "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(PRELOAD_MODULES)
+    return ctx
+
+
+def _read_record(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_record(path: Path, record: Dict[str, Any]) -> None:
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2, default=str)
+    os.replace(tmp, path)
+
+
+def _update_record(path: Path, **fields) -> Dict[str, Any]:
+    record = {**_read_record(path), **fields}
+    _write_record(path, record)
+    return record
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    except OSError:
+        return False
+    return True
+
+
+def _worker_alive(record: Dict[str, Any]) -> bool:
+    """
+    Whether the job of an unfinished record may still be in progress somewhere:
+    - running: its worker pid is still alive
+    - queued: it was queued less than STALE_QUEUED_SECONDS ago (queued jobs live in their server's memory)
+    """
+    if record.get("status") == "running":
+        pid = record.get("pid")
+        return isinstance(pid, int) and pid != os.getpid() and _pid_alive(pid)
+    return time.time() - float(record.get("created", 0)) < STALE_QUEUED_SECONDS
+
+
+def _run_job(record_path: str, nova_root: str, kind: str, state: Dict[str, Any]) -> None:
+    """
+    Worker process entry point: run one flow and keep its job record up to date.
+    - progress.step / progress.completed follow the flow's method start/finish events.
+    - progress.tasks lists every task start / completion (with the start of its output), as they happen.
+    - Streamed LLM tokens are appended to <job id>.stream.txt; progress.first_token_s is the time to the first one.
+    """
+    path = Path(record_path)
+    stream_path = path.with_suffix(".stream.txt")
+    sys.path.append(nova_root)
+    started = time.time()
+    _update_record(path, status="running", started=started, pid=os.getpid())
+
+    progress: Dict[str, Any] = {"step": "", "completed": [], "tasks": []}
+    lock = threading.Lock()
+
+    def _progress(**fields) -> None:
+        with lock:
+            progress.update(fields)
+            _update_record(path, progress=progress)
+
+    try:
+        from crewai.utilities.events import crewai_event_bus
+        from crewai.utilities.events.flow_events import MethodExecutionStartedEvent, MethodExecutionFinishedEvent
+        from crewai.utilities.events.task_events import TaskStartedEvent, TaskCompletedEvent
+        from crewai.utilities.events.llm_events import LLMStreamChunkEvent
+
+        @crewai_event_bus.on(MethodExecutionStartedEvent)
+        def _on_step_started(source, event):
+            _progress(step=event.method_name)
+
+        @crewai_event_bus.on(MethodExecutionFinishedEvent)
+        def _on_step_finished(source, event):
+            _progress(step="", completed=[*progress["completed"], event.method_name])
+
+        @crewai_event_bus.on(TaskStartedEvent)
+        def _on_task_started(source, event):
+            name = getattr(event.task, "name", "") or ""
+            _progress(tasks=[*progress["tasks"], {"task": name, "status": "started", "at": time.time()}])
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def _on_task_completed(source, event):
+            name = getattr(event.task, "name", "") or ""
+            output = str(getattr(event.output, "raw", "") or "")[:TASK_OUTPUT_CHARS]
+            _progress(tasks=[*progress["tasks"], {"task": name, "status": "completed", "at": time.time(), "output": output}])
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def _on_chunk(source, event):
+            with lock:
+                with open(stream_path, "a", encoding="utf-8") as f:
+                    f.write(event.chunk or "")
+            if "first_token_s" not in progress:
+                _progress(first_token_s=round(time.time() - started, 2))
+
+        if kind == "answering":
+            from answering_flow.src.answering_flow.main import DataAnsweringFlow
+            flow = DataAnsweringFlow()
+            flow.kickoff(inputs=state)
+        elif kind == "resume":
+            from csv_cleaning_flow.src.csv_cleaning_flow.main import resume_cleaning_flow
+            flow = resume_cleaning_flow(state["run_id"])
+        else:
+            from csv_cleaning_flow.src.csv_cleaning_flow.main import DataCleaningFlow
+            flow = DataCleaningFlow()
+            flow.kickoff(inputs=state)
+        result = {
+            k: v for k, v in flow.state.model_dump().items() if k.endswith("_path") or k in {"run_id", "model_routing", "fast_path", "answer_cache"}
+        }
+        _update_record(path, status="succeeded", finished=time.time(), result=result)
+    except BaseException as e:
+        _update_record(
+            path, status="failed", finished=time.time(), error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc()
+        )
+        print(f"[Jobs] {kind} job failed: {e}")
+
+
+class JobRunner:
+    """
+    Local job subsystem: flows run in worker processes, off the Streamlit script thread.
+    - Every job has an id and a JSON record under NOVA/.cache/jobs/<job id>.json
+      (status: queued/running/succeeded/failed/cancelled, progress, result, error).
+    - At most `max_jobs` workers run at once; the rest wait in a FIFO queue.
+    - cancel() drops a queued job or terminates a running worker.
+    - The workspace of every queued / running job is leased (workspace.lease_workspace), so a new upload
+      never evicts it mid-flow.
+    Records survive page reruns; jobs left running by a previous server process (worker pid gone) are marked failed.
+    """
+
+    def __init__(self, nova_root: Path, max_jobs: Optional[int] = None):
+        self.nova_root = Path(nova_root)
+        self.root = self.nova_root / ".cache" / "jobs"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_jobs = max_jobs or max_jobs_from_env()
+        self._ctx = worker_context()
+        if self._ctx.get_start_method() == "forkserver":
+            # Boot (and preload) the fork server now, so the first job does not pay for the imports either
+            from multiprocessing import forkserver
+            threading.Thread(target=forkserver.ensure_running, name="nova-forkserver", daemon=True).start()
+        self._queue: "deque[str]" = deque()
+        self._running: Dict[str, Any] = {}
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._workspaces: Dict[str, str] = {}
+        self._leased_at = 0.0
+        self._lock = threading.Lock()
+
+        for path in self.root.glob("*.json"):
+            record = _read_record(path)
+            # Only jobs whose worker is gone: another server sharing NOVA/.cache/jobs may still be running its own
+            # (a queued record has no pid; it is failed only when it is older than the longest plausible queue wait)
+            if record and record.get("status") not in FINISHED and not _worker_alive(record):
+                _update_record(path, status="failed", finished=time.time(), error="Interrupted: the server restarted")
+        for old in self.jobs()[MAX_RECORDS:]:
+            self._path(old["job_id"]).unlink(missing_ok=True)
+            self._stream_path(old["job_id"]).unlink(missing_ok=True)
+
+        threading.Thread(target=self._dispatch_loop, name="nova-job-runner", daemon=True).start()
+
+    def _path(self, job_id: str) -> Path:
+        return self.root / f"{job_id}.json"
+
+    def _stream_path(self, job_id: str) -> Path:
+        return self.root / f"{job_id}.stream.txt"
+
+    # ---------- public API ----------
+    def submit(self, kind: str, state: Dict[str, Any], owner: str = "") -> str:
+        """Queue a flow run ("cleaning", "resume" or "answering") with its initial state; returns the job id."""
+        if kind not in JOB_STEPS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex[:12]
+        _write_record(self._path(job_id), {
+            "job_id": job_id,
+            "kind": kind,
+            "owner": owner,
+            "status": "queued",
+            "created": time.time(),
+            "progress": {"step": "", "completed": []},
+            "steps": JOB_STEPS[kind],
+        })
+        with self._lock:
+            self._specs[job_id] = {"kind": kind, "state": dict(state)}
+            if state.get("workspace_path"):
+                self._workspaces[job_id] = str(state["workspace_path"])
+            self._queue.append(job_id)
+        self._refresh_leases(force=True)
+        return job_id
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        return _read_record(self._path(job_id))
+
+    def stream(self, job_id: str) -> str:
+        """Text streamed so far by the job's streaming LLM (the final answering agent), "" if none yet."""
+        try:
+            return self._stream_path(job_id).read_text(encoding="utf-8")
+        except OSError:
+            return ""
+
+    def jobs(self, owner: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Job records, newest first (optionally only one session's)."""
+        found = [_read_record(p) for p in self.root.glob("*.json")]
+        found = [r for r in found if r and (owner is None or r.get("owner") == owner)]
+        return sorted(found, key=lambda r: r.get("created", 0), reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if it already finished (its result is kept)."""
+        with self._lock:
+            if self.status(job_id).get("status") in FINISHED:
+                return False
+            if job_id in self._queue:
+                self._queue.remove(job_id)
+                self._specs.pop(job_id, None)
+                self._workspaces.pop(job_id, None)
+                _update_record(self._path(job_id), status="cancelled", finished=time.time())
+                return True
+            proc = self._running.pop(job_id, None)
+            self._workspaces.pop(job_id, None)
+        if proc is None:
+            return False
+        proc.terminate()
+        proc.join(5)
+        if proc.is_alive():
+            proc.kill()
+            proc.join()
+        with self._lock:
+            # The worker may have written "succeeded" / "failed" before it was stopped: keep that result
+            if self.status(job_id).get("status") in FINISHED:
+                return False
+            _update_record(self._path(job_id), status="cancelled", finished=time.time())
+        return True
+
+    # ---------- dispatch ----------
+    def _refresh_leases(self, force: bool = False) -> None:
+        """Keep the workspaces of queued / running jobs leased (every LEASE_REFRESH_SECONDS)."""
+        if not force and time.time() - self._leased_at < LEASE_REFRESH_SECONDS:
+            return
+        from nova_common.workspace import lease_workspace
+
+        self._leased_at = time.time()
+        with self._lock:
+            workspaces = set(self._workspaces.values())
+        for workspace in workspaces:
+            lease_workspace(Path(workspace))
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._lock:
+                for job_id, proc in list(self._running.items()):
+                    if proc.is_alive():
+                        continue
+                    proc.join()
+                    self._running.pop(job_id)
+                    self._workspaces.pop(job_id, None)
+                    if self.status(job_id).get("status") not in FINISHED:
+                        # Worker died without reporting (e.g. killed by the OS)
+                        _update_record(
+                            self._path(job_id), status="failed", finished=time.time(),
+                            error=f"Worker exited with code {proc.exitcode}",
+                        )
+                while self._queue and len(self._running) < self.max_jobs:
+                    job_id = self._queue.popleft()
+                    spec = self._specs.pop(job_id)
+                    proc = self._ctx.Process(
+                        target=_run_job,
+                        args=(str(self._path(job_id)), str(self.nova_root), spec["kind"], spec["state"]),
+                        name=f"nova-job-{job_id}",
+                        daemon=True,
+                    )
+                    proc.start()
+                    self._running[job_id] = proc
+            self._refresh_leases()
+            time.sleep(POLL_SECONDS)